@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI API, so benchmarks run without network access.
+
+Serves /v1/chat/completions (plain and streaming) and /v1/embeddings with a
+configurable time to first token and token rate. Replies are shaped after
+the prompt (profile JSON, goal maps or plain text), so the
+tools parse them the way they would parse real model output.
+"""
+
+import re
+import json
+import zlib
+import asyncio
+import argparse
+from typing import Any, Dict
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+ITEMS = [
+    {"name": "Machine Learning", "score": 0.9, "level": 0.85, "details": "Training and shipping models"},
+    {"name": "Rock Climbing", "score": 0.7, "level": 0.6, "details": "Bouldering on weekends"},
+    {"name": "Product Design", "score": 0.8, "level": 0.7, "details": "Prototyping user flows"},
+]
+
+GOALS = {
+    "short_term": ["Ship the next release"],
+    "medium_term": ["Grow the team"],
+    "long_term": ["Start a company"],
+}
+
+# Models that reject `response_format`, like the real API does
+NO_RESPONSE_FORMAT = {"gpt-4", "gpt-4-0613", "gpt-4-32k"}
+
+FILLER = (
+    "That sounds great and I would love to talk more about it when we next meet "
+    "because there is a lot we could build together"
+).split()
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count, four characters per token."""
+    return max(1, len(text) // 4)
+
+
+def reply_for(body: Dict[str, Any], completion_tokens: int) -> str:
+    """Pick a reply that fits what the prompt asks for."""
+    prompt = body["messages"][-1]["content"]
+    output_format = body.get("response_format") or {}
+    if output_format.get("type") == "json_schema":
+        profile = {"interests": ITEMS, "skills": ITEMS, "goals": GOALS}
+        name = output_format["json_schema"]["name"]
+        if name == "goals":
+            return json.dumps(GOALS)
+        return json.dumps({name: profile[name]} if name in profile else profile)
+    if output_format.get("type") == "json_object":
+        return json.dumps({"interests": ITEMS, "skills": ITEMS, "goals": GOALS})
+    sections = re.search(r"JSON object with the keys (.+?), each", prompt)
+    if sections:
+        profile = {"interests": ITEMS, "skills": ITEMS, "goals": GOALS}
+        return json.dumps({name: profile[name] for name in re.findall(r'"(\w+)"', sections.group(1)) if name in profile})
+    if "short_term" in prompt:
+        return json.dumps(GOALS)
+    if "JSON array" in prompt:
+        return json.dumps(ITEMS)
+    # Plain text of roughly the requested length
+    return " ".join(FILLER[i % len(FILLER)] for i in range(int(completion_tokens * 0.75))) + "."
+
+
+def embed(text: str, dimensions: int = 256) -> list:
+    """Deterministic bag-of-words vector, so similar texts get similar embeddings."""
+    vector = [0.0] * dimensions
+    for word in re.findall(r"[a-z]+", text.lower()):
+        vector[zlib.crc32(word.encode()) % dimensions] += 1.0
+    vector[0] += 0.01
+    return vector
+
+
+def create_app(
+    latency: float = 0.2,
+    tokens_per_second: float = 50.0,
+    completion_tokens: int = 60,
+    embedding_latency: float = 0.05,
+) -> Starlette:
+    """
+    Build the fake API.
+
+    Args:
+        latency: Seconds before the first token
+        tokens_per_second: Generation speed after the first token (0 for instant)
+        completion_tokens: Length of plain-text replies
+        embedding_latency: Seconds per embeddings request
+    """
+
+    def usage(body: Dict[str, Any], text: str) -> Dict[str, int]:
+        prompt_tokens = sum(count_tokens(message["content"]) for message in body["messages"])
+        completion = count_tokens(text)
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion, "total_tokens": prompt_tokens + completion}
+
+    def chunk(body: Dict[str, Any], delta: Dict[str, Any], finish_reason=None) -> str:
+        payload = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if body.get("response_format") and body.get("model") in NO_RESPONSE_FORMAT:
+            return JSONResponse(
+                {
+                    "error": {
+                        "message": "Invalid parameter: 'response_format' is not supported with this model.",
+                        "type": "invalid_request_error",
+                        "param": "response_format",
+                        "code": None,
+                    }
+                },
+                status_code=400,
+            )
+        text = reply_for(body, completion_tokens)
+        generation = count_tokens(text) / tokens_per_second if tokens_per_second else 0.0
+
+        if body.get("stream"):
+
+            async def events():
+                await asyncio.sleep(latency)
+                words = text.split(" ")
+                # About four tokens per chunk
+                step = 3
+                for start in range(0, len(words), step):
+                    piece = " ".join(words[start : start + step]) + (" " if start + step < len(words) else "")
+                    yield chunk(body, {"role": "assistant", "content": piece} if start == 0 else {"content": piece})
+                    await asyncio.sleep(generation * step / max(len(words), 1))
+                yield chunk(body, {}, "stop")
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    final = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": 0,
+                        "model": body.get("model", "fake"),
+                        "choices": [],
+                        "usage": usage(body, text),
+                    }
+                    yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(latency + generation)
+        return JSONResponse(
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage(body, text),
+            }
+        )
+
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        await asyncio.sleep(embedding_latency)
+        tokens = sum(count_tokens(text) for text in inputs)
+        return JSONResponse(
+            {
+                "object": "list",
+                "model": body.get("model", "fake"),
+                "data": [
+                    {"object": "embedding", "index": index, "embedding": embed(text)}
+                    for index, text in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            }
+        )
+
+    return Starlette(
+        routes=[
+            Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+            Route("/v1/embeddings", embeddings, methods=["POST"]),
+        ]
+    )
+
+
+def serve(host: str = "127.0.0.1", port: int = 8900, **options: Any) -> None:
+    """Run the fake API until the process is stopped."""
+    uvicorn.run(create_app(**options), host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI API for offline benchmarks")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to listen on")
+    parser.add_argument("--port", type=int, default=8900, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Generation speed (0 for instant)")
+    parser.add_argument("--completion-tokens", type=int, default=60, help="Length of plain-text replies")
+    args = parser.parse_args()
+
+    print(f"Fake OpenAI API listening on http://{args.host}:{args.port}/v1")
+    serve(
+        args.host,
+        args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+    )
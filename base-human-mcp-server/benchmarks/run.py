@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the Human MCP server.
+
+Starts the fake OpenAI API from fake_openai.py, runs the server against it
+in-process, over stdio and over HTTP, drives the conversation, profile and
+negotiation tools at a fixed concurrency and reports throughput, p50/p99
+latency and peak memory. No network access or API key is needed.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import contextlib
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+import multiprocessing
+from typing import Any, Dict, List, Optional
+import numpy as np
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+sys.path.insert(0, SERVER_DIR)
+
+import fake_openai
+
+SCENARIOS = ["converse", "profile", "negotiation"]
+TRANSPORTS = ["memory", "stdio", "http"]
+
+
+def free_port() -> int:
+    """An unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 20.0) -> None:
+    """Block until something listens on a local port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Nothing is listening on port {port} after {timeout:.0f}s")
+
+
+def peak_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Peak resident memory of a process in MB (this process when pid is None)."""
+    if pid is None:
+        # ru_maxrss is in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def tree_peak_rss_mb(pid: int) -> Optional[float]:
+    """Summed peak memory of a process and its descendants in MB, e.g. a server and its workers."""
+    total = peak_rss_mb(pid)
+    if total is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(child) for child in f.read().split()]
+    except OSError:
+        children = []
+    for child in children:
+        total += tree_peak_rss_mb(child) or 0
+    return round(total, 1)
+
+
+def scenario_calls(scenario: str, tools: Dict[str, str], index: int) -> List[tuple]:
+    """
+    Tool calls making up one iteration of a scenario.
+
+    Args:
+        scenario: One of SCENARIOS
+        tools: Tool name without the persona prefix -> registered tool name
+        index: Iteration number, used to keep requests distinct
+
+    Returns:
+        (tool name, arguments) pairs; empty if the persona does not expose the tools
+    """
+    if scenario == "converse":
+        wanted = [
+            (
+                "converse",
+                {
+                    "request": {
+                        "message": f"What are you working on this week? ({index})",
+                        "conversation_context": {"id": f"bench-{index % 50}", "sender": "Benchmark"},
+                    }
+                },
+            )
+        ]
+    elif scenario == "profile":
+        wanted = [(tool, {}) for tool in ("get_interests", "get_skills", "get_goals", "get_profile")]
+    else:
+        # Two rounds of each negotiation, in a session of their own
+        wanted = [
+            (
+                "hire_ios_engineer",
+                {
+                    "request": {
+                        "session_id": f"bench-hire-{index}",
+                        "candidate_info": {"name": f"Candidate {index}", "experience": "5 years of Swift"},
+                        "current_salary": salary,
+                    }
+                },
+            )
+            for salary in (170000, 155000)
+        ] + [
+            (
+                "find_job",
+                {
+                    "request": {
+                        "session_id": f"bench-job-{index}",
+                        "job_info": {"title": "Staff Engineer"},
+                        "current_offer": offer,
+                    }
+                },
+            )
+            for offer in (130000, 150000)
+        ]
+    return [(tools[tool], arguments) for tool, arguments in wanted if tool in tools]
+
+
+async def run_scenario(client: Client, scenario: str, requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    """
+    Run `requests` iterations of a scenario with `concurrency` workers.
+
+    Returns:
+        Throughput and latency figures for individual tool calls
+    """
+    tools = {}
+    for tool in await client.list_tools():
+        # Tools are registered as <persona>_<tool>_tool; benchmark the first persona
+        for short in ("converse", "get_interests", "get_skills", "get_goals", "get_profile", "hire_ios_engineer", "find_job"):
+            if tool.name.endswith(f"_{short}_tool") and short not in tools:
+                tools[short] = tool.name
+
+    if not scenario_calls(scenario, tools, 0):
+        return {"scenario": scenario, "skipped": "persona does not expose these tools"}
+
+    latencies: List[float] = []
+    errors = 0
+
+    async def iteration(index: int, record: bool) -> None:
+        nonlocal errors
+        for name, arguments in scenario_calls(scenario, tools, index):
+            start = time.perf_counter()
+            try:
+                await client.call_tool(name, arguments)
+            except Exception:
+                errors += record
+            if record:
+                latencies.append(time.perf_counter() - start)
+
+    for index in range(warmup):
+        await iteration(-index - 1, record=False)
+
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for index in counter:
+            await iteration(index, record=True)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    values = np.array(latencies) * 1000
+    return {
+        "scenario": scenario,
+        "calls": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "calls_per_second": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(float(np.percentile(values, 50)), 1),
+        "p99_ms": round(float(np.percentile(values, 99)), 1),
+    }
+
+
+def server_environment(api_url: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["OPENAI_BASE_URL"] = api_url
+    env["OPENAI_API_KEY"] = env.get("OPENAI_API_KEY") or "benchmark"
+    return env
+
+
+async def bench_memory(args, api_url: str) -> List[Dict[str, Any]]:
+    """Run the server in this process with an in-memory transport."""
+    os.environ.update(server_environment(api_url))
+    import openai
+    import server
+
+    server.openai_client = openai.AsyncOpenAI(api_key="benchmark", base_url=api_url, max_retries=0)
+    # Keep the server's status messages out of the report on stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        humans = server.load_humans(args.config)
+    mcp = server.create_server(humans)
+    results = []
+    async with Client(mcp) as client:
+        for scenario in args.scenarios:
+            results.append(await run_scenario(client, scenario, args.requests, args.concurrency, args.warmup))
+    memory = peak_rss_mb()
+    for result in results:
+        result["peak_rss_mb"] = memory
+    return results
+
+
+async def bench_stdio(args, api_url: str) -> List[Dict[str, Any]]:
+    """Run the server as a subprocess speaking MCP over stdio."""
+    server_args = [argument for path in args.config for argument in ("--config", path)]
+    transport = PythonStdioTransport(
+        os.path.join(SERVER_DIR, "server.py"),
+        args=server_args,
+        env=server_environment(api_url),
+        cwd=os.getcwd(),
+        log_file=open(os.devnull, "w"),
+    )
+    results = []
+    async with Client(transport) as client:
+        for scenario in args.scenarios:
+            results.append(await run_scenario(client, scenario, args.requests, args.concurrency, args.warmup))
+        # The server process is a child of this one; its pid is not exposed, so look it up by command line
+        memory = child_peak_rss_mb("server.py")
+    for result in results:
+        result["peak_rss_mb"] = memory
+    return results
+
+
+def child_peak_rss_mb(script: str) -> Optional[float]:
+    """Peak memory of this process's child running `script`, if it can be found."""
+    try:
+        with open(f"/proc/{os.getpid()}/task/{os.getpid()}/children") as f:
+            pids = f.read().split()
+    except OSError:
+        return None
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/cmdline") as f:
+                if script in f.read():
+                    return peak_rss_mb(int(pid))
+        except OSError:
+            continue
+    return None
+
+
+async def bench_http(args, api_url: str) -> List[Dict[str, Any]]:
+    """Run the server as a subprocess with the streamable HTTP transport, with `--workers` processes."""
+    port = free_port()
+    server_args = [argument for path in args.config for argument in ("--config", path)]
+    if args.workers > 1:
+        server_args += ["--workers", str(args.workers)]
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, "server.py"), *server_args, "--transport", "http", "--port", str(port)],
+        env=server_environment(api_url),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        results = []
+        async with Client(f"http://127.0.0.1:{port}/mcp") as client:
+            for scenario in args.scenarios:
+                results.append(await run_scenario(client, scenario, args.requests, args.concurrency, args.warmup))
+        memory = tree_peak_rss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    for result in results:
+        result["peak_rss_mb"] = memory
+    return results
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    columns = ["transport", "scenario", "calls", "errors", "calls_per_second", "p50_ms", "p99_ms", "peak_rss_mb"]
+    headers = ["transport", "scenario", "calls", "errors", "calls/s", "p50 ms", "p99 ms", "peak MB"]
+    rows = []
+    for result in results:
+        if "skipped" in result:
+            rows.append([result["transport"], result["scenario"], f"skipped: {result['skipped']}"])
+            continue
+        rows.append(["-" if result.get(column) is None else str(result[column]) for column in columns])
+    widths = [max(len(header), *(len(row[i]) for row in rows if len(row) > i)) for i, header in enumerate(headers)]
+    print("  ".join(header.ljust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+async def main(args) -> List[Dict[str, Any]]:
+    port = free_port()
+    api_url = f"http://127.0.0.1:{port}/v1"
+    backend = multiprocessing.Process(
+        target=fake_openai.serve,
+        args=("127.0.0.1", port),
+        kwargs={
+            "latency": args.latency,
+            "tokens_per_second": args.tokens_per_second,
+            "completion_tokens": args.completion_tokens,
+        },
+        daemon=True,
+    )
+    backend.start()
+
+    results = []
+    try:
+        wait_for_port(port)
+        runners = {"memory": bench_memory, "stdio": bench_stdio, "http": bench_http}
+        for transport in args.transport:
+            print(f"Benchmarking {transport} transport...", file=sys.stderr)
+            for result in await runners[transport](args, api_url):
+                results.append({"transport": transport, **result})
+    finally:
+        backend.terminate()
+        backend.join()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Human MCP server against a fake OpenAI API")
+    parser.add_argument(
+        "--config",
+        type=str,
+        action="append",
+        help="Path to YAML configuration file (repeat to host several personas; default: config.yaml)",
+    )
+    parser.add_argument(
+        "--transport", nargs="+", choices=TRANSPORTS, default=TRANSPORTS, help="Transports to benchmark"
+    )
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS, help="Scenarios to run")
+    parser.add_argument("--requests", type=int, default=100, help="Iterations per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent iterations")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured iterations per scenario")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake API seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Fake API generation speed (0 for instant)")
+    parser.add_argument("--completion-tokens", type=int, default=60, help="Length of fake plain-text replies")
+    parser.add_argument("--workers", type=int, default=1, help="Server processes for the http transport")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+    args = parser.parse_args()
+
+    args.config = [os.path.abspath(path) for path in (args.config or [os.path.join(SERVER_DIR, "config.yaml")])]
+
+    # Caches, conversations and the search index go to a scratch directory, leaving the real data alone
+    with tempfile.TemporaryDirectory(prefix="human-bench-") as workdir:
+        os.chdir(workdir)
+        results = asyncio.run(main(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
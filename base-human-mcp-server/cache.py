@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class GenerationCache:
+    """
+    Content-addressed cache for LLM-generated profile data.
+    Entries live in memory and are mirrored to JSON files on disk so they
+    survive restarts. Both layers honour a TTL; memory is capped by entry
+    count and disk by total size, evicting the oldest entries first.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl_seconds: float = 86400,
+        max_entries: int = 256,
+        max_disk_bytes: int = 10 * 1024 * 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory for the on-disk copy (memory only if None)
+            ttl_seconds: Age after which an entry is considered stale
+            max_entries: Maximum number of entries kept in memory
+            max_disk_bytes: Maximum total size of the on-disk entries
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+            except OSError as e:
+                print(f"Warning: Cache directory unavailable ({e}), using memory only.")
+                self.directory = None
+
+    @classmethod
+    def from_config(cls, config) -> "GenerationCache":
+        """Build a cache from the `cache` section and `paths.cache_dir` of a HumanConfig."""
+        cache = config.settings.cache
+        directory = config.get_file_path("cache_dir") if cache.persist else None
+        return cls(
+            directory=directory,
+            ttl_seconds=cache.ttl_seconds,
+            max_entries=cache.max_entries,
+            max_disk_bytes=cache.max_disk_bytes,
+        )
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Hash the inputs of a generation into a stable cache key."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for a key, or None if missing or expired."""
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is None:
+                return None
+            self._remember(key, entry)
+
+        if self._expired(entry):
+            self.delete(key)
+            return None
+
+        self._memory.move_to_end(key)
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in memory and on disk."""
+        entry = {"created": time.time(), "value": value}
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both layers."""
+        self._memory.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every entry from both layers."""
+        for key in list(self._memory):
+            self.delete(key)
+        if self.directory:
+            for filename in os.listdir(self.directory):
+                if filename.endswith(".json"):
+                    self.delete(filename[: -len(".json")])
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return self.ttl_seconds is not None and time.time() - entry["created"] > self.ttl_seconds
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Discarding unreadable cache entry {key}: {str(e)}")
+            self.delete(key)
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write cache entry {key}: {str(e)}")
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Drop expired files, then the oldest ones until under the size limit."""
+        files = []
+        total = 0
+        now = time.time()
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if self.ttl_seconds is not None and now - stat.st_mtime > self.ttl_seconds:
+                self.delete(filename[: -len(".json")])
+                continue
+            files.append((stat.st_mtime, stat.st_size, filename))
+            total += stat.st_size
+
+        files.sort()
+        while files and total > self.max_disk_bytes:
+            _, size, filename = files.pop(0)
+            self.delete(filename[: -len(".json")])
+            total -= size
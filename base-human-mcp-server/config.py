@@ -1,6 +1,13 @@
 import os
+import json
 import yaml
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from prompts import PromptTemplate, compile_template, compile_templates
+from settings import Settings
+
+# Data files holding one persona's own profile; `{persona}` in their paths is the persona's slug
+PERSONA_FILES = ("interests_file", "skills_file", "goals_file", "services_file", "close_friends_file", "invites_file")
 
 
 class HumanConfig:
@@ -19,6 +26,7 @@ class HumanConfig:
         # Default configuration
         self.config = {
             "persona": {
+                "id": None,
                 "name": "Default User",
                 "bio": "No bio provided",
                 "location": "Unknown",
@@ -35,12 +43,26 @@ Respond to this message: "{message}"
 
 Keep your response authentic to your personality. Be engaging but concise.""",
                 "max_history": 5,
+                "stream": False,
+                "max_conversations": 1000,
+                "summary_prompt": """You are keeping notes for {name} about an ongoing conversation.
+
+Summary so far:
+{summary}
+
+Messages to add:
+{messages}
+
+Write an updated summary in under 100 words. Keep names, facts, questions and commitments.
+Return ONLY the summary text.""",
             },
             "matching": {
                 "interest_weight": 0.4,
                 "skill_weight": 0.4,
                 "goal_weight": 0.2,
                 "min_score_threshold": 0.6,
+                "top_k": 5,
+                "embedding_model": "text-embedding-3-small",
             },
             "startup_ideas": {
                 "prompt_template": """Generate 3-5 innovative startup ideas based on these shared interests and complementary skills:
@@ -57,24 +79,77 @@ For each idea, include:
 
 Focus on ideas that would be genuinely exciting and feasible given our skillsets.""",
                 "num_ideas": 3,
+                "max_concurrency": 4,
+                "similarity_threshold": 0.7,
+            },
+            "negotiation": {
+                "hiring_range": [100000, 150000],
+                "salary_range": [140000, 200000],
+                "max_rounds": 6,
+                "concession": 0.5,
+                "round_to": 1000,
+                "max_sessions": 1000,
+            },
+            "scheduling": {
+                "timezone": None,
+                # None for scheduling.DEFAULT_AVAILABILITY and DEFAULT_LOCATIONS; set in YAML
+                # they replace the defaults instead of being merged into them
+                "availability": None,
+                "locations": None,
+                "horizon_days": 14,
+                "slot_step_minutes": 30,
+                "max_slots": 3,
+                "generate_notes": False,
             },
             "paths": {
-                "interests_file": "data/interests.json",
-                "skills_file": "data/skills.json",
-                "goals_file": "data/goals.json",
-                "services_file": "data/services.json",
-                "close_friends_file": "data/close_friends.json",
-                "invites_file": "data/invites.json",
+                "interests_file": "data/{persona}/interests.json",
+                "skills_file": "data/{persona}/skills.json",
+                "goals_file": "data/{persona}/goals.json",
+                "services_file": "data/{persona}/services.json",
+                "close_friends_file": "data/{persona}/close_friends.json",
+                "invites_file": "data/{persona}/invites.json",
                 "conversation_file": "data/conversations.json",
+                "negotiation_file": "data/negotiations.json",
+                "bookings_file": "data/bookings.json",
+                "cache_dir": "data/cache",
+                "index_dir": "data/index",
+            },
+            "cache": {
+                "persist": True,
+                "ttl_seconds": 86400,
+                "max_entries": 256,
+                "max_disk_bytes": 10485760,
+            },
+            "search": {
+                "backend": "matrix",
+                "persist": True,
+                "top_k": 5,
             },
             "llm": {
                 "provider": "openai",
                 "model": "gpt-4",
                 "temperature": 0.7,
                 "max_tokens": 500,
+                "context_budget": 6000,
+                # Off by default: gpt-4 rejects response_format with a 400. Use json_object or
+                # json_schema with a model that supports them, such as gpt-4o
+                "structured_output": "off",
+                "timeout_seconds": 30,
+                "max_retries": 3,
+                "backoff_base_seconds": 0.5,
+                "backoff_max_seconds": 8,
+                "circuit_failure_threshold": 5,
+                "circuit_reset_seconds": 30,
+                "requests_per_minute": 500,
+                "tokens_per_minute": 80000,
+                "max_in_flight": 8,
             },
         }
 
+        # Source file and any problem loading it, kept for reloads
+        self.config_file = config_file
+        self.load_error: Optional[str] = None
+
         # Load config from file if provided
         if config_file:
             # Check if file exists
@@ -84,10 +159,21 @@ Focus on ideas that would be genuinely exciting and feasible given our skillsets
             else:
                 print(f"Warning: Config file not found: {config_file}")
                 print(f"Using default configuration instead.")
+                self.load_error = f"Config file not found: {config_file}"
 
         # Override with environment variables
         self._load_from_env()
 
+        # Every prompt is compiled and checked against its handler's placeholders here,
+        # so a bad template fails at load instead of on a request (raises TemplateError)
+        self.templates: Dict[Tuple[str, str], PromptTemplate] = compile_templates(self.config)
+
+        # Typed, frozen view of the values handlers read, checked here once (raises SettingsError)
+        self.settings: Settings = Settings.from_dict(self.config)
+
+        # Persona context sent ahead of every LLM prompt; built once per load
+        self._system_prefix = self._build_system_prefix()
+
     def _load_from_yaml(self, config_file: str) -> None:
         """Load configuration from a YAML file."""
         try:
@@ -96,6 +182,7 @@ Focus on ideas that would be genuinely exciting and feasible given our skillsets
 
             if not yaml_config:
                 print(f"Warning: Config file {config_file} is empty or invalid YAML.")
+                self.load_error = f"Config file {config_file} is empty or invalid YAML"
                 return
 
             # Print loaded persona name for debugging
@@ -114,6 +201,7 @@ Focus on ideas that would be genuinely exciting and feasible given our skillsets
                     )
         except Exception as e:
             print(f"Error loading config from {config_file}: {str(e)}")
+            self.load_error = str(e)
             import traceback
 
             traceback.print_exc()
@@ -162,6 +250,34 @@ Focus on ideas that would be genuinely exciting and feasible given our skillsets
             if os.environ.get(env_key):
                 self.config["paths"][key] = os.environ.get(env_key)
 
+    def _build_system_prefix(self) -> str:
+        """Render the persona and LLM settings into the shared system message."""
+        config_data = {
+            "persona": {
+                "name": self.config["persona"].get("name"),
+                "bio": self.config["persona"].get("bio"),
+                "location": self.config["persona"].get("location"),
+                "timezone": self.config["persona"].get("timezone"),
+                "style": self.config["persona"].get("style"),
+            },
+            # Only what shapes the replies; timeouts, retries and rate limits mean nothing to the model
+            "llm": {
+                "model": self.config["llm"].get("model"),
+                "temperature": self.config["llm"].get("temperature"),
+                "max_tokens": self.config["llm"].get("max_tokens"),
+            },
+        }
+        config_json = json.dumps(config_data, indent=2)
+
+        return f"""
+Full configuration context:
+```
+{config_json}
+```
+
+Now, with this context in mind, please respond to the following request.
+"""
+
     def _deep_update(self, original: Dict, update: Dict) -> None:
         """Recursively update nested dictionaries."""
         for key, value in update.items():
@@ -199,40 +315,86 @@ Focus on ideas that would be genuinely exciting and feasible given our skillsets
 
     def get_persona_name(self) -> str:
         """Get the persona name."""
-        return self.config["persona"]["name"]
+        return self.settings.persona.name
 
     def get_persona_style(self) -> str:
         """Get the persona conversation style."""
-        return self.config["persona"]["style"]
+        return self.settings.persona.style
 
     def get_conversation_prompt(
         self, name: str, style: str, message: str, history: str
     ) -> str:
         """Get the formatted conversation prompt."""
-        template = self.config["conversation"]["prompt_template"]
-        return template.format(name=name, style=style, message=message, history=history)
+        return self.get_template("conversation").render(
+            name=name, style=style, message=message, history=history
+        )
 
     def get_startup_ideas_prompt(
         self, interests: str, my_skills: str, their_skills: str
     ) -> str:
         """Get the formatted startup ideas prompt."""
-        template = self.config["startup_ideas"]["prompt_template"]
-        return template.format(
-            interests=interests, my_skills=my_skills, their_skills=their_skills
+        return self.get_template("startup_ideas").render(
+            name=self.settings.persona.name,
+            style=self.settings.persona.style,
+            interests=interests,
+            my_skills=my_skills,
+            their_skills=their_skills,
         )
 
+    def get_template(
+        self, section: str, key: str = "prompt_template", default: Optional[str] = None
+    ) -> PromptTemplate:
+        """
+        Get a compiled prompt template.
+
+        Args:
+            section: The configuration section
+            key: The template key within the section
+            default: Template text to compile when the config has none
+
+        Returns:
+            The compiled template; render it with PromptTemplate.render(**values)
+        """
+        template = self.templates.get((section, key))
+        if template is None:
+            if default is None:
+                raise KeyError(f"No {section}.{key} prompt configured")
+            template = compile_template(default, section, key)
+        return template
+
     def get_matching_weights(self) -> Dict[str, float]:
         """Get the weights used for compatibility matching."""
+        matching = self.settings.matching
         return {
-            "interest": self.config["matching"]["interest_weight"],
-            "skill": self.config["matching"]["skill_weight"],
-            "goal": self.config["matching"]["goal_weight"],
+            "interest": matching.interest_weight,
+            "skill": matching.skill_weight,
+            "goal": matching.goal_weight,
         }
 
-    def get_file_path(self, key: str) -> str:
-        """Get a file path from the configuration."""
-        return self.config["paths"].get(key, f"data/{key}.json")
+    def get_file_path(self, key: str, persona: Optional[str] = None) -> str:
+        """
+        Get a file path from the configuration.
+
+        Args:
+            key: The key under `paths`
+            persona: Persona slug substituted for `{persona}` in the path
+        """
+        path = self.config["paths"].get(key, f"data/{key}.json")
+        if persona is not None:
+            path = path.replace("{persona}", persona)
+        return path
 
-    def get_llm_config(self) -> Dict[str, Any]:
-        """Get the LLM configuration."""
-        return self.config["llm"]
+    def get_llm_config(self) -> Mapping[str, Any]:
+        """Get a read-only view of the LLM configuration; prefer `settings.llm` for typed values."""
+        return MappingProxyType(self.config["llm"])
+
+    def get_system_prefix(self) -> str:
+        """Get the persona context block that prefixes every LLM prompt."""
+        return self._system_prefix
+
+    def reload(self) -> "HumanConfig":
+        """
+        Load the config file again into a new snapshot.
+        This instance is left untouched, so requests already holding it are unaffected.
+        """
+        return HumanConfig(self.config_file)
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+from typing import Dict, List, Any, Optional, Tuple
+from locking import FileLock, file_signature
+
+
+class ConversationStore:
+    """
+    Server-side conversation history keyed by conversation ID.
+    Only the last `max_history` turns are kept verbatim; older turns are
+    moved aside to be folded into a rolling summary, so the prompt for each
+    turn stays the same size however long the conversation runs.
+    Changes are made under a file lock against the latest copy on disk, so
+    several server processes can share one file. Beyond `max_conversations`,
+    the least recently updated conversations are dropped.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_history: int = 10, max_conversations: int = 1000):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file the conversations are persisted to (memory only if None)
+            max_history: Number of recent turns kept verbatim per conversation
+            max_conversations: Conversations kept; the least recently updated are dropped first
+        """
+        self.path = path
+        self.max_history = max_history
+        self.max_conversations = max_conversations
+        self.conversations: Dict[str, Dict[str, Any]] = {}
+        self._lock = FileLock(path)
+        self._signature = None
+        self._sync()
+
+    @classmethod
+    def from_config(cls, config) -> "ConversationStore":
+        """Build a store from `paths.conversation_file` and the `conversation` settings."""
+        return cls(
+            path=config.get_file_path("conversation_file"),
+            max_history=config.settings.conversation.max_history,
+            max_conversations=config.settings.conversation.max_conversations,
+        )
+
+    def get(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Get a conversation, creating it if needed.
+
+        Returns:
+            Dict with the rolling "summary", the recent "turns", evicted turns
+            waiting to be summarized ("unsummarized") and the total "message_count"
+        """
+        self._sync()
+        if conversation_id not in self.conversations:
+            self.conversations[conversation_id] = {
+                "summary": "",
+                "turns": [],
+                "unsummarized": [],
+                "message_count": 0,
+                "updated": time.time(),
+            }
+        return self.conversations[conversation_id]
+
+    async def record(
+        self,
+        conversation_id: str,
+        turns: List[Tuple[str, str]],
+        history: Optional[List[Dict[str, Any]]] = None,
+        max_history: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Add turns, sliding older turns out of the window, and return the conversation.
+        The whole change is saved once, under one lock.
+
+        Args:
+            conversation_id: The conversation to add to
+            turns: (sender, message) pairs, oldest first
+            history: Caller-supplied history, imported first if the store has not seen the conversation
+            max_history: Window size for this conversation (defaults to the store's)
+        """
+        async with self._lock:
+            conversation = self.get(conversation_id)
+            if history and not conversation["message_count"]:
+                for msg in history:
+                    self._append(conversation, msg.get("sender", "Unknown"), msg.get("message", ""), max_history)
+            for sender, message in turns:
+                self._append(conversation, sender, message, max_history)
+            if len(self.conversations) > self.max_conversations:
+                for stale_id in sorted(self.conversations, key=lambda key: self.conversations[key]["updated"])[
+                    : len(self.conversations) - self.max_conversations
+                ]:
+                    del self.conversations[stale_id]
+            self.save()
+        return conversation
+
+    async def set_summary(self, conversation_id: str, summary: str, folded: List[Dict[str, Any]]) -> bool:
+        """
+        Replace the rolling summary with one that folds in the `folded` turns,
+        removing them from the turns waiting to be summarized.
+
+        Returns:
+            False, leaving the conversation unchanged, if those turns are no longer
+            waiting (another process summarized them first)
+        """
+        async with self._lock:
+            conversation = self.get(conversation_id)
+            if conversation["unsummarized"][: len(folded)] != folded:
+                return False
+            del conversation["unsummarized"][: len(folded)]
+            conversation["summary"] = summary
+            self.save()
+        return True
+
+    def history_lines(
+        self,
+        conversation_id: str,
+        history: Optional[List[Dict[str, Any]]] = None,
+        max_history: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Render the summary and recent turns as prompt lines, oldest first.
+        Caller-supplied `history` stands in for a conversation the store has not seen yet.
+        """
+        conversation = self.get(conversation_id)
+        if history and not conversation["message_count"]:
+            conversation = {"summary": "", "turns": [], "unsummarized": [], "message_count": 0}
+            for msg in history:
+                self._append(conversation, msg.get("sender", "Unknown"), msg.get("message", ""), max_history)
+        lines = []
+        if conversation["summary"]:
+            lines.append(f"Summary of earlier conversation: {conversation['summary']}")
+        lines.extend(f"{msg['sender']}: {msg['message']}" for msg in conversation["turns"])
+        return lines
+
+    def save(self) -> None:
+        """Write all conversations to disk atomically."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.conversations, f)
+            os.replace(tmp_path, self.path)
+            self._signature = file_signature(self.path)
+        except OSError as e:
+            print(f"Warning: Could not save conversations to {self.path}: {str(e)}")
+
+    def _sync(self) -> None:
+        """Reload the file if another process saved it since this one last read or wrote it."""
+        signature = file_signature(self.path)
+        if signature is None or signature == self._signature:
+            return
+        # Recorded even if unreadable, so a bad file is reported once and then replaced by the next save
+        self._signature = signature
+        try:
+            with open(self.path, "r") as f:
+                self.conversations = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load conversations from {self.path}: {str(e)}")
+
+    def _append(
+        self, conversation: Dict[str, Any], sender: str, message: str, max_history: Optional[int]
+    ) -> None:
+        conversation["turns"].append({"sender": sender, "message": message})
+        conversation["message_count"] += 1
+        conversation["updated"] = time.time()
+
+        window = self.max_history if max_history is None else max_history
+        overflow = len(conversation["turns"]) - window
+        if overflow > 0:
+            conversation["unsummarized"].extend(conversation["turns"][:overflow])
+            del conversation["turns"][:overflow]
@@ -0,0 +1,55 @@
+import os
+import json
+from typing import Dict, Any, Callable, Optional, Tuple
+
+
+class DataFiles:
+    """
+    Reads the JSON data files named in a config's `paths` section.
+    Each file is parsed once and served from memory until its modification
+    time or size changes, so repeated reads cost a single stat call.
+    """
+
+    def __init__(self):
+        """Initialize an empty file cache."""
+        self._files: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+    def load(self, path: str, validator: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        Get the parsed contents of a JSON file.
+
+        Args:
+            path: Path to the file
+            validator: Optional check of the parsed contents, run once per file change
+
+        Returns:
+            The parsed JSON, or None if the file does not exist, cannot be parsed or is invalid
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._files.pop(path, None)
+            return None
+        except OSError as e:
+            print(f"Error reading {path}: {str(e)}")
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            with open(path, "r") as f:
+                value = json.load(f)
+        except (OSError, ValueError) as e:
+            # Remembered as unreadable until the file changes, so the error is reported once
+            print(f"Error reading {path}: {str(e)}")
+            value = None
+
+        if value is not None and validator is not None and not validator(value):
+            print(f"Warning: Ignoring {path}; its contents do not have the expected format")
+            value = None
+
+        self._files[path] = (signature, value)
+        return value
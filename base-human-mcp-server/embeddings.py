@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+import numpy as np
+import openai
+from resilience import RetryPolicy
+
+
+class Embedder:
+    """
+    Embeds texts with the OpenAI embeddings API.
+    Vectors are L2-normalized float32 rows, so dot products are cosine
+    similarities. They are cached in memory by text, and only cache misses
+    are sent upstream, batched into as few requests as possible. With a retry
+    policy, each request gets its timeout, retries and circuit breaker.
+    """
+
+    def __init__(
+        self,
+        openai_client: openai.AsyncOpenAI,
+        model: str = "text-embedding-3-small",
+        max_entries: int = 20000,
+        batch_size: int = 256,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Initialize the embedder.
+
+        Args:
+            openai_client: Async OpenAI client used for embedding requests
+            model: Embedding model name
+            max_entries: Maximum number of vectors kept in memory
+            batch_size: Maximum texts per embeddings request
+            retry_policy: Policy each embeddings request runs under (sent once, as is, if None)
+        """
+        self.openai_client = openai_client
+        self.model = model
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.retry_policy = retry_policy
+        self._vectors: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Returns:
+            Array of shape (len(texts), dimensions)
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        found = {}
+        for text in texts:
+            vector = self._vectors.get((self.model, text))
+            if vector is not None:
+                self._vectors.move_to_end((self.model, text))
+                found[text] = vector
+
+        missing = [text for text in dict.fromkeys(texts) if text not in found]
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            request = lambda: self.openai_client.embeddings.create(model=self.model, input=batch)
+            response = await (self.retry_policy.run(request) if self.retry_policy else request())
+            for text, item in zip(batch, sorted(response.data, key=lambda item: item.index)):
+                vector = np.asarray(item.embedding, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                found[text] = vector / norm if norm else vector
+                self._remember(text, found[text])
+
+        return np.stack([found[text] for text in texts])
+
+    def _remember(self, text: str, vector: np.ndarray) -> None:
+        self._vectors[(self.model, text)] = vector
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
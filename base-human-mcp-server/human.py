@@ -0,0 +1,1324 @@
+import re
+import time
+import uuid
+import asyncio
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+from typing import Dict, List, Optional, Any, Awaitable, Callable
+import openai
+from fastmcp import Context
+from config import HumanConfig
+from cache import GenerationCache
+from singleflight import SingleFlight
+from conversations import ConversationStore
+from negotiation import NegotiationStore, HIRE, JOB, parse_amount
+from scheduling import (
+    Availability,
+    BookingIndex,
+    Interval,
+    DEFAULT_LOCATIONS,
+    load_zone,
+    parse_date,
+    subtract,
+    common_free,
+    find_slots,
+)
+from prompt_budget import PromptBudget, compact_json
+from embeddings import Embedder
+from matching import rank_matches, idea_inputs
+from people_index import PeopleIndex, INDEXED_SECTIONS, item_text
+from data_files import DataFiles
+from structured import extract_json, response_format, schema_validator
+from resilience import CircuitBreaker, RetryPolicy
+from scheduler import LLMScheduler, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BACKGROUND
+from metrics import (
+    current_tool,
+    PROMPT_BUILD,
+    QUEUE_WAIT,
+    UPSTREAM_LATENCY,
+    FIRST_TOKEN,
+    JSON_PARSE,
+    PROMPT_TOKENS,
+    COMPLETION_TOKENS,
+    PROFILE_HITS,
+    DEFAULT_FALLBACKS,
+)
+
+# Tools every persona exposes unless its config lists its own
+DEFAULT_TOOLS = [
+    "get_basic_info",
+    "get_interests",
+    "get_skills",
+    "get_goals",
+    "get_profile",
+    "converse",
+    "match",
+    "search_people",
+    "generate_startup_ideas",
+]
+
+# Handlers that can be exposed as tools through the `tools` config list
+AVAILABLE_TOOLS = DEFAULT_TOOLS + ["hire_ios_engineer", "find_job", "schedule_meeting", "find_meeting_slots", "hire"]
+
+# Prompts for generated profile sections when the config does not define one
+DEFAULT_PROFILE_PROMPTS = {
+    "interests": """
+    You are {name}, a person with a unique set of interests.
+    Based on your personality and style ('{style}'),
+    generate a detailed list of 5-7 interests that would authentically represent you.
+
+    For each interest, include:
+    1. The name of the interest
+    2. A score from 0.0 to 1.0 indicating how important this interest is to you
+    3. A brief description with specifics about this interest
+
+    GOAL: Return a JSON array of objects with "name", "score", and "details" fields.
+    Return ONLY the JSON array without any explanations or additional text.
+    """,
+    "skills": """
+    You are {name}, a person with a unique set of skills.
+    Based on your personality and style ('{style}'),
+    generate a detailed list of 5-7 skills that would authentically represent you.
+
+    For each skill, include:
+    1. The name of the skill
+    2. A level from 0.0 to 1.0 indicating your proficiency
+    3. A brief description with specifics about this skill
+
+    GOAL: Return a JSON array of objects with "name", "level", and "details" fields.
+    Return ONLY the JSON array without any explanations or additional text.
+    """,
+    "goals": """
+    You are {name}, a person with specific goals and aspirations.
+    Based on your personality and style ('{style}'),
+    generate a set of authentic goals that would represent you.
+
+    Include:
+    1. 2-3 short-term goals (achievable within months)
+    2. 2-3 medium-term goals (achievable within 1-2 years)
+    3. 2-3 long-term goals (achievable in 3+ years)
+
+    GOAL: Return a JSON object with "short_term", "medium_term", and "long_term" keys,
+    each containing an array of goal strings.
+    Return ONLY the JSON object without any explanations or additional text.
+    """,
+}
+
+# Wraps the section prompts of get_profile into a single structured request
+DEFAULT_PROFILE_PROMPT = """
+    You are {name}. Your personality style is '{style}'.
+    Build the following sections of your profile in a single response.
+    Follow each section's instructions for the content and format of its value.
+
+    {instructions}
+
+    GOAL: Return a JSON object with the keys {sections}, each holding that section's result.
+    Return ONLY the JSON object without any explanations or additional text.
+    """
+
+
+# Checks that a generated profile section has the expected shape
+PROFILE_VALIDATORS: Dict[str, Callable[[Any], bool]] = {
+    section: schema_validator(section) for section in ("interests", "skills", "goals")
+}
+
+# Fallback when a section has no defaults configured
+PROFILE_EMPTY: Dict[str, Any] = {"interests": [], "skills": [], "goals": {}}
+
+# Settings read once at startup by the stores and by the resources shared between personas
+# (see server.load_humans); a reload cannot apply them
+RESTART_SETTINGS = (
+    ("matching", "embedding_model"),
+    ("cache", "persist"),
+    ("cache", "ttl_seconds"),
+    ("cache", "max_entries"),
+    ("cache", "max_disk_bytes"),
+    ("search", "backend"),
+    ("search", "persist"),
+    ("conversation", "max_conversations"),
+    ("negotiation", "max_sessions"),
+    ("llm", "requests_per_minute"),
+    ("llm", "tokens_per_minute"),
+    ("llm", "max_in_flight"),
+    ("llm", "circuit_failure_threshold"),
+    ("llm", "circuit_reset_seconds"),
+)
+
+
+def their_figure(their_offer: Optional[float], party: str, verb: str) -> str:
+    """The other side's figure for a negotiation prompt, e.g. "the employer offers $150,000"."""
+    if their_offer is None:
+        return f"{party} has not named a figure yet"
+    return f"{party} {verb} ${their_offer:,.0f}"
+
+
+class Human:
+    """
+    A hosted persona: its configuration and the handlers behind its tools.
+    Humans served by the same process share the OpenAI client, the generation
+    cache and in-flight request deduplication; conversation stores are shared
+    between humans that point at the same conversation file.
+    """
+
+    def __init__(
+        self,
+        config: HumanConfig,
+        openai_client: openai.AsyncOpenAI,
+        generation_cache: GenerationCache,
+        inflight_completions: SingleFlight,
+        conversation_store: ConversationStore,
+        embedder: Embedder,
+        people_index: PeopleIndex,
+        circuit_breaker: CircuitBreaker,
+        scheduler: LLMScheduler,
+        negotiation_store: NegotiationStore,
+        booking_index: BookingIndex,
+        peers: Optional[List["Human"]] = None,
+    ):
+        """
+        Initialize a persona runtime.
+
+        Args:
+            config: The persona's loaded configuration
+            openai_client: Shared async OpenAI client
+            generation_cache: Shared cache for generated profile sections
+            inflight_completions: Shared deduplication of identical completions
+            conversation_store: Store for this persona's conversation file
+            embedder: Shared embedder for profile texts
+            people_index: Shared nearest-neighbour index over profile items
+            circuit_breaker: Shared breaker that stops OpenAI calls while the API is unhealthy
+            scheduler: Shared admission queue enforcing the OpenAI rate budgets
+            negotiation_store: Store for this persona's negotiation file
+            booking_index: Booked meetings for this persona's bookings file
+            peers: The personas hosted alongside this one (may include itself)
+        """
+        self.config = config
+        self.openai_client = openai_client
+        self.generation_cache = generation_cache
+        self.inflight_completions = inflight_completions
+        self.conversation_store = conversation_store
+        self.embedder = embedder
+        self.people_index = people_index
+        self.scheduler = scheduler
+        self.negotiation_store = negotiation_store
+        self.booking_index = booking_index
+        self.peers = peers if peers is not None else []
+
+        # Parsed data files from `paths`, re-read only when they change on disk
+        self.data_files = DataFiles()
+
+        # Background summarization tasks by conversation ID
+        self.summary_tasks: Dict[str, "asyncio.Task[None]"] = {}
+
+        # Background re-indexing of this human's profile, rerun while sections keep changing
+        self.index_task: Optional["asyncio.Task[None]"] = None
+        self.index_stale = False
+
+        # Keeps prompts within the configured input-token budget
+        self.prompt_budget = PromptBudget.from_config(config)
+
+        # Timeouts and retries for OpenAI calls, from the `llm` section
+        self.retry_policy = RetryPolicy.from_config(config, circuit_breaker)
+
+        # Identifier namespacing this persona's tools and resources; fixed for the process lifetime
+        slug = config.settings.persona.id or config.settings.persona.name
+        self.slug = re.sub(r"[^a-z0-9]+", "_", slug.lower()).strip("_")
+
+    @property
+    def tools(self) -> List[str]:
+        """Names of the handlers exposed as tools for this persona."""
+        tools = self.config.get("tools", fallback=DEFAULT_TOOLS)
+        unknown = [tool for tool in tools if tool not in AVAILABLE_TOOLS]
+        if unknown:
+            print(f"Warning: Ignoring unknown tools for {self.slug}: {', '.join(unknown)}")
+        return [tool for tool in tools if tool in AVAILABLE_TOOLS]
+
+    def update_config(self, new_config: HumanConfig) -> List[str]:
+        """
+        Swap in a reloaded config snapshot, invalidating only what depended on changed values.
+        The swap is a plain attribute assignment, so it never waits on in-flight requests.
+
+        Returns:
+            The top-level config sections that changed
+        """
+        old_config = self.config
+        changed = sorted(
+            section
+            for section in set(old_config.config) | set(new_config.config)
+            if old_config.get(section) != new_config.get(section)
+        )
+        if not changed:
+            return []
+
+        # Generated sections whose inputs are unchanged stay cached
+        for section in DEFAULT_PROFILE_PROMPTS:
+            old_key = self.generation_cache_key(section, old_config)
+            if old_key != self.generation_cache_key(section, new_config):
+                self.generation_cache.delete(old_key)
+
+        prompt_budget = self.prompt_budget
+        if old_config.get_system_prefix() != new_config.get_system_prefix() or "llm" in changed:
+            prompt_budget = PromptBudget.from_config(new_config)
+
+        retry_policy = self.retry_policy
+        if "llm" in changed:
+            retry_policy = RetryPolicy.from_config(new_config, self.retry_policy.breaker)
+
+        self.config, self.prompt_budget, self.retry_policy = new_config, prompt_budget, retry_policy
+
+        needs_restart = [section for section in ("tools", "paths") if section in changed] + [
+            f"{section}.{field}"
+            for section, field in RESTART_SETTINGS
+            if getattr(getattr(old_config.settings, section), field)
+            != getattr(getattr(new_config.settings, section), field)
+        ]
+        for setting in needs_restart:
+            print(f"Warning: Changes to '{setting}' for {self.slug} take effect after a restart")
+
+        if "persona" in changed or any(section in changed for section in INDEXED_SECTIONS):
+            self.refresh_index()
+
+        return changed
+
+    def metric_labels(self) -> Dict[str, str]:
+        """Labels attributing metrics to this persona and the tool being handled."""
+        return {"persona": self.slug, "tool": current_tool.get()}
+
+    def parse_json(
+        self, text: str, validator: Optional[Callable[[Any], bool]] = None, key: Optional[str] = None
+    ) -> Any:
+        """
+        Extract the JSON value from a model reply, recording the time it takes.
+        Fenced or chatty replies are tolerated; see structured.extract_json.
+
+        Raises:
+            ValueError: If the reply holds no JSON value passing the validator
+        """
+        with JSON_PARSE.time(**self.metric_labels()):
+            return extract_json(text, validator, key)
+
+    def conversation_key(self, conversation_id: str) -> str:
+        """Namespace a conversation ID so personas sharing a store do not collide."""
+        return f"{self.slug}:{conversation_id}"
+
+    def completion_params(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_mode: bool = False,
+        schema: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the chat completion arguments for a prompt.
+        `llm.max_tokens` applies unless max_tokens is given explicitly. With a schema
+        (one of structured.OUTPUT_SCHEMAS), the reply is constrained as `llm.structured_output` allows.
+        """
+        llm = self.config.settings.llm
+
+        # Persona context is a stable prefix so provider prompt caching applies
+        params = {
+            "model": llm.model,
+            "messages": [
+                {"role": "system", "content": self.config.get_system_prefix()},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": llm.temperature,
+            "max_tokens": max_tokens or llm.max_tokens,
+        }
+        if schema is not None:
+            output_format = response_format(schema, llm.structured_output)
+            if output_format is not None:
+                params["response_format"] = output_format
+        elif json_mode and llm.structured_output != "off":
+            params["response_format"] = {"type": "json_object"}
+        return params
+
+    def estimate_tokens(self, params: Dict[str, Any]) -> int:
+        """Estimate the prompt plus completion tokens of a request, for the rate budget."""
+        prompt_tokens = self.prompt_budget.count(params["messages"][-1]["content"])
+        return self.prompt_budget.reserved_tokens + prompt_tokens + params["max_tokens"]
+
+    async def call_openai(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False,
+        priority: int = PRIORITY_NORMAL,
+        schema: Optional[str] = None,
+    ) -> str:
+        """
+        Call OpenAI API with a prompt and return the response (a JSON object if json_mode,
+        shaped after the named output schema if schema is given).
+        The request waits for the shared scheduler to admit it at the given priority.
+        """
+        try:
+            params = self.completion_params(prompt, temperature, max_tokens, json_mode, schema)
+
+            async def complete():
+                labels = self.metric_labels()
+                queued_at = time.perf_counter()
+                async with self.scheduler.slot(priority, self.estimate_tokens(params)) as reservation:
+                    QUEUE_WAIT.observe(time.perf_counter() - queued_at, **labels)
+                    with UPSTREAM_LATENCY.time(**labels):
+                        response = await self.retry_policy.run(
+                            lambda: self.openai_client.chat.completions.create(**params)
+                        )
+                    if response.usage is not None:
+                        reservation.used_tokens = response.usage.total_tokens
+                        PROMPT_TOKENS.inc(response.usage.prompt_tokens, **labels)
+                        COMPLETION_TOKENS.inc(response.usage.completion_tokens, **labels)
+                    return response
+
+            response = await self.inflight_completions.do(
+                (
+                    params["messages"][0]["content"],
+                    prompt,
+                    params["model"],
+                    params["temperature"],
+                    params["max_tokens"],
+                    compact_json(params.get("response_format")),
+                ),
+                complete,
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Error calling OpenAI: {str(e)}")
+            return f"Error generating response: {str(e)}"
+
+    async def stream_openai(
+        self,
+        prompt: str,
+        on_text: Callable[[str], Awaitable[None]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        priority: int = PRIORITY_NORMAL,
+    ) -> str:
+        """Stream a response from OpenAI, passing each partial text to on_text, and return the full response."""
+        try:
+            params = self.completion_params(prompt, temperature, max_tokens)
+            labels = self.metric_labels()
+            queued_at = time.perf_counter()
+            async with self.scheduler.slot(priority, self.estimate_tokens(params)) as reservation:
+                sent_at = time.perf_counter()
+                QUEUE_WAIT.observe(sent_at - queued_at, **labels)
+                stream = await self.retry_policy.run(
+                    lambda: self.openai_client.chat.completions.create(
+                        stream=True, stream_options={"include_usage": True}, **params
+                    )
+                )
+
+                # Once text has been sent it cannot be retried, but a stalled stream still times out
+                parts = []
+                usage = None
+                chunks = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), self.retry_policy.timeout_seconds)
+                    except StopAsyncIteration:
+                        break
+                    # The usage arrives in a final chunk with no choices
+                    if getattr(chunk, "usage", None):
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if text:
+                        if not parts:
+                            FIRST_TOKEN.observe(time.perf_counter() - sent_at, **labels)
+                        parts.append(text)
+                        await on_text(text)
+                UPSTREAM_LATENCY.observe(time.perf_counter() - sent_at, **labels)
+                if usage:
+                    reservation.used_tokens = usage.total_tokens
+                    PROMPT_TOKENS.inc(usage.prompt_tokens, **labels)
+                    COMPLETION_TOKENS.inc(usage.completion_tokens, **labels)
+                return "".join(parts)
+        except Exception as e:
+            print(f"Error streaming from OpenAI: {str(e)}")
+            return f"Error generating response: {str(e)}"
+
+    def generation_cache_key(self, section: str, config: Optional[HumanConfig] = None) -> str:
+        """Build the cache key for a generated profile section (for the current config by default)."""
+        config = config or self.config
+        settings = config.settings
+        return self.generation_cache.make_key(
+            section=section,
+            name=settings.persona.name,
+            style=settings.persona.style,
+            template=config.get(
+                section, "prompt_template", fallback=DEFAULT_PROFILE_PROMPTS[section]
+            ),
+            model=settings.llm.model,
+            temperature=settings.llm.temperature,
+        )
+
+    def get_basic_info(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
+    ) -> Dict[str, Any]:
+        """Get basic information about this human."""
+        persona = self.config.settings.persona
+        return {
+            "name": persona.name,
+            "bio": persona.bio,
+            "location": persona.location,
+            "timezone": persona.timezone,
+        }
+
+    async def get_interests(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
+    ) -> List[Dict[str, Any]]:
+        """Get detailed interests of this human with relevance scores."""
+        prompt = self.config.get_template("interests", default=DEFAULT_PROFILE_PROMPTS["interests"]).render(
+            name=self.config.settings.persona.name,
+            style=self.config.settings.persona.style,
+        )
+
+        stored = self.stored_section("interests")
+        if stored is not None:
+            return stored
+
+        cache_key = self.generation_cache_key("interests")
+
+        try:
+            response = await self.call_openai(prompt, priority=PRIORITY_BACKGROUND, schema="interests")
+            interests = self.parse_json(response, PROFILE_VALIDATORS["interests"], "interests")
+            self.generation_cache.set(cache_key, interests)
+            self.refresh_index()
+            return interests
+        except Exception as e:
+            print(f"Error generating interests: {str(e)}")
+            DEFAULT_FALLBACKS.inc(section="interests", **self.metric_labels())
+            return self.config.get("interests", "defaults", fallback=[])
+
+    async def get_skills(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
+    ) -> List[Dict[str, Any]]:
+        """Get detailed skills of this human with proficiency levels."""
+        prompt = self.config.get_template("skills", default=DEFAULT_PROFILE_PROMPTS["skills"]).render(
+            name=self.config.settings.persona.name,
+            style=self.config.settings.persona.style,
+        )
+
+        stored = self.stored_section("skills")
+        if stored is not None:
+            return stored
+
+        cache_key = self.generation_cache_key("skills")
+
+        try:
+            response = await self.call_openai(prompt, priority=PRIORITY_BACKGROUND, schema="skills")
+            skills = self.parse_json(response, PROFILE_VALIDATORS["skills"], "skills")
+            self.generation_cache.set(cache_key, skills)
+            self.refresh_index()
+            return skills
+        except Exception as e:
+            print(f"Error generating skills: {str(e)}")
+            DEFAULT_FALLBACKS.inc(section="skills", **self.metric_labels())
+            return self.config.get("skills", "defaults", fallback=[])
+
+    async def get_goals(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
+    ) -> Dict[str, List[str]]:
+        """Get short, medium, and long-term goals of this human."""
+        prompt = self.config.get_template("goals", default=DEFAULT_PROFILE_PROMPTS["goals"]).render(
+            name=self.config.settings.persona.name,
+            style=self.config.settings.persona.style,
+        )
+
+        stored = self.stored_section("goals")
+        if stored is not None:
+            return stored
+
+        cache_key = self.generation_cache_key("goals")
+
+        try:
+            response = await self.call_openai(prompt, priority=PRIORITY_BACKGROUND, schema="goals")
+            goals = self.parse_json(response, PROFILE_VALIDATORS["goals"], "goals")
+            self.generation_cache.set(cache_key, goals)
+            return goals
+        except Exception as e:
+            print(f"Error generating goals: {str(e)}")
+            DEFAULT_FALLBACKS.inc(section="goals", **self.metric_labels())
+            return self.config.get("goals", "defaults", fallback={})
+
+    async def get_profile(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
+    ) -> Dict[str, Any]:
+        """
+        Get interests, skills, and goals of this human together.
+
+        Sections without a data file or cached value are generated with a single structured
+        request and validated separately; a section that fails validation falls back to its defaults.
+        """
+        profile: Dict[str, Any] = {}
+        for section in DEFAULT_PROFILE_PROMPTS:
+            stored = self.stored_section(section)
+            if stored is not None:
+                profile[section] = stored
+
+        missing = [section for section in DEFAULT_PROFILE_PROMPTS if section not in profile]
+        if not missing:
+            return profile
+
+        name = self.config.settings.persona.name
+        style = self.config.settings.persona.style
+        with PROMPT_BUILD.time(**self.metric_labels()):
+            instructions = "\n\n".join(
+                f'Section "{section}":\n'
+                + self.config.get_template(section, default=DEFAULT_PROFILE_PROMPTS[section]).render(
+                    name=name, style=style
+                )
+                for section in missing
+            )
+            prompt = self.config.get_template("profile", default=DEFAULT_PROFILE_PROMPT).render(
+                name=name,
+                style=style,
+                instructions=instructions,
+                sections=", ".join(f'"{section}"' for section in missing),
+            )
+
+        # Each section needs roughly one regular reply's worth of tokens
+        max_tokens = self.config.settings.llm.max_tokens * len(missing)
+
+        generated: Dict[str, Any] = {}
+        try:
+            response = await self.call_openai(
+                prompt, max_tokens=max_tokens, priority=PRIORITY_BACKGROUND, schema="profile"
+            )
+            generated = self.parse_json(response, lambda value: isinstance(value, dict))
+        except Exception as e:
+            print(f"Error generating profile: {str(e)}")
+
+        for section in missing:
+            value = generated.get(section)
+            if PROFILE_VALIDATORS[section](value):
+                self.generation_cache.set(self.generation_cache_key(section), value)
+                profile[section] = value
+            else:
+                print(f"Invalid or missing '{section}' in generated profile; using defaults")
+                DEFAULT_FALLBACKS.inc(section=section, **self.metric_labels())
+                profile[section] = self.config.get(section, "defaults", fallback=PROFILE_EMPTY[section])
+
+        if any(section in INDEXED_SECTIONS for section in generated):
+            self.refresh_index()
+
+        return profile
+
+    def read_data_file(
+        self, key: str, validator: Optional[Callable[[Any], bool]] = None
+    ) -> Optional[Any]:
+        """Read this persona's JSON data file from `paths`, or None if it is missing, unreadable or invalid."""
+        return self.data_files.load(self.config.get_file_path(key, self.slug), validator)
+
+    def stored_section(self, section: str) -> Optional[Any]:
+        """
+        Get a profile section without calling the LLM: from its curated data file
+        when it exists and is well-formed, otherwise from the generation cache.
+        """
+        curated = self.read_data_file(f"{section}_file", PROFILE_VALIDATORS[section])
+        if curated is not None:
+            PROFILE_HITS.inc(section=section, source="file", **self.metric_labels())
+            return curated
+        cached = self.generation_cache.get(self.generation_cache_key(section))
+        if cached is not None:
+            PROFILE_HITS.inc(section=section, source="cache", **self.metric_labels())
+        return cached
+
+    def get_services(self) -> List[Dict[str, Any]]:
+        """Get the services this human offers, from the services file or the config defaults."""
+        services = self.read_data_file("services_file")
+        if services is None:
+            services = self.config.get("services", "defaults", fallback=[])
+        return services
+
+    async def index_profile(self, generate: bool = True) -> None:
+        """
+        Embed this human's interests, skills and services into the people index.
+        Sections come from the data files in `paths`, then the generation cache, and
+        are generated only if `generate` is set; unchanged sections are not re-embedded.
+        """
+        sections: Dict[str, Any] = {"services": self.get_services()}
+        handlers = {"interests": self.get_interests, "skills": self.get_skills}
+        for section, handler in handlers.items():
+            items = self.stored_section(section)
+            if items is None and generate:
+                items = await handler()
+            if items is not None:
+                sections[section] = items
+
+        name = self.config.settings.persona.name
+        for section, items in sections.items():
+            items = [item for item in items if isinstance(item, dict) and isinstance(item.get("name"), str)]
+            texts = [item_text(item) for item in items]
+            if self.people_index.has_section(self.slug, section) and texts == self.people_index.section_texts(
+                self.slug, section
+            ):
+                continue
+            try:
+                vectors = await self.embedder.embed(texts)
+            except Exception as e:
+                print(f"Error indexing {section} for {self.slug}: {str(e)}")
+                continue
+            self.people_index.upsert(self.slug, name, section, items, vectors)
+
+    def refresh_index(self) -> None:
+        """Re-index this human's profile in the background from data files and cached sections."""
+        self.index_stale = True
+        if self.index_task is None:
+            self.index_task = asyncio.ensure_future(self._refresh_index())
+
+    async def _refresh_index(self) -> None:
+        # Runs in its own task, so this does not relabel the tool that triggered it
+        current_tool.set("index_profile")
+        try:
+            while self.index_stale:
+                self.index_stale = False
+                await self.index_profile(generate=False)
+            await self.people_index.save()
+        except Exception as e:
+            print(f"Error indexing profile for {self.slug}: {str(e)}")
+        finally:
+            self.index_task = None
+
+    async def ensure_indexed(self) -> None:
+        """Wait for pending re-indexing, then index any section that is still missing."""
+        if self.index_task is not None:
+            await asyncio.shield(self.index_task)
+        if not all(self.people_index.has_section(self.slug, section) for section in INDEXED_SECTIONS):
+            await self.index_profile()
+
+    async def match(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
+    ) -> Dict[str, Any]:
+        """
+        Rank people by compatibility with this human using the configured matching weights.
+
+        Args within request:
+            candidates: Optional profiles to rank, each with "id", "name", "interests", "skills" and "goals"
+            include_hosted: Whether to also rank the other personas on this server (default: true)
+            top_k: Optional maximum number of matches (default: matching.top_k)
+            min_score: Optional minimum score (default: matching.min_score_threshold)
+
+        Returns:
+            Dict with the ranked "matches" and the weights and threshold used
+        """
+        candidates = list(request.get("candidates", []))
+        peers = [peer for peer in self.peers if peer is not self] if request.get("include_hosted", True) else []
+
+        profiles = await asyncio.gather(self.get_profile(), *(peer.get_profile() for peer in peers))
+        for peer, peer_profile in zip(peers, profiles[1:]):
+            candidates.append({"id": peer.slug, "name": peer.config.settings.persona.name, **peer_profile})
+
+        weights = self.config.get_matching_weights()
+        top_k = request.get("top_k", self.config.settings.matching.top_k)
+        threshold = request.get(
+            "min_score", self.config.settings.matching.min_score_threshold
+        )
+
+        try:
+            matches = await rank_matches(self.embedder, profiles[0], candidates, weights, top_k, threshold)
+        except Exception as e:
+            print(f"Error matching: {str(e)}")
+            return {"matches": [], "error": f"Failed to compute matches: {str(e)}"}
+
+        return {
+            "matches": matches,
+            "candidates": len(candidates),
+            "weights": weights,
+            "min_score_threshold": threshold,
+        }
+
+    async def search_people(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
+    ) -> Dict[str, Any]:
+        """
+        Find people by what they like, know or offer, using the local people index.
+
+        Args within request:
+            query: What to look for, or a list of requirements that should all match
+                   (e.g. ["machine learning", "rock climbing"])
+            sections: Optional sections to search ("interests", "skills", "services")
+            top_k: Optional maximum number of people (default: search.top_k)
+            include_self: Whether this human can appear in the results (default: false)
+
+        Returns:
+            Dict with the matching people in "results", best first
+        """
+        query = request.get("query")
+        queries = [query] if isinstance(query, str) else list(query or [])
+        queries = [query for query in queries if isinstance(query, str) and query.strip()]
+        if not queries:
+            return {"results": [], "error": "A query is required"}
+
+        await asyncio.gather(*(peer.ensure_indexed() for peer in self.peers))
+
+        try:
+            vectors = await self.embedder.embed(queries)
+        except Exception as e:
+            print(f"Error embedding search query: {str(e)}")
+            return {"results": [], "error": f"Failed to search: {str(e)}"}
+
+        results = self.people_index.search(
+            vectors,
+            top_k=request.get("top_k", self.config.settings.search.top_k),
+            sections=request.get("sections"),
+            exclude=set() if request.get("include_self") else {self.slug},
+        )
+        return {"results": results, "queries": queries, "indexed_people": len(self.people_index.people)}
+
+    async def generate_startup_ideas(
+        self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}, ctx: Optional[Context] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate startup ideas with one or more partners, one concurrent LLM call per partner.
+
+        Args within request:
+            partners: Optional partner profiles, each with "id", "name", "interests" and "skills"
+            partner_ids: Optional IDs of personas hosted on this server to pair with
+
+        Each partner's result is sent as a progress notification as soon as it is ready.
+
+        Returns:
+            Dict with one result per partner in "results": the given partners, then the hosted ones
+        """
+        hosted = {peer.slug: peer for peer in self.peers if peer is not self}
+        partner_ids = request.get("partner_ids", [])
+        unknown = [partner_id for partner_id in partner_ids if partner_id not in hosted]
+        peers = [hosted[partner_id] for partner_id in partner_ids if partner_id in hosted]
+
+        profiles = await asyncio.gather(self.get_profile(), *(peer.get_profile() for peer in peers))
+        partners = list(request.get("partners", []))
+        for peer, peer_profile in zip(peers, profiles[1:]):
+            partners.append({"id": peer.slug, "name": peer.config.settings.persona.name, **peer_profile})
+        if not partners:
+            return {"results": [], "error": "At least one partner is required", "unknown_partners": unknown}
+
+        # Shared interests and complementary skills are worked out locally, before any LLM call
+        inputs = await idea_inputs(
+            self.embedder,
+            profiles[0],
+            partners,
+            threshold=self.config.settings.startup_ideas.similarity_threshold,
+        )
+
+        pool = asyncio.Semaphore(self.config.settings.startup_ideas.max_concurrency)
+        results: List[Dict[str, Any]] = [{} for _ in partners]
+        finished = 0
+
+        async def ideas_with(index: int) -> None:
+            nonlocal finished
+            partner, shared = partners[index], inputs[index]
+            prompt = self.config.get_startup_ideas_prompt(
+                interests=", ".join(shared["shared_interests"]) or "None identified yet",
+                my_skills=", ".join(shared["my_skills"]),
+                their_skills=", ".join(shared["their_skills"]),
+            )
+            async with pool:
+                response = await self.call_openai(prompt)
+
+            result = {"partner": partner.get("id"), "name": partner.get("name"), **shared}
+            try:
+                result["ideas"] = self.parse_json(response)
+            except ValueError:
+                # Templates that do not ask for JSON get their ideas back as text
+                result["ideas"] = response
+            results[index] = result
+
+            finished += 1
+            if ctx is not None:
+                await ctx.report_progress(
+                    progress=finished, total=len(partners), message=compact_json(result)
+                )
+
+        await asyncio.gather(*(ideas_with(index) for index in range(len(partners))))
+
+        response: Dict[str, Any] = {"results": results}
+        if unknown:
+            response["unknown_partners"] = unknown
+        return response
+
+    async def converse(
+        self, request: Dict[str, Any], context: Dict[str, Any] = {}, ctx: Optional[Context] = None
+    ) -> Dict[str, Any]:
+        """
+        Engage in conversation with customizable style using prompt-driven responses.
+
+        Args within request:
+            message: The message to respond to
+            conversation_context: Context about the conversation, with its "id" and the "sender" of the message
+            style: Optional style directive (e.g., 'friendly', 'professional', 'casual')
+            stream: Optional flag to send partial responses as progress notifications
+        """
+        message = request.get("message", "")
+        style = request.get("style", "")
+        conversation_context = request.get("conversation_context", {})
+        stream = request.get("stream", self.config.settings.conversation.stream)
+
+        conversation_id = conversation_context.get("id", "default")
+        sender = conversation_context.get("sender", "Them")
+        conversation_key = self.conversation_key(conversation_id)
+        max_history = self.config.settings.conversation.max_history
+
+        # Clients may still send the full history; it only seeds a new conversation
+        history = context.get("history", [])
+
+        # Get persona name and style
+        name = self.config.settings.persona.name
+        persona_style = self.config.settings.persona.style
+
+        # Apply custom style if provided
+        if style:
+            persona_style = f"{persona_style}, but more {style}"
+
+        # Get the conversation prompt from config and fit the summary and recent turns into the budget
+        prompt_template = self.config.get_template("conversation")
+        with PROMPT_BUILD.time(**self.metric_labels()):
+            prompt, dropped_tokens = self.prompt_budget.fit(
+                lambda history_text: prompt_template.render(
+                    name=name,
+                    style=persona_style,
+                    message=message,
+                    history=history_text or "No previous messages.",
+                ),
+                self.conversation_store.history_lines(conversation_key, history, max_history),
+            )
+
+        # Call OpenAI to generate a response, streaming partial text to the client if asked
+        failed = False
+        try:
+            if stream and ctx is not None:
+                chunks_sent = 0
+
+                async def send_partial(text: str) -> None:
+                    nonlocal chunks_sent
+                    chunks_sent += 1
+                    await ctx.report_progress(progress=chunks_sent, message=text)
+
+                response = await self.stream_openai(prompt, send_partial, priority=PRIORITY_INTERACTIVE)
+            else:
+                response = await self.call_openai(prompt, priority=PRIORITY_INTERACTIVE)
+            failed = response.startswith("Error generating response")
+        except Exception as e:
+            response = f"I'm having trouble responding right now. Error: {str(e)}"
+            failed = True
+
+        # Record the turn in one save; turns sliding out of the window are summarized in the background.
+        # A failed reply is returned to the caller but kept out of the history the next prompt sees.
+        turns = [(sender, message)] if failed else [(sender, message), (name, response)]
+        conversation = await self.conversation_store.record(conversation_key, turns, history, max_history)
+        if conversation["unsummarized"] and conversation_key not in self.summary_tasks:
+            task = asyncio.ensure_future(self.summarize_conversation(conversation_key))
+            self.summary_tasks[conversation_key] = task
+            task.add_done_callback(lambda _: self.summary_tasks.pop(conversation_key, None))
+
+        return {
+            "response": response,
+            "conversation_id": conversation_id,
+            "message_count": conversation["message_count"],
+            "max_history": max_history,
+            "dropped_tokens": dropped_tokens,
+        }
+
+    async def summarize_conversation(self, conversation_key: str) -> None:
+        """Fold turns that slid out of the history window into the rolling summary."""
+        current_tool.set("summarize_conversation")
+        conversation = self.conversation_store.get(conversation_key)
+        turns = list(conversation["unsummarized"])
+        if not turns:
+            return
+
+        prompt = self.config.get_template("conversation", "summary_prompt").render(
+            name=self.config.settings.persona.name,
+            summary=conversation["summary"] or "Nothing yet.",
+            messages="\n".join(f"{msg['sender']}: {msg['message']}" for msg in turns),
+        )
+
+        summary = await self.call_openai(prompt, priority=PRIORITY_BACKGROUND)
+        if summary.startswith("Error generating response"):
+            # The turns stay waiting, so the next attempt includes them
+            return
+
+        await self.conversation_store.set_summary(conversation_key, summary.strip(), turns)
+
+    async def negotiate(
+        self, kind: str, request: Dict[str, Any], their_offer: Optional[float], describe: Callable[[Dict[str, Any]], str]
+    ) -> Dict[str, Any]:
+        """
+        Play one round of a salary negotiation held in the negotiation store.
+        The offer is decided locally by the session's concession strategy; the LLM
+        only phrases it, from a prompt holding this round alone.
+
+        Args:
+            kind: HIRE or JOB
+            request: The tool request, with an optional "session_id" and "negotiation_history"
+            their_offer: The other side's latest offer as sent, or None if they have not named one
+            describe: Builds the situation and decision part of the prompt from the round
+
+        Returns:
+            The round's "session_id", "round", "action", "offer", "their_offer", "status" and "message"
+        """
+        # Checked before the session changes, so a bad amount does not use up a round
+        try:
+            their_offer = parse_amount(their_offer)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        settings = self.config.settings.negotiation
+        session_id = str(request.get("session_id") or uuid.uuid4().hex)
+        session_key = self.conversation_key(session_id)
+
+        session = self.negotiation_store.get(session_key)
+        if session is None:
+            low, high = settings.hiring_range if kind == HIRE else settings.salary_range
+            # Rounds held before the session existed still count towards the concession schedule
+            session = await self.negotiation_store.start(
+                session_key, kind, low, high, past_rounds=len(request.get("negotiation_history", []))
+            )
+        elif session["kind"] != kind:
+            return {"session_id": session_id, "error": "This session belongs to a different negotiation"}
+
+        decision = await self.negotiation_store.respond(
+            session_key,
+            their_offer,
+            max_rounds=settings.max_rounds,
+            concession=settings.concession,
+            round_to=settings.round_to,
+        )
+
+        prompt = f"""
+        You are {self.config.settings.persona.name}. Your style is '{self.config.settings.persona.style}'.
+        {describe(decision)}
+
+        Write a short, natural reply of 2-4 sentences that states this decision and the amount exactly.
+        Do not name any other salary figure.
+        """
+
+        offer = f"${decision['offer']:,.0f}"
+        fallback = {
+            "accept": f"We have a deal at {offer}.",
+            "counter": f"I can do {offer}.",
+            "final_offer": f"My final offer is {offer}.",
+            "walk_away": f"I can't go beyond {offer}, so I'll have to step back from this one.",
+        }[decision["action"]]
+
+        message = await self.call_openai(prompt)
+        if message.startswith("Error generating response"):
+            message = fallback
+        return {"session_id": session_id, **decision, "message": message.strip()}
+
+    async def hire_ios_engineer(self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> Dict[str, Any]:
+        """
+        Handle the hiring process for an iOS engineer with salary negotiation.
+        The negotiation is kept server-side; pass the returned session_id with each counter-offer.
+
+        Args within request:
+            session_id: Optional ID of the negotiation to continue (a new one is started otherwise)
+            candidate_info: Information about the candidate
+            current_salary: Current salary expectation, as a number or a string such as "$150,000" (null if not named)
+            negotiation_history: Previous negotiation attempts, counted when a session starts
+
+        Returns:
+            Dict with the "session_id", "round", our "action" and "offer", "their_offer",
+            the session "status" (open, agreed or ended) and the reply "message"
+        """
+        candidate_info = request.get("candidate_info", {})
+        current_salary = request.get("current_salary", 150000)  # Default to max range
+        name = self.config.settings.persona.name
+
+        def describe(decision: Dict[str, Any]) -> str:
+            return f"""You are the hiring manager for an iOS engineer on {name}'s team, negotiating the salary.
+        Candidate: {compact_json(candidate_info)}
+        Round {decision["round"]}: {their_figure(decision["their_offer"], "the candidate", "asks for")}.
+        Your decision: {decision["action"].replace("_", " ")} at ${decision["offer"]:,.0f}.
+        Where it fits, mention growth on the team, benefits and the culture."""
+
+        return await self.negotiate(HIRE, request, current_salary, describe)
+
+    async def find_job(self, request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> Dict[str, Any]:
+        """
+        Find and negotiate a job opportunity with focus on salary negotiation.
+        The negotiation is kept server-side; pass the returned session_id with each new offer.
+
+        Args within request:
+            session_id: Optional ID of the negotiation to continue (a new one is started otherwise)
+            job_info: Information about the job opportunity
+            current_offer: Current salary offer, as a number or a string such as "$150,000" (null if not named)
+            negotiation_history: Previous negotiation attempts, counted when a session starts
+            location: Job location (default: New York)
+            benefits: Additional benefits offered
+
+        Returns:
+            Dict with the "session_id", "round", our "action" and "offer" (the salary we ask for),
+            "their_offer", the session "status" (open, agreed or ended) and the reply "message"
+        """
+        job_info = request.get("job_info", {})
+        current_offer = request.get("current_offer", 140000)  # Default to minimum range
+        location = request.get("location", "New York")
+        benefits = request.get("benefits", {})
+
+        def describe(decision: Dict[str, Any]) -> str:
+            return f"""You are a candidate negotiating the salary for a job in {location}.
+        Job: {compact_json(job_info)}
+        Benefits: {compact_json(benefits)}
+        Round {decision["round"]}: {their_figure(decision["their_offer"], "the employer", "offers")}.
+        Your decision: {decision["action"].replace("_", " ")} at ${decision["offer"]:,.0f}.
+        Where it fits, mention your experience and the cost of living in {location}."""
+
+        return await self.negotiate(JOB, request, current_offer, describe)
+
+    def search_range(self, zone: ZoneInfo, from_day: Optional[date] = None) -> Interval:
+        """
+        The span searched for meeting slots: from now, or the start of from_day in the
+        given timezone if later, for `scheduling.horizon_days`.
+        """
+        start = time.time()
+        if from_day is not None:
+            start = max(start, datetime.combine(from_day, datetime.min.time(), zone).timestamp())
+        return start, start + self.config.settings.scheduling.horizon_days * 86400
+
+    def free_time(self, start: float, end: float, availability: Optional[Availability] = None) -> List[Interval]:
+        """
+        This human's free time between two timestamps: their availability minus booked meetings.
+
+        Raises:
+            ValueError: If the scheduling config is invalid
+        """
+        availability = availability or Availability.from_config(self.config)
+        return subtract(availability.intervals(start, end), self.booking_index.busy(self.slug, start, end))
+
+    async def schedule_meeting(self, request: Dict[str, Any], context: Dict[str, Any] = {}) -> Dict[str, Any]:
+        """
+        Schedule a meeting with this human based on their availability and preferred locations.
+        Slots come from the weekly windows in `scheduling.availability` minus meetings already
+        booked, so the result is immediate and never double-books.
+
+        Args within request:
+            preferred_date: Optional preferred date in YYYY-MM-DD format (the earliest day searched)
+            preferred_location: Optional preferred location from available options
+            duration: Optional meeting duration in minutes (default: 60)
+            purpose: Optional meeting purpose/agenda
+            book: Optional flag to book the first slot (default: true)
+
+        Returns:
+            Dict containing meeting details including date, time, location, and timezone,
+            plus up to `scheduling.max_slots` - 1 "alternatives"
+        """
+        available_locations = self.config.settings.scheduling.locations or DEFAULT_LOCATIONS
+
+        # Get request parameters
+        preferred_date = request.get("preferred_date")
+        preferred_location = request.get("preferred_location")
+        duration = request.get("duration", 60)
+        purpose = request.get("purpose", "General discussion")
+        book = request.get("book", True)
+
+        # Validate location
+        if preferred_location and (
+            not isinstance(preferred_location, str) or preferred_location not in available_locations
+        ):
+            return {
+                "error": f"Invalid location. Available locations are: {', '.join(available_locations.keys())}"
+            }
+        if not isinstance(duration, (int, float)) or not 0 < duration <= 1440:
+            return {"error": "Duration must be between 1 and 1440 minutes"}
+
+        if preferred_location:
+            location = preferred_location
+        elif self.config.settings.persona.location in available_locations:
+            location = self.config.settings.persona.location
+        else:
+            location = next(iter(available_locations), self.config.settings.persona.location)
+
+        try:
+            # Working hours are the persona's own, as in find_meeting_slots; times are shown where the meeting is held
+            availability = Availability.from_config(self.config)
+            zone = load_zone(available_locations[location]) if location in available_locations else availability.zone
+            from_day = parse_date(preferred_date, "preferred_date")
+        except ValueError as e:
+            return {"error": str(e)}
+
+        start, end = self.search_range(zone, from_day)
+        slots = find_slots(
+            self.free_time(start, end, availability),
+            duration * 60,
+            self.config.settings.scheduling.slot_step_minutes * 60,
+            self.config.settings.scheduling.max_slots,
+        )
+        if not slots:
+            horizon = self.config.settings.scheduling.horizon_days
+            return {"error": f"No free {duration}-minute slot in the next {horizon} days"}
+
+        def local(slot: Interval) -> Dict[str, str]:
+            start = datetime.fromtimestamp(slot[0], zone)
+            return {"date": start.strftime("%Y-%m-%d"), "time": start.strftime("%H:%M")}
+
+        meeting_details = {
+            **local(slots[0]),
+            "location": location,
+            "timezone": zone.key,
+            "duration": duration,
+            "purpose": purpose,
+            "notes": "",
+            "alternatives": [local(slot) for slot in slots[1:]],
+            "booked": bool(book),
+        }
+        if book and not await self.booking_index.book(
+            self.slug, slots[0][0], slots[0][1], {"purpose": purpose, "location": location}
+        ):
+            # Another server process booked it between the search and now
+            return {"error": "That slot was just taken; please try again"}
+
+        if self.config.settings.scheduling.generate_notes:
+            prompt = f"""
+            You are {self.config.settings.persona.name}. Your style is '{self.config.settings.persona.style}'.
+            Write one or two sentences of notes for a {duration}-minute meeting in {location}
+            on {meeting_details["date"]} at {meeting_details["time"]} about: {purpose}.
+            Return only the notes.
+            """
+            notes = await self.call_openai(prompt, priority=PRIORITY_BACKGROUND)
+            if not notes.startswith("Error generating response"):
+                meeting_details["notes"] = notes.strip()
+
+        return meeting_details
+
+    async def find_meeting_slots(self, request: Dict[str, Any], context: Dict[str, Any] = {}) -> Dict[str, Any]:
+        """
+        Find the earliest times when this human and several others are all free.
+        Each participant's free time is their weekly availability, in their own timezone,
+        minus their booked meetings; the common windows are found with a single sweep.
+
+        Args within request:
+            participants: Hosted persona IDs, or people given as {"id", "timezone", "availability"}
+                with availability as in `scheduling.availability`; this human is always included
+            duration: Optional meeting duration in minutes (default: 60)
+            count: Optional number of slots to return (default: `scheduling.max_slots`)
+            from_date: Optional first day to search, in YYYY-MM-DD format
+            timezone: Optional IANA timezone for the returned times (default: this human's)
+
+        Returns:
+            Dict with the "participants", the "timezone", up to `count` "slots" (each with its
+            "date", "time" and ISO 8601 "start" and "end"), and any "unknown_participants"
+        """
+        duration = request.get("duration", 60)
+        count = request.get("count", self.config.settings.scheduling.max_slots)
+        if not isinstance(duration, (int, float)) or not 0 < duration <= 1440:
+            return {"error": "Duration must be between 1 and 1440 minutes"}
+        if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+            return {"error": "Count must be a whole number of at least 1"}
+        participants_requested = request.get("participants", [])
+        if not isinstance(participants_requested, list):
+            return {"error": "Participants must be a list of persona IDs or people"}
+
+        hosted = {peer.slug: peer for peer in self.peers}
+        try:
+            own_availability = Availability.from_config(self.config)
+            zone = load_zone(request["timezone"]) if request.get("timezone") else own_availability.zone
+            from_day = parse_date(request.get("from_date"), "from_date")
+        except ValueError as e:
+            return {"error": str(e)}
+        start, end = self.search_range(zone, from_day)
+
+        calendars = [self.free_time(start, end, own_availability)]
+        participants = [self.slug]
+        unknown = []
+        for participant in participants_requested:
+            person = {"id": participant} if isinstance(participant, str) else participant
+            if not isinstance(person, dict):
+                return {"error": f"Invalid participant {participant!r}; expected an ID or an object with an \"id\""}
+            person_id = person.get("id")
+            if person_id == self.slug or person_id in participants:
+                continue
+            try:
+                if "availability" in person:
+                    availability = Availability(person.get("timezone") or "UTC", person["availability"])
+                    calendars.append(availability.intervals(start, end))
+                elif person_id in hosted:
+                    calendars.append(hosted[person_id].free_time(start, end))
+                else:
+                    unknown.append(person_id)
+                    continue
+            except ValueError as e:
+                return {"error": f"Invalid availability for {person_id}: {str(e)}"}
+            participants.append(person_id)
+
+        slots = find_slots(
+            common_free(calendars),
+            duration * 60,
+            self.config.settings.scheduling.slot_step_minutes * 60,
+            count,
+        )
+
+        def describe(slot: Interval) -> Dict[str, str]:
+            slot_start, slot_end = (datetime.fromtimestamp(instant, zone) for instant in slot)
+            return {
+                "date": slot_start.strftime("%Y-%m-%d"),
+                "time": slot_start.strftime("%H:%M"),
+                "start": slot_start.isoformat(),
+                "end": slot_end.isoformat(),
+            }
+
+        response: Dict[str, Any] = {
+            "participants": participants,
+            "timezone": zone.key,
+            "slots": [describe(slot) for slot in slots],
+        }
+        if unknown:
+            response["unknown_participants"] = unknown
+        return response
+
+    async def hire(self, request: Dict[str, Any], context: Dict[str, Any] = {}) -> str:
+        """
+        Handle hiring negotiations for an iOS engineer position.
+
+        Args within request:
+            candidate_name: Name of the candidate
+            current_salary_expectation: Current salary expectation of the candidate
+            candidate_experience: Years of experience
+            candidate_skills: List of candidate's skills
+            negotiation_context: Any additional context about the negotiation
+
+        Returns:
+            A natural, conversational response about the hiring negotiation
+        """
+        candidate_name = request.get("candidate_name", "Candidate")
+        current_salary = request.get("current_salary_expectation", 150000)
+        experience = request.get("candidate_experience", 0)
+        skills = request.get("candidate_skills", [])
+        negotiation_context = request.get("negotiation_context", {})
+
+        # Generate negotiation strategy using OpenAI
+        prompt = f"""
+        You are {self.config.settings.persona.name}, a hiring manager looking to hire an iOS engineer.
+        The position is critical and you want to ensure you don't lose the candidate.
+
+        Current situation:
+        - Candidate: {candidate_name}
+        - Current salary expectation: ${current_salary}
+        - Experience: {experience} years
+        - Key skills: {', '.join(skills)}
+        - Additional context: {negotiation_context}
+
+        Your goals:
+        1. Negotiate the best possible salary (target range: $100k-$150k)
+        2. Ensure the candidate feels valued and excited about the opportunity
+        3. Don't lose the candidate due to salary negotiations
+
+        Generate a natural, conversational response that includes:
+        - Your proposed salary (between $100k-$150k)
+        - Your negotiation strategy and approach
+        - Key points you want to emphasize about the role and opportunity
+        - Alternative benefits or perks you can offer if needed
+        - A clear message to the candidate that shows you value their skills while being mindful of budget constraints
+
+        Keep the tone professional but warm, and focus on building excitement about the opportunity
+        while being transparent about the salary range.
+        """
+
+        try:
+            response = await self.call_openai(prompt)
+            return response.strip()
+        except Exception as e:
+            print(f"Error in hiring negotiation: {str(e)}")
+            return "I apologize, but I'm having trouble processing the negotiation right now. Please try again later."
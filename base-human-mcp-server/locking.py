@@ -0,0 +1,74 @@
+import os
+import asyncio
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; stores there are not shared between processes
+    fcntl = None
+
+
+class FileLock:
+    """
+    Exclusive lock on a file across processes, using an adjacent `.lock` file.
+    Server workers sharing a store take it around each read-modify-write, so one
+    worker's save never overwrites another's. Used with `async with`: while another
+    process holds the lock, the wait happens in a thread, so the event loop keeps
+    serving other requests, and this process's own callers queue behind one waiter.
+    A no-op without a path or fcntl.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._waiters: Optional[asyncio.Lock] = None
+        self._lock_file = None
+
+    async def __aenter__(self) -> None:
+        if not self.path or fcntl is None:
+            return
+        if self._waiters is None:
+            self._waiters = asyncio.Lock()
+        await self._waiters.acquire()
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            lock_file = open(f"{self.path}.lock", "a")
+        except OSError as e:
+            print(f"Warning: Could not lock {self.path}: {str(e)}")
+            self._waiters.release()
+            return
+        try:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+        except BaseException:
+            lock_file.close()
+            self._waiters.release()
+            raise
+        self._lock_file = lock_file
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._lock_file is None:
+            return
+        lock_file, self._lock_file = self._lock_file, None
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+            self._waiters.release()
+
+
+def file_signature(path: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    """
+    Identity of a file's current contents, or None if it does not exist.
+    Atomic saves replace the file, so the signature changes whenever another process saves.
+    """
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
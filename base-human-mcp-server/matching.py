@@ -0,0 +1,209 @@
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+from embeddings import Embedder
+
+# Matching weight key -> profile section it scores
+FACETS = {"interest": "interests", "skill": "skills", "goal": "goals"}
+
+
+def named_items(profile: Dict[str, Any], section: str) -> List[Dict[str, Any]]:
+    """Items of a list section (interests or skills) that have a name."""
+    return [item for item in profile.get(section) or [] if isinstance(item, dict) and item.get("name")]
+
+
+def facet_items(profile: Dict[str, Any], section: str) -> List[Tuple[str, float]]:
+    """
+    Flatten one profile section into weighted texts.
+    Interests are weighted by score, skills by level, and goals equally.
+    """
+    if section == "goals":
+        value = profile.get(section)
+        if not isinstance(value, dict):
+            return []
+        return [(goal, 1.0) for goals in value.values() if isinstance(goals, list) for goal in goals]
+
+    weight_key = "score" if section == "interests" else "level"
+    return [
+        (
+            f"{item['name']}: {item['details']}" if item.get("details") else item["name"],
+            float(item.get(weight_key, 1.0)),
+        )
+        for item in named_items(profile, section)
+    ]
+
+
+async def profile_vectors(
+    embedder: Embedder, profiles: List[Dict[str, Any]]
+) -> Dict[str, np.ndarray]:
+    """
+    Embed each profile's facets as one weighted, normalized vector per facet.
+
+    Returns:
+        Facet name -> array of shape (len(profiles), dimensions); empty facets are zero rows
+    """
+    # One embeddings request for every text across every profile and facet
+    items = {
+        facet: [facet_items(profile, section) for profile in profiles]
+        for facet, section in FACETS.items()
+    }
+    texts = [text for per_profile in items.values() for entries in per_profile for text, _ in entries]
+    embedded = await embedder.embed(texts)
+    dimensions = embedded.shape[1] if len(texts) else 1
+
+    vectors = {}
+    start = 0
+    for facet, per_profile in items.items():
+        count = sum(len(entries) for entries in per_profile)
+
+        # Weight matrix mapping this facet's texts onto the profiles they belong to
+        weights = np.zeros((len(profiles), count), dtype=np.float32)
+        column = 0
+        for row, entries in enumerate(per_profile):
+            for _, weight in entries:
+                weights[row, column] = weight
+                column += 1
+
+        if count:
+            matrix = weights @ embedded[start : start + count]
+        else:
+            matrix = np.zeros((len(profiles), dimensions), dtype=np.float32)
+        start += count
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        vectors[facet] = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    return vectors
+
+
+async def rank_matches(
+    embedder: Embedder,
+    profile: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    weights: Dict[str, float],
+    top_k: int = 5,
+    threshold: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Score candidates against a profile with batched cosine similarity per facet.
+
+    Args:
+        embedder: Embedder for the profile texts
+        profile: The profile being matched, with interests, skills and goals
+        candidates: Candidate profiles, each with an "id" and the same sections
+        weights: Facet weights from HumanConfig.get_matching_weights()
+        top_k: Maximum number of matches returned
+        threshold: Minimum combined score for a match
+
+    Returns:
+        Matches sorted by score, each with the candidate "id", "score" and per-facet "scores"
+    """
+    if not candidates or top_k <= 0:
+        return []
+
+    vectors = await profile_vectors(embedder, [profile] + candidates)
+
+    total_weight = sum(weights.get(facet, 0.0) for facet in FACETS) or 1.0
+    facet_scores = {}
+    combined = np.zeros(len(candidates), dtype=np.float32)
+    for facet in FACETS:
+        # Row 0 is the profile being matched; cosine similarity against every candidate at once
+        scores = np.clip(vectors[facet][1:] @ vectors[facet][0], 0.0, 1.0)
+        facet_scores[facet] = scores
+        combined += weights.get(facet, 0.0) / total_weight * scores
+
+    eligible = np.flatnonzero(combined >= threshold)
+    if len(eligible) > top_k:
+        eligible = eligible[np.argpartition(-combined[eligible], top_k - 1)[:top_k]]
+    ranked = eligible[np.argsort(-combined[eligible], kind="stable")]
+
+    return [
+        {
+            "id": candidates[index].get("id"),
+            "name": candidates[index].get("name"),
+            "score": round(float(combined[index]), 4),
+            "scores": {facet: round(float(facet_scores[facet][index]), 4) for facet in FACETS},
+        }
+        for index in ranked
+    ]
+
+
+def _similarity(
+    vectors: Optional[List[np.ndarray]], names: List[List[str]], first: int, second: int
+) -> np.ndarray:
+    """Pairwise similarity of two profiles' items; exact name matches when there are no vectors."""
+    if vectors is None:
+        return np.array(
+            [[float(a.lower() == b.lower()) for b in names[second]] for a in names[first]],
+            dtype=np.float32,
+        ).reshape(len(names[first]), len(names[second]))
+    return vectors[first] @ vectors[second].T
+
+
+async def idea_inputs(
+    embedder: Embedder,
+    profile: Dict[str, Any],
+    partners: List[Dict[str, Any]],
+    threshold: float = 0.7,
+    max_skills: int = 5,
+) -> List[Dict[str, List[str]]]:
+    """
+    Find shared interests and complementary skills between a profile and each partner.
+
+    Interests are shared when their embeddings are at least `threshold` similar, and a
+    partner's skill is complementary when none of the profile's skills is that similar.
+    If embedding fails, only interests and skills with the same name are treated as similar.
+
+    Args:
+        embedder: Embedder for the profile texts
+        profile: The profile generating ideas, with interests and skills
+        partners: Partner profiles with the same sections
+        threshold: Minimum similarity for two items to count as the same
+        max_skills: Maximum skills listed per side, highest level first
+
+    Returns:
+        One dict per partner with "shared_interests", "my_skills" and "their_skills" name lists
+    """
+    profiles = [profile] + partners
+    sections = ("interests", "skills")
+    texts = {section: [facet_items(p, section) for p in profiles] for section in sections}
+    names = {section: [[item["name"] for item in named_items(p, section)] for p in profiles] for section in sections}
+
+    # One embeddings request for every item of every profile
+    vectors: Dict[str, Optional[List[np.ndarray]]] = {section: None for section in sections}
+    try:
+        embedded = await embedder.embed(
+            [text for section in sections for entries in texts[section] for text, _ in entries]
+        )
+        start = 0
+        for section in sections:
+            vectors[section] = []
+            for entries in texts[section]:
+                vectors[section].append(embedded[start : start + len(entries)])
+                start += len(entries)
+    except Exception as e:
+        print(f"Error embedding profiles for idea generation: {str(e)}")
+
+    def top_skills(index: int, keep: Optional[np.ndarray] = None) -> List[str]:
+        levels = [weight for _, weight in texts["skills"][index]]
+        order = [i for i in np.argsort(levels, kind="stable")[::-1] if keep is None or keep[i]]
+        return [names["skills"][index][i] for i in order[:max_skills]]
+
+    results = []
+    for partner in range(1, len(profiles)):
+        interests = _similarity(vectors["interests"], names["interests"], 0, partner)
+        shared = [
+            name for name, similar in zip(names["interests"][0], interests.max(axis=1, initial=0.0))
+            if similar >= threshold
+        ]
+
+        skills = _similarity(vectors["skills"], names["skills"], partner, 0)
+        complementary = skills.max(axis=1, initial=0.0) < threshold
+        results.append(
+            {
+                "shared_interests": shared,
+                "my_skills": top_skills(0),
+                # Skills the profile lacks, or the partner's strongest if they overlap entirely
+                "their_skills": top_skills(partner, complementary) or top_skills(partner),
+            }
+        )
+    return results
@@ -0,0 +1,266 @@
+import os
+import glob
+import json
+import time
+import bisect
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from cache hits up to slow completions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Tool whose handler is running, so nested calls (e.g. call_openai) are attributed to it
+current_tool: ContextVar[str] = ContextVar("current_tool", default="internal")
+
+
+def _label_text(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add to the counter for the given labels."""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_label_text(self.labelnames, key)} {value:g}")
+        return lines
+
+    def snapshot(self) -> List[Any]:
+        return [[list(key), value] for key, value in self._values.items()]
+
+    def merge(self, entries: List[Any]) -> None:
+        """Add the values of another process's snapshot."""
+        for key, value in entries:
+            key = tuple(key)
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def empty(self) -> "Counter":
+        return Counter(self.name, self.documentation, self.labelnames)
+
+
+class Histogram:
+    """Counts observations into fixed buckets per label set, with their sum and count."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given labels."""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        # One slot per bucket plus +Inf, then the sum
+        series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _label_text(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative:g}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {series[-1]:.6g}")
+            lines.append(f"{self.name}_count{labels} {cumulative:g}")
+        return lines
+
+    def snapshot(self) -> List[Any]:
+        return [[list(key), list(series)] for key, series in self._series.items()]
+
+    def merge(self, entries: List[Any]) -> None:
+        """Add the buckets and sums of another process's snapshot."""
+        for key, series in entries:
+            total = self._series.setdefault(tuple(key), [0.0] * (len(self.buckets) + 2))
+            for index, value in enumerate(series):
+                total[index] += value
+
+    def empty(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, self.labelnames, self.buckets)
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str]) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format."""
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+    def snapshot(self) -> Dict[str, List[Any]]:
+        """The current values of every metric, by name, in a JSON-friendly form."""
+        return {metric.name: metric.snapshot() for metric in self._metrics}
+
+    def render_merged(self, snapshots: Sequence[Dict[str, List[Any]]]) -> str:
+        """The sum of several processes' snapshots in the Prometheus text format."""
+        merged = MetricsRegistry()
+        for metric in self._metrics:
+            total = metric.empty()
+            for snapshot in snapshots:
+                total.merge(snapshot.get(metric.name, []))
+            merged._metrics.append(total)
+        return merged.render()
+
+
+class SharedMetrics:
+    """
+    Sums the metrics of the `--workers` processes, in the spirit of prometheus_client's multiprocess mode.
+    Each process writes a snapshot of its registry to a directory they share, every `interval`
+    seconds and before it renders, so a scrape reaching any worker sees the totals of all of them.
+    Another worker's figures may be up to `interval` seconds old.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float = 1.0):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self.path = os.path.join(directory, f"{os.getpid()}.json")
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Write snapshots in a background thread until the process exits."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self.write()
+            time.sleep(self.interval)
+
+    def write(self) -> None:
+        """Write this process's snapshot atomically."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.registry.snapshot(), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write metrics to {self.path}: {str(e)}")
+
+    def render(self) -> str:
+        """The summed metrics of every process in the Prometheus text format."""
+        self.write()
+        snapshots = []
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                # Removed since the listing, e.g. while the server shuts down
+                continue
+        return self.registry.render_merged(snapshots)
+
+
+registry = MetricsRegistry()
+
+LABELS = ("persona", "tool")
+
+TOOL_LATENCY = registry.histogram("human_tool_duration_seconds", "Total tool call latency.", LABELS)
+TOOL_ERRORS = registry.counter("human_tool_errors_total", "Tool calls that raised an exception.", LABELS)
+PROMPT_BUILD = registry.histogram("human_prompt_build_seconds", "Time spent assembling prompts.", LABELS)
+QUEUE_WAIT = registry.histogram("human_llm_queue_seconds", "Time OpenAI requests waited for the scheduler.", LABELS)
+UPSTREAM_LATENCY = registry.histogram(
+    "human_llm_request_seconds", "OpenAI request latency, including retries.", LABELS
+)
+FIRST_TOKEN = registry.histogram(
+    "human_llm_first_token_seconds", "Time from sending a streamed request to its first text.", LABELS
+)
+JSON_PARSE = registry.histogram("human_json_parse_seconds", "Time spent parsing JSON replies.", LABELS)
+PROMPT_TOKENS = registry.counter("human_llm_prompt_tokens_total", "Prompt tokens reported by OpenAI.", LABELS)
+COMPLETION_TOKENS = registry.counter(
+    "human_llm_completion_tokens_total", "Completion tokens reported by OpenAI.", LABELS
+)
+PROFILE_HITS = registry.counter(
+    "human_profile_hits_total",
+    "Profile sections served without the LLM, by source (file or cache).",
+    LABELS + ("section", "source"),
+)
+DEFAULT_FALLBACKS = registry.counter(
+    "human_default_fallbacks_total", "Profile sections answered from config defaults.", LABELS + ("section",)
+)
+
+
+def instrument_tool(persona: str, tool: str, handler: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a tool handler to record its latency and errors and attribute nested metrics to it.
+    The wrapper keeps the handler's signature, so the tool schema is unchanged.
+    """
+
+    @functools.wraps(handler)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_tool.set(tool)
+        start = time.perf_counter()
+        try:
+            result = handler(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except Exception:
+            TOOL_ERRORS.inc(persona=persona, tool=tool)
+            raise
+        finally:
+            TOOL_LATENCY.observe(time.perf_counter() - start, persona=persona, tool=tool)
+            current_tool.reset(token)
+
+    return wrapper
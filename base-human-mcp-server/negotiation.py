@@ -0,0 +1,214 @@
+import os
+import json
+import math
+import time
+from typing import Dict, Any, Optional, Union
+from locking import FileLock, file_signature
+
+# Negotiation kinds: as the employer we want the lowest salary, as the candidate the highest
+HIRE = "hire"
+JOB = "job"
+
+
+def parse_amount(value: Any) -> Optional[Union[int, float]]:
+    """
+    Read the other side's salary figure from a request: a number, a string such
+    as "150000" or "$150,000", or None when they have not named one.
+    Whole amounts come back as ints, like our rounded offers.
+
+    Raises:
+        ValueError: If the value is not a positive amount
+    """
+    if value is None:
+        return None
+    amount = value
+    if isinstance(amount, str):
+        try:
+            amount = float(amount.strip().lstrip("$").replace(",", ""))
+        except ValueError:
+            amount = None
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not math.isfinite(amount) or amount <= 0:
+        raise ValueError(f"Invalid salary amount {value!r}; expected a positive number such as 150000")
+    return int(amount) if amount == int(amount) else amount
+
+
+def concession_bid(opening: float, limit: float, round_index: int, max_rounds: int, concession: float) -> float:
+    """
+    Our bid for a round under a time-dependent concession strategy.
+    The bid moves from the opening amount to the limit over max_rounds rounds,
+    following (round / last round) ** (1 / concession): below 1 holds out and
+    concedes late, 1 concedes linearly, above 1 concedes early.
+
+    Args:
+        opening: Amount offered in the first round
+        limit: Amount offered in the last round (the worst we accept)
+        round_index: Zero-based round number
+        max_rounds: Rounds before our final offer
+        concession: Shape of the concession curve
+    """
+    progress = min(1.0, round_index / max(1, max_rounds - 1))
+    return opening + (limit - opening) * progress ** (1 / concession)
+
+
+class NegotiationStore:
+    """
+    Server-side salary negotiations keyed by session ID.
+    Each session keeps its range and every round's offers, and the next bid is
+    computed locally from them, so offers stay within the range whatever the
+    model writes and clients only send the latest counter-offer.
+    Like ConversationStore, the file may be shared by several server processes.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_sessions: int = 1000):
+        """
+        Initialize the store.
+
+        Args:
+            path: JSON file the sessions are persisted to (memory only if None)
+            max_sessions: Sessions kept; the least recently updated are dropped first
+        """
+        self.path = path
+        self.max_sessions = max_sessions
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = FileLock(path)
+        self._signature = None
+        self._sync()
+
+    @classmethod
+    def from_config(cls, config) -> "NegotiationStore":
+        """Build a store from `paths.negotiation_file` and `negotiation.max_sessions`."""
+        return cls(
+            path=config.get_file_path("negotiation_file"),
+            max_sessions=config.settings.negotiation.max_sessions,
+        )
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a session, or None if it does not exist."""
+        self._sync()
+        return self.sessions.get(session_id)
+
+    async def start(self, session_id: str, kind: str, low: float, high: float, past_rounds: int = 0) -> Dict[str, Any]:
+        """
+        Create (or restart) a session.
+
+        Args:
+            session_id: The session to create
+            kind: HIRE or JOB
+            low: Lowest acceptable salary
+            high: Highest acceptable salary
+            past_rounds: Rounds already held elsewhere, so the concession schedule picks up from there
+
+        Returns:
+            The session, with its "kind", range, "status", "rounds" and "past_rounds"
+        """
+        async with self._lock:
+            self._sync()
+            self.sessions[session_id] = {
+                "kind": kind,
+                "low": low,
+                "high": high,
+                "status": "open",
+                "rounds": [],
+                "past_rounds": past_rounds,
+                "updated": time.time(),
+            }
+            if len(self.sessions) > self.max_sessions:
+                for stale_id in sorted(self.sessions, key=lambda key: self.sessions[key]["updated"])[
+                    : len(self.sessions) - self.max_sessions
+                ]:
+                    del self.sessions[stale_id]
+            self.save()
+            return self.sessions[session_id]
+
+    async def respond(
+        self,
+        session_id: str,
+        their_offer: Optional[float],
+        max_rounds: int = 6,
+        concession: float = 0.5,
+        round_to: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Decide on the other side's latest offer and record the round.
+
+        Args:
+            session_id: An existing session
+            their_offer: The other side's offer, or None if they have not named one
+            max_rounds: Rounds before our final offer
+            concession: Shape of the concession curve (see concession_bid)
+            round_to: Granularity of our offers
+
+        Returns:
+            The round: its "round" number, our "action" ("counter", "final_offer",
+            "accept" or "walk_away"), our "offer", "their_offer" and the session "status"
+        """
+        async with self._lock:
+            self._sync()
+            session = self.sessions[session_id]
+            hiring = session["kind"] == HIRE
+            opening, limit = (session["low"], session["high"]) if hiring else (session["high"], session["low"])
+            rounds = session["rounds"]
+            round_index = session["past_rounds"] + len(rounds)
+
+            def at_least_as_good(amount: float, than: float) -> bool:
+                return amount <= than if hiring else amount >= than
+
+            if session["status"] != "open":
+                # Settled sessions keep their outcome
+                last = rounds[-1]
+                return {**last, "round": len(rounds), "their_offer": their_offer, "status": session["status"]}
+
+            bid = concession_bid(opening, limit, round_index, max_rounds, concession)
+            bid = min(max(round(bid / round_to) * round_to, session["low"]), session["high"])
+            if rounds and not at_least_as_good(rounds[-1]["offer"], bid):
+                # Never retreat from an earlier offer
+                bid = rounds[-1]["offer"]
+
+            if their_offer is not None and at_least_as_good(their_offer, bid):
+                action, offer, status = "accept", their_offer, "agreed"
+            elif round_index >= max_rounds:
+                action, offer, status = "walk_away", limit, "ended"
+            elif round_index == max_rounds - 1:
+                action, offer, status = "final_offer", limit, "open"
+            else:
+                action, offer, status = "counter", bid, "open"
+
+            rounds.append({"action": action, "offer": offer, "their_offer": their_offer})
+            session["status"] = status
+            session["updated"] = time.time()
+            self.save()
+            return {
+                "round": len(rounds),
+                "action": action,
+                "offer": offer,
+                "their_offer": their_offer,
+                "status": status,
+            }
+
+    def save(self) -> None:
+        """Write all sessions to disk atomically."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.sessions, f)
+            os.replace(tmp_path, self.path)
+            self._signature = file_signature(self.path)
+        except OSError as e:
+            print(f"Warning: Could not save negotiations to {self.path}: {str(e)}")
+
+    def _sync(self) -> None:
+        """Reload the file if another process saved it since this one last read or wrote it."""
+        signature = file_signature(self.path)
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        try:
+            with open(self.path, "r") as f:
+                self.sessions = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load negotiations from {self.path}: {str(e)}")
@@ -0,0 +1,372 @@
+import os
+import json
+from typing import Dict, List, Any, Optional, Set
+import numpy as np
+from locking import FileLock
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+# Profile sections whose items are indexed
+INDEXED_SECTIONS = ["interests", "skills", "services"]
+
+
+def item_text(item: Dict[str, Any]) -> str:
+    """Text embedded for one profile item: its name plus its details or description."""
+    details = item.get("details") or item.get("description")
+    return f"{item['name']}: {details}" if details else item["name"]
+
+
+class PeopleIndex:
+    """
+    Nearest-neighbour index over the interests, skills and services of many people.
+    Each row holds one normalized item vector. Rows live in a float32 matrix that
+    is saved as a .npy file and memory-mapped when loaded, so a large index opens
+    without being read into memory. Queries scan the matrix with one matrix-vector
+    product, or use an HNSW graph for sub-linear search when the "hnsw" backend is
+    configured and hnswlib is installed.
+    """
+
+    def __init__(self, directory: Optional[str], model: str, backend: str = "matrix"):
+        """
+        Initialize the index.
+
+        Args:
+            directory: Directory for the saved index (kept in memory only if None)
+            model: Embedding model the vectors come from; a saved index for another model is discarded
+            backend: "matrix" for exact scans or "hnsw" for approximate search
+        """
+        self.directory = directory
+        self._lock = FileLock(os.path.join(directory, "entries.json") if directory else None)
+        self.model = model
+        if backend == "hnsw" and hnswlib is None:
+            print("Warning: hnswlib is not installed; using the matrix search backend")
+            backend = "matrix"
+        self.backend = backend
+
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._entries: List[Optional[Dict[str, Any]]] = []
+        self._free: List[int] = []
+        self._rows: Dict[str, Dict[str, List[int]]] = {}
+        self._names: Dict[str, str] = {}
+
+        # Per-row liveness, person number and section number, for vectorized filtering and grouping
+        self._people: List[str] = []
+        self._person_numbers: Dict[str, int] = {}
+        self._row_live = np.zeros(0, dtype=bool)
+        self._row_person = np.zeros(0, dtype=np.int32)
+        self._row_section = np.zeros(0, dtype=np.int8)
+
+        self._ann = None
+        self._dirty = False
+
+        if directory:
+            self._load()
+
+    @classmethod
+    def from_config(cls, config) -> "PeopleIndex":
+        """Build an index from the `search` section and `paths.index_dir` of a HumanConfig."""
+        settings = config.settings
+        directory = config.get_file_path("index_dir") if settings.search.persist else None
+        return cls(
+            directory,
+            model=settings.matching.embedding_model,
+            backend=settings.search.backend,
+        )
+
+    def __contains__(self, person_id: str) -> bool:
+        return person_id in self._rows
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    @property
+    def people(self) -> List[str]:
+        """IDs of the indexed people."""
+        return list(self._rows)
+
+    def has_section(self, person_id: str, section: str) -> bool:
+        """Whether a section of a person has been indexed, even if it has no items."""
+        return section in self._rows.get(person_id, {})
+
+    def section_texts(self, person_id: str, section: str) -> List[str]:
+        """Texts currently indexed for one section of a person, in insertion order."""
+        rows = self._rows.get(person_id, {}).get(section, [])
+        return [self._entries[row]["text"] for row in rows]
+
+    def upsert(
+        self, person_id: str, name: str, section: str, items: List[Dict[str, Any]], vectors: np.ndarray
+    ) -> None:
+        """
+        Replace the indexed items of one section of a person.
+
+        Args:
+            person_id: Identifier of the person
+            name: Display name of the person
+            section: One of INDEXED_SECTIONS
+            items: Profile items, each with a "name"
+            vectors: Normalized embeddings of item_text(item), one row per item
+        """
+        self._remove_rows(person_id, section)
+        self._names[person_id] = name
+        if person_id not in self._person_numbers:
+            self._person_numbers[person_id] = len(self._people)
+            self._people.append(person_id)
+
+        rows = []
+        for item, vector in zip(items, vectors):
+            row = self._allocate(len(vector))
+            self._matrix[row] = vector
+            self._row_live[row] = True
+            self._row_person[row] = self._person_numbers[person_id]
+            self._row_section[row] = INDEXED_SECTIONS.index(section)
+            self._entries[row] = {
+                "person": person_id,
+                "section": section,
+                "text": item_text(item),
+                "item": item,
+            }
+            rows.append(row)
+
+        if rows and self._ann is not None:
+            self._ann.add_items(self._matrix[rows], rows)
+
+        self._rows.setdefault(person_id, {})[section] = rows
+        self._dirty = True
+
+    def remove(self, person_id: str) -> None:
+        """Drop every indexed item of a person."""
+        for section in list(self._rows.get(person_id, {})):
+            self._remove_rows(person_id, section)
+        self._rows.pop(person_id, None)
+        self._names.pop(person_id, None)
+        self._dirty = True
+
+    def search(
+        self,
+        vectors: np.ndarray,
+        top_k: int = 5,
+        sections: Optional[List[str]] = None,
+        exclude: Optional[Set[str]] = None,
+        candidates: int = 256,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the people whose items best match every query vector.
+
+        A person's score for one query is their best item similarity, and their
+        overall score is the mean over the queries, so people matching all of them rank first.
+
+        Args:
+            vectors: Normalized query embeddings, one row per query
+            top_k: Maximum number of people returned
+            sections: Sections to search (all indexed sections by default)
+            exclude: Person IDs to leave out
+            candidates: Items fetched per query by the HNSW backend before grouping by person
+
+        Returns:
+            People sorted by score, each with "id", "name", "score" and the best matching "items"
+        """
+        if not len(self) or top_k <= 0 or not len(vectors):
+            return []
+
+        mask = self._row_mask(sections, exclude)
+        if not mask.any():
+            return []
+
+        # Best item score per query and person; -inf where the person has no match
+        best = np.full((len(vectors), len(self._people)), -np.inf, dtype=np.float32)
+        hits = []
+        for query, vector in enumerate(vectors):
+            rows, scores = self._nearest(vector, mask, candidates)
+            np.maximum.at(best[query], self._row_person[rows], scores)
+            hits.append((rows, scores))
+
+        matched = np.isfinite(best).any(axis=0)
+        combined = np.where(np.isfinite(best), np.clip(best, 0.0, 1.0), 0.0).mean(axis=0)
+        people = np.flatnonzero(matched)
+        if len(people) > top_k:
+            people = people[np.argpartition(-combined[people], top_k - 1)[:top_k]]
+        people = people[np.argsort(-combined[people], kind="stable")]
+
+        results = []
+        for number in people:
+            items = []
+            for rows, scores in hits:
+                own = self._row_person[rows] == number
+                if own.any():
+                    row = rows[own][np.argmax(scores[own])]
+                    entry = self._entries[row]
+                    items.append(
+                        {
+                            "section": entry["section"],
+                            **entry["item"],
+                            "similarity": round(float(scores[own].max()), 4),
+                        }
+                    )
+            person_id = self._people[number]
+            results.append(
+                {
+                    "id": person_id,
+                    "name": self._names.get(person_id, person_id),
+                    "score": round(float(combined[number]), 4),
+                    "items": items,
+                }
+            )
+        return results
+
+    async def save(self) -> None:
+        """
+        Write the index to disk if it changed since it was loaded or last saved.
+
+        Server workers each keep their own index, and the last one to save replaces
+        the others' files rather than merging with them. The saved index only seeds
+        the next start, where each worker re-embeds any profile section that no
+        longer matches its data.
+        """
+        if not self.directory or not self._dirty:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        matrix_path = os.path.join(self.directory, "vectors.npy")
+        entries_path = os.path.join(self.directory, "entries.json")
+        suffix = f".{os.getpid()}.tmp"
+        try:
+            # Server processes sharing the directory save one at a time, keeping the two files in step
+            async with self._lock:
+                with open(matrix_path + suffix, "wb") as f:
+                    np.save(f, self._matrix[: self._size])
+                with open(entries_path + suffix, "w") as f:
+                    json.dump(
+                        {"model": self.model, "names": self._names, "rows": self._entries[: self._size]}, f
+                    )
+                os.replace(matrix_path + suffix, matrix_path)
+                os.replace(entries_path + suffix, entries_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Error saving people index to {self.directory}: {str(e)}")
+
+    def _load(self) -> None:
+        matrix_path = os.path.join(self.directory, "vectors.npy")
+        entries_path = os.path.join(self.directory, "entries.json")
+        if not os.path.exists(matrix_path) or not os.path.exists(entries_path):
+            return
+
+        try:
+            with open(entries_path, "r") as f:
+                saved = json.load(f)
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable people index in {self.directory}: {str(e)}")
+            return
+
+        if saved.get("model") != self.model or len(saved.get("rows", [])) != len(matrix):
+            print(f"Warning: Ignoring people index built for another embedding model in {self.directory}")
+            return
+
+        # Read-only until the first write, which copies it into a growable array
+        self._matrix = matrix
+        self._size = len(matrix)
+        self._entries = saved["rows"]
+        self._names = saved.get("names", {})
+        self._row_live = np.array([entry is not None for entry in self._entries], dtype=bool)
+        self._row_person = np.zeros(self._size, dtype=np.int32)
+        self._row_section = np.zeros(self._size, dtype=np.int8)
+        for row, entry in enumerate(self._entries):
+            if entry is None:
+                self._free.append(row)
+                continue
+            person_id = entry["person"]
+            if person_id not in self._person_numbers:
+                self._person_numbers[person_id] = len(self._people)
+                self._people.append(person_id)
+            self._row_person[row] = self._person_numbers[person_id]
+            self._row_section[row] = INDEXED_SECTIONS.index(entry["section"])
+            self._rows.setdefault(person_id, {}).setdefault(entry["section"], []).append(row)
+
+        if self.backend == "hnsw" and self._size:
+            # Free rows are added too, marked deleted, so they can be reused like any other
+            self._build_ann(self._matrix.shape[1], self._size)
+            self._ann.add_items(np.asarray(self._matrix), np.arange(self._size))
+            for row in self._free:
+                self._ann.mark_deleted(row)
+
+    def _build_ann(self, dimensions: int, capacity: int) -> None:
+        self._ann = hnswlib.Index(space="ip", dim=dimensions)
+        self._ann.init_index(max_elements=max(capacity, 1024), ef_construction=200, M=16)
+        self._ann.set_ef(64)
+
+    def _allocate(self, dimensions: int) -> int:
+        """Get a free row, growing the matrix by doubling when it is full."""
+        if self._matrix.shape[1] not in (0, dimensions):
+            raise ValueError(
+                f"Embedding has {dimensions} dimensions but the index holds {self._matrix.shape[1]}"
+            )
+
+        capacity = len(self._matrix)
+        if not self._free and self._size == capacity:
+            capacity = max(capacity * 2, 64)
+        if capacity > len(self._matrix) or not self._matrix.flags.writeable:
+            # Also copies a memory-mapped matrix on the first write after loading
+            matrix = np.zeros((capacity, dimensions), dtype=np.float32)
+            if self._size:
+                matrix[: self._size] = self._matrix[: self._size]
+            self._matrix = matrix
+            self._row_live = np.resize(self._row_live, capacity)
+            self._row_person = np.resize(self._row_person, capacity)
+            self._row_section = np.resize(self._row_section, capacity)
+            self._entries.extend([None] * (capacity - len(self._entries)))
+
+        if self._free:
+            row = self._free.pop()
+            if self._ann is not None:
+                self._ann.unmark_deleted(row)
+            return row
+
+        if self.backend == "hnsw":
+            if self._ann is None:
+                self._build_ann(dimensions, capacity)
+            elif self._ann.get_max_elements() < capacity:
+                self._ann.resize_index(capacity)
+
+        row = self._size
+        self._size += 1
+        return row
+
+    def _remove_rows(self, person_id: str, section: str) -> None:
+        for row in self._rows.get(person_id, {}).pop(section, []):
+            self._entries[row] = None
+            self._row_live[row] = False
+            self._free.append(row)
+            if self._ann is not None:
+                self._ann.mark_deleted(row)
+
+    def _row_mask(self, sections: Optional[List[str]], exclude: Optional[Set[str]]) -> np.ndarray:
+        """Rows in use that belong to the requested sections and to people not excluded."""
+        mask = self._row_live[: self._size].copy()
+        if sections:
+            numbers = [number for number, section in enumerate(INDEXED_SECTIONS) if section in sections]
+            mask &= np.isin(self._row_section[: self._size], numbers)
+        if exclude:
+            numbers = [self._person_numbers[person_id] for person_id in exclude & set(self._person_numbers)]
+            mask &= ~np.isin(self._row_person[: self._size], numbers)
+        return mask
+
+    def _nearest(self, vector: np.ndarray, mask: np.ndarray, candidates: int):
+        """Rows matching a query vector and their cosine similarities."""
+        if self._ann is not None:
+            k = min(candidates, int(mask.sum()))
+            try:
+                labels, distances = self._ann.knn_query(vector, k=k, filter=lambda row: bool(mask[row]))
+                # Inner-product distance is 1 - similarity
+                return labels[0].astype(np.int64), 1.0 - distances[0]
+            except RuntimeError:
+                # Too few reachable rows for k under this filter; fall back to an exact scan
+                pass
+
+        rows = np.flatnonzero(mask)
+        scores = self._matrix[: self._size] @ vector
+        return rows, scores[rows]
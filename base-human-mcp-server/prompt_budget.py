@@ -0,0 +1,105 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Rough characters-per-token ratio used when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """Get the tiktoken encoding for a model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Count the tokens in a text for a model."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text))
+
+
+def compact_json(value: Any) -> str:
+    """Serialize a value as JSON without whitespace."""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+class PromptBudget:
+    """
+    Fits prompts into the input-token budget of the configured model.
+    The budget covers everything sent to the model; `llm.max_tokens` is
+    reserved for the reply on top of it.
+    """
+
+    def __init__(self, model: str = "gpt-4", context_budget: int = 6000, reserved_tokens: int = 0):
+        """
+        Initialize the budget.
+
+        Args:
+            model: Model name used to pick the tokenizer
+            context_budget: Maximum input tokens per request
+            reserved_tokens: Tokens already spent on fixed messages (e.g. the system prefix)
+        """
+        self.model = model
+        self.context_budget = context_budget
+        self.reserved_tokens = reserved_tokens
+
+    @classmethod
+    def from_config(cls, config) -> "PromptBudget":
+        """Build a budget from the `llm` section of a HumanConfig."""
+        llm = config.settings.llm
+        return cls(
+            model=llm.model,
+            context_budget=llm.context_budget,
+            reserved_tokens=count_tokens(config.get_system_prefix(), llm.model),
+        )
+
+    def count(self, text: str) -> int:
+        """Count the tokens in a text for this budget's model."""
+        return count_tokens(text, self.model)
+
+    def fit(
+        self,
+        render: Callable[[str], str],
+        items: List[str],
+        join: Optional[Callable[[List[str]], str]] = None,
+    ) -> Tuple[str, int]:
+        """
+        Render a prompt with as many of the newest items as fit in the budget.
+
+        Args:
+            render: Builds the prompt from the joined items
+            items: Pre-rendered items, oldest first
+            join: Combines the kept items (newline-separated by default)
+
+        Returns:
+            The prompt and the number of tokens dropped from the oldest items
+        """
+        join = join or "\n".join
+        remaining = self.context_budget - self.reserved_tokens - self.count(render(join([])))
+
+        kept: List[str] = []
+        dropped_tokens = 0
+        for item in reversed(items):
+            # One extra token for the separator between items
+            cost = self.count(item) + 1
+            if dropped_tokens or cost > remaining:
+                dropped_tokens += cost
+                continue
+            kept.append(item)
+            remaining -= cost
+
+        kept.reverse()
+        return render(join(kept)), dropped_tokens
@@ -0,0 +1,153 @@
+import string
+import functools
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+_PROFILE_SECTION = frozenset({"name", "style"})
+
+# Placeholders each handler fills in, by (section, key) of the template
+TEMPLATE_VARIABLES: Dict[Tuple[str, str], FrozenSet[str]] = {
+    ("interests", "prompt_template"): _PROFILE_SECTION,
+    ("skills", "prompt_template"): _PROFILE_SECTION,
+    ("goals", "prompt_template"): _PROFILE_SECTION,
+    ("services", "prompt_template"): _PROFILE_SECTION,
+    ("profile", "prompt_template"): frozenset({"name", "style", "instructions", "sections"}),
+    ("conversation", "prompt_template"): frozenset({"name", "style", "message", "history"}),
+    ("conversation", "summary_prompt"): frozenset({"name", "summary", "messages"}),
+    ("startup_ideas", "prompt_template"): frozenset({"name", "style", "interests", "my_skills", "their_skills"}),
+    ("services", "offer_prompt"): frozenset(
+        {"name", "style", "user_id", "title", "description", "rate", "duration"}
+    ),
+    ("social", "close_friends_prompt"): frozenset({"name", "style", "user_id", "count"}),
+    ("social", "invitation_prompt"): frozenset(
+        {"name", "style", "user_id", "date", "time", "location", "description"}
+    ),
+    ("meetings", "request_prompt"): frozenset(
+        {"name", "style", "user_id", "preferred_date", "preferred_time", "duration", "purpose"}
+    ),
+    ("goal_alignment", "prompt_template"): frozenset({"name", "my_goals", "their_goals"}),
+    ("skill_complementarity", "prompt_template"): frozenset({"name", "my_skills", "their_skills"}),
+    ("compatibility", "prompt_template"): frozenset(
+        {
+            "name",
+            "shared_interests",
+            "skill_compatibility",
+            "my_goals",
+            "their_goals",
+            "interest_weight",
+            "skill_weight",
+            "goal_weight",
+        }
+    ),
+}
+
+
+class TemplateError(ValueError):
+    """Raised when a prompt template cannot be parsed or uses a placeholder its handler does not fill."""
+
+
+class PromptTemplate:
+    """
+    A prompt template parsed once into literal text and placeholders.
+    Rendering joins the pieces directly instead of re-parsing the format string,
+    and the placeholders are checked against the handler's variables up front,
+    so a typo fails when the config loads rather than on a request.
+    """
+
+    __slots__ = ("source", "where", "variables", "_pieces")
+
+    def __init__(self, source: str, where: str, allowed: Optional[FrozenSet[str]] = None):
+        """
+        Compile a template.
+
+        Args:
+            source: Template text using str.format placeholders, e.g. "You are {name}"
+            where: Where the template comes from, for error messages (e.g. "conversation.prompt_template")
+            allowed: Placeholders the handler fills in (any name if None)
+
+        Raises:
+            TemplateError: If the template is malformed or uses a placeholder outside `allowed`
+        """
+        self.source = source
+        self.where = where
+        # Literal text followed by an optional (name, conversion, format spec) placeholder
+        self._pieces: List[Tuple[str, Optional[str], Optional[str], str]] = []
+        try:
+            parsed = list(string.Formatter().parse(source))
+        except ValueError as e:
+            raise TemplateError(f"{where}: {str(e)}")
+
+        for literal, field, spec, conversion in parsed:
+            if field is None:
+                self._pieces.append((literal, None, None, ""))
+                continue
+            if not field.isidentifier():
+                raise TemplateError(
+                    f"{where}: placeholder {{{field}}} is not supported; use a plain name such as {{name}}"
+                )
+            if allowed is not None and field not in allowed:
+                raise TemplateError(
+                    f"{where}: unknown placeholder {{{field}}}; available: "
+                    + ", ".join("{" + name + "}" for name in sorted(allowed))
+                )
+            if spec and "{" in spec:
+                raise TemplateError(f"{where}: nested placeholders in {{{field}:{spec}}} are not supported")
+            self._pieces.append((literal, field, conversion, spec or ""))
+
+        self.variables = frozenset(field for _, field, _, _ in self._pieces if field is not None)
+
+    def render(self, **values: Any) -> str:
+        """
+        Fill in the placeholders, like str.format(**values).
+
+        Raises:
+            KeyError: If a placeholder used by the template has no value
+        """
+        parts = []
+        for literal, field, conversion, spec in self._pieces:
+            parts.append(literal)
+            if field is None:
+                continue
+            value = values[field]
+            if conversion or spec or not isinstance(value, str):
+                if conversion == "r":
+                    value = repr(value)
+                elif conversion == "a":
+                    value = ascii(value)
+                elif conversion == "s":
+                    value = str(value)
+                value = format(value, spec)
+            parts.append(value)
+        return "".join(parts)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_template(source: str, section: str, key: str) -> PromptTemplate:
+    """
+    Compile a template for a config location, checking it against TEMPLATE_VARIABLES.
+    Results are cached, so built-in defaults are compiled once per process.
+    """
+    return PromptTemplate(source, f"{section}.{key}", TEMPLATE_VARIABLES.get((section, key)))
+
+
+def compile_templates(config: Dict[str, Any]) -> Dict[Tuple[str, str], PromptTemplate]:
+    """
+    Compile every prompt in a config: each `prompt_template` and other `*_prompt` key.
+
+    Raises:
+        TemplateError: Listing every template that fails to compile
+    """
+    templates = {}
+    errors = []
+    for section, values in config.items():
+        if not isinstance(values, dict):
+            continue
+        for key, source in values.items():
+            if not isinstance(source, str) or not (key == "prompt_template" or key.endswith("_prompt")):
+                continue
+            try:
+                templates[(section, key)] = compile_template(source, section, key)
+            except TemplateError as e:
+                errors.append(str(e))
+    if errors:
+        raise TemplateError("Invalid prompt templates:\n  " + "\n  ".join(errors))
+    return templates
@@ -0,0 +1,181 @@
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+import openai
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit breaker is open."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is transient: a timeout, a dropped connection, a 429 or a 5xx."""
+    if isinstance(error, (asyncio.TimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an unhealthy upstream.
+    After `failure_threshold` consecutive failed requests the circuit opens and
+    calls fail immediately. Once `reset_seconds` have passed, a single probe
+    request is let through; it closes the circuit on success or reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        """
+        Initialize a closed circuit.
+
+        Args:
+            failure_threshold: Consecutive failed requests that open the circuit
+            reset_seconds: Seconds the circuit stays open before a probe is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @classmethod
+    def from_config(cls, config) -> "CircuitBreaker":
+        """Build a breaker from the `llm` section of a HumanConfig."""
+        llm = config.settings.llm
+        return cls(
+            failure_threshold=llm.circuit_failure_threshold,
+            reset_seconds=llm.circuit_reset_seconds,
+        )
+
+    @property
+    def state(self) -> str:
+        """"closed", "open", or "half_open" when a probe may be sent."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now; in the half-open state only the first caller may."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after the upstream answered."""
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening (or reopening) the circuit when needed."""
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """Allow another probe when one ended without an outcome (e.g. it was cancelled)."""
+        self._probing = False
+
+
+class RetryPolicy:
+    """
+    Runs upstream requests with a per-attempt timeout and retries transient
+    failures with exponential backoff and full jitter, honouring Retry-After.
+    Every attempt goes through a circuit breaker shared by all callers of the upstream.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        timeout_seconds: float = 30.0,
+        max_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 8.0,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            breaker: Circuit breaker guarding the upstream
+            timeout_seconds: Limit for a single attempt
+            max_retries: Retries after the first attempt
+            backoff_base_seconds: Backoff cap for the first retry, doubled for each further retry
+            backoff_max_seconds: Upper bound for a single backoff
+        """
+        self.breaker = breaker
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+    @classmethod
+    def from_config(cls, config, breaker: CircuitBreaker) -> "RetryPolicy":
+        """Build a policy from the `llm` section of a HumanConfig."""
+        llm = config.settings.llm
+        return cls(
+            breaker,
+            timeout_seconds=llm.timeout_seconds,
+            max_retries=llm.max_retries,
+            backoff_base_seconds=llm.backoff_base_seconds,
+            backoff_max_seconds=llm.backoff_max_seconds,
+        )
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 0)."""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max_seconds)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt))
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a request under the policy.
+
+        Args:
+            fn: Zero-argument coroutine factory making one attempt
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The last error once retries are exhausted, or any non-transient error
+        """
+        probing = self.breaker.state != "closed"
+        if not self.breaker.allow():
+            raise CircuitOpenError("Upstream is unavailable; skipping the request until it recovers")
+
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = await asyncio.wait_for(fn(), self.timeout_seconds)
+                except Exception as e:
+                    if not is_retryable(e):
+                        # The upstream answered, so it is healthy even though the request failed
+                        self.breaker.record_success()
+                        raise
+                    # Stop early when the retries are spent or other requests opened the circuit
+                    if attempt >= self.max_retries or (not probing and self.breaker.state != "closed"):
+                        self.breaker.record_failure()
+                        raise
+                    await asyncio.sleep(self.backoff(attempt, e))
+                    attempt += 1
+                    continue
+
+                self.breaker.record_success()
+                return result
+        finally:
+            if probing:
+                self.breaker.release_probe()
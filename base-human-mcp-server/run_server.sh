@@ -2,7 +2,8 @@
 # Script to run the human MCP server with different configurations
 
 # Default values
-CONFIG_FILE="base-human-mcp-server/hope_config.yaml"
+DEFAULT_CONFIG_FILE="base-human-mcp-server/hope_config.yaml"
+CONFIG_FILES=()
 TRANSPORT="http"
 PORT="8000"
 HOST="127.0.0.1"
@@ -12,7 +13,7 @@ function show_help {
     echo "Usage: $0 [OPTIONS]"
     echo ""
     echo "Options:"
-    echo "  -c, --config FILEPATH    Configuration file path (default: $CONFIG_FILE)"
+    echo "  -c, --config FILEPATH    Configuration file path, repeat to host several personas (default: $DEFAULT_CONFIG_FILE)"
     echo "  -t, --transport TYPE     Transport type: stdio, http, sse (default: $TRANSPORT)"
     echo "  -p, --port PORT          Port number for HTTP/SSE (default: $PORT)"
     echo "  -h, --host HOST          Host for HTTP/SSE (default: $HOST)"
@@ -21,6 +22,7 @@ function show_help {
     echo "Examples:"
     echo "  $0 --config base-human-mcp-server/hope_config.yaml --transport http --port 9000"
     echo "  $0 --config base-human-mcp-server/hanna_config.yaml --transport sse --port 9001"
+    echo "  $0 -c base-human-mcp-server/hope_config.yaml -c base-human-mcp-server/hanna_config.yaml"
     echo ""
 }
 
@@ -29,7 +31,7 @@ while [[ $# -gt 0 ]]; do
     key="$1"
     case $key in
         -c|--config)
-            CONFIG_FILE="$2"
+            CONFIG_FILES+=("$2")
             shift
             shift
             ;;
@@ -60,8 +62,17 @@ while [[ $# -gt 0 ]]; do
     esac
 done
 
+if [ ${#CONFIG_FILES[@]} -eq 0 ]; then
+    CONFIG_FILES=("$DEFAULT_CONFIG_FILE")
+fi
+
+CONFIG_ARGS=()
+for CONFIG_FILE in "${CONFIG_FILES[@]}"; do
+    CONFIG_ARGS+=(--config "$CONFIG_FILE")
+done
+
 # Run the server with the specified options
-echo "Starting server with config: $CONFIG_FILE"
+echo "Starting server with config: ${CONFIG_FILES[*]}"
 echo "Transport: $TRANSPORT, Host: $HOST, Port: $PORT"
 
 # Special handling for port 9001
@@ -74,4 +85,4 @@ fi
 # source .venv/bin/activate
 
 # Run the server
-python base-human-mcp-server/server.py --config "$CONFIG_FILE" --transport "$TRANSPORT" --host "$HOST" --port "$PORT" 
\ No newline at end of file
+python base-human-mcp-server/server.py "${CONFIG_ARGS[@]}" --transport "$TRANSPORT" --host "$HOST" --port "$PORT" 
\ No newline at end of file
@@ -0,0 +1,167 @@
+import time
+import heapq
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+
+# Priority classes, most urgent first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+
+
+class Reservation:
+    """A granted slot. Set `used_tokens` once the actual usage is known to refund the difference."""
+
+    __slots__ = ("tokens", "used_tokens")
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.used_tokens: Optional[int] = None
+
+
+class LLMScheduler:
+    """
+    Admits outbound LLM requests within a request-per-minute budget, a
+    token-per-minute budget and a cap on requests in flight.
+    Requests wait in a priority queue, so interactive calls overtake
+    background work instead of every caller racing into rate-limit errors.
+    Both budgets are token buckets that refill continuously; 0 disables one.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0, max_in_flight: int = 8):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Request budget (0 for unlimited)
+            tokens_per_minute: Prompt plus completion token budget (0 for unlimited)
+            max_in_flight: Maximum concurrent requests (0 for unlimited)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_in_flight = max_in_flight
+
+        # A bucket holds at least one request, so budgets below one a minute (e.g. split between workers) still admit
+        self._request_capacity = max(1.0, float(requests_per_minute))
+        self._requests = self._request_capacity
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, int, "asyncio.Future[None]"]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @classmethod
+    def from_config(cls, config, processes: int = 1) -> "LLMScheduler":
+        """
+        Build a scheduler from the `llm` section of a HumanConfig.
+
+        Args:
+            config: The HumanConfig
+            processes: Server processes sharing the budgets; each gets an equal share
+        """
+        llm = config.settings.llm
+        return cls(
+            requests_per_minute=llm.requests_per_minute / processes,
+            tokens_per_minute=llm.tokens_per_minute / processes,
+            max_in_flight=-(-llm.max_in_flight // processes),
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently admitted."""
+        return self._in_flight
+
+    def queued(self, priority: Optional[int] = None) -> int:
+        """Number of waiting requests, optionally of one priority class."""
+        return sum(
+            1
+            for waiter_priority, _, _, future in self._waiters
+            if not future.done() and (priority is None or waiter_priority == priority)
+        )
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_NORMAL, tokens: int = 0) -> AsyncIterator[Reservation]:
+        """
+        Wait for admission and hold a slot for the duration of the block.
+
+        Args:
+            priority: One of the PRIORITY_* classes
+            tokens: Estimated prompt plus completion tokens
+        """
+        if self.tokens_per_minute:
+            # A request larger than the whole budget could never be admitted otherwise
+            tokens = min(tokens, self.tokens_per_minute)
+        reservation = Reservation(tokens)
+        await self._acquire(priority, tokens)
+        try:
+            yield reservation
+        finally:
+            self._release(reservation)
+
+    async def _acquire(self, priority: int, tokens: int) -> None:
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller was cancelled; hand the slot back
+                self._in_flight -= 1
+                self._dispatch()
+            raise
+
+    def _release(self, reservation: Reservation) -> None:
+        self._in_flight -= 1
+        if self.tokens_per_minute and reservation.used_tokens is not None:
+            self._refill()
+            refund = reservation.tokens - reservation.used_tokens
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + refund)
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.requests_per_minute:
+            self._requests = min(
+                self._request_capacity, self._requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _dispatch(self) -> None:
+        """Admit waiters in priority order while the budgets allow, or schedule a retry."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._refill()
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.max_in_flight and self._in_flight >= self.max_in_flight:
+                return
+
+            # Seconds until the head of the queue fits in both budgets
+            wait = 0.0
+            if self.requests_per_minute and self._requests < 1:
+                wait = max(wait, (1 - self._requests) * 60 / self.requests_per_minute)
+            if self.tokens_per_minute and self._tokens < tokens:
+                wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            if self.requests_per_minute:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= tokens
+            self._in_flight += 1
+            future.set_result(None)
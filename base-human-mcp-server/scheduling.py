@@ -0,0 +1,319 @@
+import os
+import json
+import bisect
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from locking import FileLock, file_signature
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Weekly windows when `scheduling.availability` is not configured: business hours on weekdays
+DEFAULT_AVAILABILITY = {day: ["09:00-17:00"] for day in WEEKDAYS[:5]}
+
+# Meeting locations and their timezones when `scheduling.locations` is not configured
+DEFAULT_LOCATIONS = {
+    "San Francisco": "America/Los_Angeles",
+    "Paris": "Europe/Paris",
+    "Rome": "Europe/Rome",
+    "London": "Europe/London",
+}
+
+# A span of time as (start, end) Unix timestamps
+Interval = Tuple[float, float]
+
+
+def load_zone(name: str) -> ZoneInfo:
+    """
+    Look up an IANA timezone such as "Europe/Paris".
+
+    Raises:
+        ValueError: If the name is not a known timezone
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        raise ValueError(f"Unknown timezone '{name}'; use an IANA name such as 'America/Los_Angeles'")
+
+
+def parse_window(spec: str) -> Tuple[time, time]:
+    """
+    Parse a daily window such as "09:00-17:00".
+
+    Raises:
+        ValueError: If the window is malformed or ends before it starts
+    """
+    try:
+        start, end = (time.fromisoformat(part.strip()) for part in spec.split("-"))
+    except (ValueError, AttributeError):
+        raise ValueError(f"Invalid availability window '{spec}'; expected HH:MM-HH:MM")
+    if end <= start:
+        raise ValueError(f"Invalid availability window '{spec}'; it ends before it starts")
+    return start, end
+
+
+def parse_date(value: Any, field: str) -> Optional[date]:
+    """
+    Parse an optional YYYY-MM-DD date from a request.
+
+    Raises:
+        ValueError: If the value is given but is not a YYYY-MM-DD string
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid {field} {value!r}; expected a date in YYYY-MM-DD format")
+
+
+def subtract(free: List[Interval], busy: List[Interval]) -> List[Interval]:
+    """
+    Remove busy time from free time.
+
+    Args:
+        free: Sorted, non-overlapping intervals
+        busy: Sorted intervals (they may overlap)
+
+    Returns:
+        The parts of the free intervals not covered by any busy interval, sorted
+    """
+    result = []
+    i = 0
+    for start, end in free:
+        # Busy intervals ending before this window cannot affect it or any later one
+        while i < len(busy) and busy[i][1] <= start:
+            i += 1
+        j = i
+        while j < len(busy) and busy[j][0] < end:
+            if busy[j][0] > start:
+                result.append((start, busy[j][0]))
+            start = max(start, busy[j][1])
+            j += 1
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def common_free(calendars: List[List[Interval]]) -> List[Interval]:
+    """
+    Times when everyone is free, by a sweep over all interval boundaries.
+
+    Args:
+        calendars: Each participant's sorted, non-overlapping free intervals
+
+    Returns:
+        Sorted intervals covered by a free interval of every participant
+    """
+    if not calendars or any(not free for free in calendars):
+        return []
+    # Starts sort before ends at the same instant, so back-to-back intervals do not split a window
+    events = sorted(
+        [(start, 0) for free in calendars for start, _ in free]
+        + [(end, 1) for free in calendars for _, end in free]
+    )
+    result = []
+    free_count = 0
+    opened = 0.0
+    for instant, kind in events:
+        if kind == 0:
+            free_count += 1
+            if free_count == len(calendars):
+                opened = instant
+        else:
+            if free_count == len(calendars) and instant > opened:
+                if result and result[-1][1] >= opened:
+                    result[-1] = (result[-1][0], instant)
+                else:
+                    result.append((opened, instant))
+            free_count -= 1
+    return result
+
+
+def find_slots(free: List[Interval], duration: float, step: float, count: int) -> List[Interval]:
+    """
+    The earliest slots of a given length inside free time.
+
+    Args:
+        free: Sorted, non-overlapping free intervals
+        duration: Slot length in seconds
+        step: Slots start on multiples of this many seconds
+        count: Maximum number of slots
+
+    Returns:
+        Up to `count` (start, end) slots, earliest first
+    """
+    slots = []
+    for start, end in free:
+        slot_start = -(-start // step) * step
+        while slot_start + duration <= end and len(slots) < count:
+            slots.append((slot_start, slot_start + duration))
+            slot_start += step
+        if len(slots) == count:
+            break
+    return slots
+
+
+class Availability:
+    """
+    A persona's recurring weekly availability in its own timezone, such as
+    weekdays from 09:00 to 17:00, expanded into concrete intervals on demand.
+    Conversions go through zoneinfo, so windows keep their local hours across
+    daylight saving changes.
+    """
+
+    def __init__(self, timezone: str, windows: Dict[str, List[str]]):
+        """
+        Initialize the availability.
+
+        Args:
+            timezone: IANA timezone the windows are given in
+            windows: Weekday name -> list of "HH:MM-HH:MM" windows, or a single window
+
+        Raises:
+            ValueError: If the timezone, a weekday or a window is invalid
+        """
+        self.timezone = timezone
+        self.zone = load_zone(timezone)
+        self.windows: Dict[int, List[Tuple[time, time]]] = {}
+        if not isinstance(windows, Mapping):
+            raise ValueError("Availability must map weekdays to HH:MM-HH:MM windows")
+        for day, specs in windows.items():
+            if str(day).lower() not in WEEKDAYS:
+                raise ValueError(f"Unknown weekday '{day}' in availability")
+            if isinstance(specs, str):
+                specs = [specs]
+            if not isinstance(specs, (list, tuple)):
+                raise ValueError(f"Availability for '{day}' must be a list of HH:MM-HH:MM windows")
+            self.windows[WEEKDAYS.index(str(day).lower())] = sorted(parse_window(spec) for spec in specs)
+
+    @classmethod
+    def from_config(cls, config) -> "Availability":
+        """
+        Build the availability from `scheduling.availability`.
+        The windows are read in `scheduling.timezone`, else the persona's timezone.
+        """
+        settings = config.settings
+        timezone = settings.scheduling.timezone or settings.persona.timezone or "UTC"
+        return cls(timezone, settings.scheduling.availability or DEFAULT_AVAILABILITY)
+
+    def intervals(self, start: float, end: float) -> List[Interval]:
+        """
+        Available intervals between two timestamps, clipped to them.
+
+        Returns:
+            Sorted, non-overlapping (start, end) timestamps
+        """
+        first_day = datetime.fromtimestamp(start, self.zone).date()
+        last_day = datetime.fromtimestamp(end, self.zone).date()
+        result = []
+        day = first_day
+        while day <= last_day:
+            for window_start, window_end in self.windows.get(day.weekday(), []):
+                begin = datetime.combine(day, window_start, self.zone).timestamp()
+                finish = datetime.combine(day, window_end, self.zone).timestamp()
+                begin, finish = max(begin, start), min(finish, end)
+                if begin < finish:
+                    if result and begin <= result[-1][1]:
+                        result[-1] = (result[-1][0], max(result[-1][1], finish))
+                    else:
+                        result.append((begin, finish))
+            day += timedelta(days=1)
+        return result
+
+
+
+class BookingIndex:
+    """
+    Booked meetings per persona, kept as intervals sorted by start time so
+    conflicts in a range are found by binary search. Like ConversationStore,
+    the file may be shared by several server processes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index.
+
+        Args:
+            path: JSON file the bookings are persisted to (memory only if None)
+        """
+        self.path = path
+        self.bookings: Dict[str, List[Dict[str, Any]]] = {}
+        self._starts: Dict[str, List[float]] = {}
+        self._lock = FileLock(path)
+        self._signature = None
+        self._sync()
+
+    @classmethod
+    def from_config(cls, config) -> "BookingIndex":
+        """Build an index from `paths.bookings_file`."""
+        return cls(path=config.get_file_path("bookings_file"))
+
+    def busy(self, owner: str, start: float, end: float) -> List[Interval]:
+        """Booked intervals of an owner overlapping [start, end), sorted by start."""
+        self._sync()
+        entries = self.bookings.get(owner, [])
+        # Bookings are short, so any overlapping one starts less than a day before the range
+        first = bisect.bisect_left(self._starts.get(owner, []), start - 86400)
+        last = bisect.bisect_left(self._starts.get(owner, []), end)
+        return [
+            (entry["start"], entry["end"])
+            for entry in entries[first:last]
+            if entry["end"] > start
+        ]
+
+    def is_free(self, owner: str, start: float, end: float) -> bool:
+        """Whether an owner has nothing booked in [start, end)."""
+        return not self.busy(owner, start, end)
+
+    async def book(self, owner: str, start: float, end: float, details: Dict[str, Any]) -> bool:
+        """
+        Record a meeting for an owner.
+
+        Returns:
+            False, without booking, if the time was booked by another process meanwhile
+        """
+        async with self._lock:
+            if not self.is_free(owner, start, end):
+                return False
+            entries = self.bookings.setdefault(owner, [])
+            starts = self._starts.setdefault(owner, [])
+            position = bisect.bisect_right(starts, start)
+            starts.insert(position, start)
+            entries.insert(position, {"start": start, "end": end, **details})
+            self.save()
+        return True
+
+    def save(self) -> None:
+        """Write all bookings to disk atomically."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.bookings, f)
+            os.replace(tmp_path, self.path)
+            self._signature = file_signature(self.path)
+        except OSError as e:
+            print(f"Warning: Could not save bookings to {self.path}: {str(e)}")
+
+    def _sync(self) -> None:
+        """Reload the file if another process saved it since this one last read or wrote it."""
+        signature = file_signature(self.path)
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        try:
+            with open(self.path, "r") as f:
+                self.bookings = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load bookings from {self.path}: {str(e)}")
+        self._starts = {}
+        for owner, entries in self.bookings.items():
+            entries.sort(key=lambda entry: entry["start"])
+            self._starts[owner] = [entry["start"] for entry in entries]
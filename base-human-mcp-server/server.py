@@ -1,416 +1,224 @@
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 import os
-import json
+import sys
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any
 import openai
-from config import HumanConfig
+from config import HumanConfig, PERSONA_FILES
+from cache import GenerationCache
+from singleflight import SingleFlight
+from conversations import ConversationStore
+from negotiation import NegotiationStore
+from scheduling import BookingIndex
+from human import Human
+from embeddings import Embedder
+from people_index import PeopleIndex
+from resilience import CircuitBreaker, RetryPolicy
+from scheduler import LLMScheduler
+from watcher import ConfigWatcher
+from metrics import registry, instrument_tool, SharedMetrics
 import argparse
 
-# Initialize OpenAI client
-openai_client = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""))
+# Initialize OpenAI client, shared by every hosted persona; retries are handled by RetryPolicy
+openai_client = openai.AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY", ""), max_retries=0)
 
 # Default config path
 DEFAULT_CONFIG_PATH = "/Users/artemiy/Projects/deep-human/base-human-mcp-server/config.yaml"
 
-# Initialize with default config
-config = HumanConfig(DEFAULT_CONFIG_PATH)
+# Shares one completion among concurrent identical requests
+inflight_completions = SingleFlight()
 
-def call_openai(prompt: str, temperature: float = 0.7, max_tokens: int = 500) -> str:
-    """Call OpenAI API with a prompt and return the response."""
-    try:
-        llm_config = config.get_llm_config()
-
-        # Create a system message with the full config context
-        config_data = {
-            "persona": {
-                "name": config.get("persona", "name"),
-                "bio": config.get("persona", "bio"),
-                "location": config.get("persona", "location"),
-                "timezone": config.get("persona", "timezone"),
-                "style": config.get("persona", "style"),
-            },
-            "llm": llm_config,
-        }
-
-        # Format config as pretty JSON string
-        config_json = json.dumps(config_data, indent=2)
-
-        # Create the system message with both config context and the specific prompt
-        system_message = f"""
-Full configuration context:
-```
-{config_json}
-```
-
-Now, with this context in mind, please respond to the following request:
-
-{prompt}
-"""
-
-        response = openai_client.chat.completions.create(
-            model=llm_config.get("model", "gpt-4"),
-            messages=[{"role": "system", "content": system_message}],
-            temperature=llm_config.get("temperature", temperature),
-            max_tokens=llm_config.get("max_tokens", max_tokens),
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f"Error calling OpenAI: {str(e)}")
-        return f"Error generating response: {str(e)}"
-
-def get_basic_info(
-    request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
-) -> Dict[str, Any]:
-    """Get basic information about this human."""
-    return {
-        "name": config.get("persona", "name"),
-        "bio": config.get("persona", "bio"),
-        "location": config.get("persona", "location"),
-        "timezone": config.get("persona", "timezone"),
-    }
-
-def get_interests(
-    request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
-) -> List[Dict[str, Any]]:
-    """Get detailed interests of this human with relevance scores."""
-    prompt_template = config.get(
-        "interests",
-        "prompt_template",
-        fallback="""
-    You are {name}, a person with a unique set of interests.
-    Based on your personality and style ('{style}'),
-    generate a detailed list of 5-7 interests that would authentically represent you.
-    
-    For each interest, include:
-    1. The name of the interest
-    2. A score from 0.0 to 1.0 indicating how important this interest is to you
-    3. A brief description with specifics about this interest
-    
-    GOAL: Return a JSON array of objects with "name", "score", and "details" fields.
-    Return ONLY the JSON array without any explanations or additional text.
-    """,
-    )
-
-    prompt = prompt_template.format(
-        name=config.get_persona_name(), 
-        style=config.get_persona_style()
-    )
-
-    try:
-        response = call_openai(prompt)
-        interests = json.loads(response)
-        return interests
-    except Exception as e:
-        print(f"Error generating interests: {str(e)}")
-        return config.get("interests", "defaults", fallback=[])
-
-def get_skills(
-    request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
-) -> List[Dict[str, Any]]:
-    """Get detailed skills of this human with proficiency levels."""
-    prompt_template = config.get(
-        "skills",
-        "prompt_template",
-        fallback="""
-    You are {name}, a person with a unique set of skills.
-    Based on your personality and style ('{style}'),
-    generate a detailed list of 5-7 skills that would authentically represent you.
-    
-    For each skill, include:
-    1. The name of the skill
-    2. A level from 0.0 to 1.0 indicating your proficiency
-    3. A brief description with specifics about this skill
-    
-    GOAL: Return a JSON array of objects with "name", "level", and "details" fields.
-    Return ONLY the JSON array without any explanations or additional text.
-    """,
-    )
-
-    prompt = prompt_template.format(
-        name=config.get_persona_name(), 
-        style=config.get_persona_style()
-    )
-
-    try:
-        response = call_openai(prompt)
-        skills = json.loads(response)
-        return skills
-    except Exception as e:
-        print(f"Error generating skills: {str(e)}")
-        return config.get("skills", "defaults", fallback=[])
-
-def get_goals(
-    request: Dict[str, Any] = {}, context: Dict[str, Any] = {}
-) -> Dict[str, List[str]]:
-    """Get short, medium, and long-term goals of this human."""
-    prompt_template = config.get(
-        "goals",
-        "prompt_template",
-        fallback="""
-    You are {name}, a person with specific goals and aspirations.
-    Based on your personality and style ('{style}'),
-    generate a set of authentic goals that would represent you.
-    
-    Include:
-    1. 2-3 short-term goals (achievable within months)
-    2. 2-3 medium-term goals (achievable within 1-2 years)
-    3. 2-3 long-term goals (achievable in 3+ years)
-    
-    GOAL: Return a JSON object with "short_term", "medium_term", and "long_term" keys,
-    each containing an array of goal strings.
-    Return ONLY the JSON object without any explanations or additional text.
-    """,
-    )
-
-    prompt = prompt_template.format(
-        name=config.get_persona_name(), 
-        style=config.get_persona_style()
-    )
-
-    try:
-        response = call_openai(prompt)
-        goals = json.loads(response)
-        return goals
-    except Exception as e:
-        print(f"Error generating goals: {str(e)}")
-        return config.get("goals", "defaults", fallback={})
-
-def converse(request: Dict[str, Any], context: Dict[str, Any] = {}) -> Dict[str, Any]:
+def load_humans(config_paths: List[str], workers: int = 1) -> List[Human]:
     """
-    Engage in conversation with customizable style using prompt-driven responses.
+    Load one persona per config file.
 
-    Args within request:
-        message: The message to respond to
-        conversation_context: Context about the conversation including history and the other human
-        style: Optional style directive (e.g., 'friendly', 'professional', 'casual')
-    """
-    message = request.get("message", "")
-    style = request.get("style", "")
-    conversation_context = request.get("conversation_context", {})
-
-    conversation_id = conversation_context.get("id", "default")
-    history = context.get("history", [])
-
-    # Format history for the prompt
-    history_text = (
-        "\n".join([f"{msg['sender']}: {msg['message']}" for msg in history])
-        if history
-        else "No previous messages."
-    )
+    The personas share the OpenAI client, the generation cache, embedder,
+    people index, circuit breaker and request scheduler (configured by the
+    first file) and a conversation store, negotiation store and booking index
+    per distinct file.
 
-    # Get persona name and style
-    name = config.get_persona_name()
-    persona_style = config.get_persona_style()
-
-    # Apply custom style if provided
-    if style:
-        persona_style = f"{persona_style}, but more {style}"
-
-    # Get the conversation prompt from config
-    prompt_template = config.get("conversation", "prompt_template")
-    prompt = prompt_template.format(
-        name=name, 
-        style=persona_style, 
-        message=message, 
-        history=history_text
-    )
-
-    # Call OpenAI to generate a response
-    try:
-        response = call_openai(prompt)
-    except Exception as e:
-        response = f"I'm having trouble responding right now. Error: {str(e)}"
-
-    # Get max history from config or default to 10
-    max_history = config.get("conversation", "max_history", fallback=10)
-
-    return {
-        "response": response,
-        "conversation_id": conversation_id,
-        "message_count": len(history) + 1,
-        "max_history": max_history,
-    }
-
-def hire_ios_engineer(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> str:
-    """
-    Handle the hiring process for an iOS engineer with salary negotiation.
-    
-    Args within request:
-        candidate_info: Information about the candidate
-        current_salary: Current salary expectation
-        negotiation_history: Previous negotiation attempts
+    Args:
+        config_paths: YAML config files, one per persona
+        workers: Server processes loading the same files; the LLM rate limits are split between them
     """
-    candidate_info = request.get("candidate_info", {})
-    current_salary = request.get("current_salary", 150000)  # Default to max range
-    negotiation_history = request.get("negotiation_history", [])
-    
-    # Get persona name and style
-    name = config.get_persona_name()
-    persona_style = config.get_persona_style()
-    
-    # Create negotiation prompt
-    prompt = f"""
-    You are {name}, a hiring manager looking to hire an iOS engineer for Artemiy's team.
-    Your budget range is $100,000-$150,000, and you want to negotiate for the best possible deal.
-    
-    Current situation:
-    - Candidate's current salary expectation: ${current_salary}
-    - Previous negotiation attempts: {json.dumps(negotiation_history, indent=2)}
-    - Candidate info: {json.dumps(candidate_info, indent=2)}
-    
-    Your goals:
-    1. Try to negotiate the salary down while maintaining a professional and respectful tone
-    2. Emphasize the importance of the role and growth opportunities in Artemiy's team
-    3. Highlight other benefits and company culture
-    4. Be prepared to compromise if the candidate is exceptional
-    5. Ensure the candidate will be a good fit for Artemiy's iOS engineering team
-    
-    Generate a negotiation response that:
-    1. Acknowledges the candidate's value
-    2. Presents a counter-offer or negotiation points
-    3. Maintains a positive and professional tone
-    4. Shows flexibility while staying within budget
-    5. Emphasizes the opportunity to work with Artemiy on iOS development
-    
-    Return a natural, conversational response that includes:
-    - Your proposed salary (between $100k-$150k)
-    - Your negotiation strategy
-    - Assessment of team fit
-    - Key points about the role and opportunity
+    configs = [HumanConfig(config_path) for config_path in config_paths]
+    generation_cache = GenerationCache.from_config(configs[0])
+    circuit_breaker = CircuitBreaker.from_config(configs[0])
+    embedder = Embedder(
+        openai_client,
+        model=configs[0].settings.matching.embedding_model,
+        retry_policy=RetryPolicy.from_config(configs[0], circuit_breaker),
+    )
+    people_index = PeopleIndex.from_config(configs[0])
+    scheduler = LLMScheduler.from_config(configs[0], processes=workers)
+    conversation_stores: Dict[str, ConversationStore] = {}
+    negotiation_stores: Dict[str, NegotiationStore] = {}
+    booking_indexes: Dict[str, BookingIndex] = {}
+
+    humans = []
+    for config in configs:
+        conversation_file = config.get_file_path("conversation_file")
+        if conversation_file not in conversation_stores:
+            conversation_stores[conversation_file] = ConversationStore.from_config(config)
+        negotiation_file = config.get_file_path("negotiation_file")
+        if negotiation_file not in negotiation_stores:
+            negotiation_stores[negotiation_file] = NegotiationStore.from_config(config)
+        bookings_file = config.get_file_path("bookings_file")
+        if bookings_file not in booking_indexes:
+            booking_indexes[bookings_file] = BookingIndex.from_config(config)
+
+        human = Human(
+            config,
+            openai_client,
+            generation_cache,
+            inflight_completions,
+            conversation_stores[conversation_file],
+            embedder,
+            people_index,
+            circuit_breaker,
+            scheduler,
+            negotiation_stores[negotiation_file],
+            booking_indexes[bookings_file],
+            humans,
+        )
+        if any(other.slug == human.slug for other in humans):
+            raise ValueError(
+                f"Two personas map to '{human.slug}'; set a distinct persona.id in one of them"
+            )
+        for other in humans:
+            for key in PERSONA_FILES:
+                if config.get_file_path(key, human.slug) == other.config.get_file_path(key, other.slug):
+                    raise ValueError(
+                        f"Personas '{other.slug}' and '{human.slug}' share paths.{key}; "
+                        "give each its own file or include {persona} in the path"
+                    )
+        humans.append(human)
+
+    return humans
+
+def register_human(mcp: FastMCP, human: Human) -> None:
+    """Register a persona's tools and profile resources, namespaced by its slug."""
+    for tool in human.tools:
+        mcp.tool(instrument_tool(human.slug, tool, getattr(human, tool)), name=f"{human.slug}_{tool}_tool")
+
+    scheme = f"{human.slug.replace('_', '-')}-profile"
+
+    @mcp.resource(f"{scheme}://basic", name=f"{human.slug}_profile_basic")
+    def get_profile_basic() -> Dict[str, Any]:
+        return human.get_basic_info()
+
+    @mcp.resource(f"{scheme}://interests", name=f"{human.slug}_profile_interests")
+    async def get_profile_interests() -> List[Dict[str, Any]]:
+        return await human.get_interests()
+
+    @mcp.resource(f"{scheme}://skills", name=f"{human.slug}_profile_skills")
+    async def get_profile_skills() -> List[Dict[str, Any]]:
+        return await human.get_skills()
+
+    @mcp.resource(f"{scheme}://goals", name=f"{human.slug}_profile_goals")
+    async def get_profile_goals() -> Dict[str, List[str]]:
+        return await human.get_goals()
+
+    @mcp.resource(f"{scheme}://profile", name=f"{human.slug}_profile")
+    async def get_profile() -> Dict[str, Any]:
+        return await human.get_profile()
+
+def create_server(
+    humans: List[Human],
+    watch_interval: Optional[float] = None,
+    shared_metrics: Optional[SharedMetrics] = None,
+) -> FastMCP:
     """
-    
-    try:
-        response = call_openai(prompt)
-        return response.strip()
-    except Exception as e:
-        print(f"Error in hiring negotiation: {str(e)}")
-        return "I apologize, but I'm having trouble processing the negotiation right now. Please try again later."
+    Create an MCP server hosting the given personas.
 
-def find_job(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> str:
-    """
-    Find and negotiate a job opportunity with focus on salary negotiation.
-    
-    Args within request:
-        job_info: Information about the job opportunity
-        current_offer: Current salary offer
-        negotiation_history: Previous negotiation attempts
-        location: Job location (default: New York)
-        benefits: Additional benefits offered
-    """
-    job_info = request.get("job_info", {})
-    current_offer = request.get("current_offer", 140000)  # Default to minimum range
-    negotiation_history = request.get("negotiation_history", [])
-    location = request.get("location", "New York")
-    benefits = request.get("benefits", {})
-    
-    # Get persona name and style
-    name = config.get_persona_name()
-    persona_style = config.get_persona_style()
-    
-    # Create job search and negotiation prompt
-    prompt = f"""
-    You are {name}, an experienced professional looking for a new job opportunity.
-    Your target salary range is $140,000-$200,000, with a strong preference for the higher end.
-    You are based in {location} and need to ensure financial stability.
-    
-    Current situation:
-    - Current offer: ${current_offer}
-    - Job details: {json.dumps(job_info, indent=2)}
-    - Location: {location}
-    - Benefits: {json.dumps(benefits, indent=2)}
-    - Previous negotiation attempts: {json.dumps(negotiation_history, indent=2)}
-    
-    Your goals:
-    1. Negotiate for the highest possible salary within the range
-    2. Ensure the offer is sufficient for living in {location}
-    3. Don't lose the opportunity while maximizing compensation
-    4. Consider total compensation including benefits
-    
-    Generate a negotiation strategy that:
-    1. Emphasizes your value and experience
-    2. Highlights the high cost of living in {location}
-    3. Presents a strong case for higher compensation
-    4. Shows flexibility while maintaining minimum requirements
-    5. Considers the total compensation package
-    
-    Return a natural, conversational response that includes:
-    - Your target salary and minimum acceptable salary
-    - Your negotiation strategy
-    - Key points you want to emphasize
-    - Alternative benefits you'd consider if salary can't be increased
+    Args:
+        humans: The personas to host
+        watch_interval: Seconds between checks for edited config files (no hot reload if None)
+        shared_metrics: Sums the metrics of every worker process (only this process's if None)
     """
-    
-    try:
-        response = call_openai(prompt)
-        return response.strip()
-    except Exception as e:
-        print(f"Error in job search negotiation: {str(e)}")
-        return "I apologize, but I'm having trouble processing the negotiation right now. Please try again later."
-
-# Create MCP server with default configuration
-mcp = FastMCP(
-    name="Human-MCP-Server",
-    instructions="""
-    This server provides tools to understand a human's interests, 
+    names = [human.config.settings.persona.name for human in humans]
+    if len(humans) == 1:
+        server_name = f"{names[0]}-MCP-Server"
+        represents = names[0]
+    else:
+        server_name = "Human-MCP-Server"
+        represents = ", ".join(names)
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP):
+        # Index whatever profile data is already on disk or cached, without generating any
+        for human in humans:
+            human.refresh_index()
+
+        watcher_task = None
+        if watch_interval:
+            watcher_task = asyncio.ensure_future(ConfigWatcher(humans, watch_interval).run())
+        try:
+            yield {}
+        finally:
+            if watcher_task:
+                watcher_task.cancel()
+            await humans[0].people_index.save()
+
+    mcp = FastMCP(
+        name=server_name,
+        lifespan=lifespan,
+        instructions=f"""
+    This server represents {represents}, providing tools to understand their interests,
     skills, and goals. It supports conversations and facilitates matching with other humans.
-    
-    The server is specifically configured to help Artemiy in his role as an iOS engineering team lead,
-    particularly in the hiring process for iOS engineers. All interactions and negotiations should
-    be conducted with this context in mind, ensuring that candidates are evaluated for their fit
-    with Artemiy's iOS engineering team.
+    Each persona's tools are prefixed with its name, and its profile resources use the
+    <name>-profile:// scheme.
     """,
-)
-
-# Register all tools and resources
-@mcp.tool()
-def artemiy_get_basic_info_tool(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> Dict[str, Any]:
-    return get_basic_info(request, context)
-
-@mcp.tool()
-def artemiy_get_interests_tool(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> List[Dict[str, Any]]:
-    return get_interests(request, context)
-
-@mcp.tool()
-def artemiy_get_skills_tool(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> List[Dict[str, Any]]:
-    return get_skills(request, context)
-
-@mcp.tool()
-def artemiy_get_goals_tool(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> Dict[str, List[str]]:
-    return get_goals(request, context)
-
-@mcp.tool()
-def artemiy_hire_ios_engineer_tool(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> Dict[str, Any]:
-    return hire_ios_engineer(request, context)
+    )
 
-@mcp.tool()
-def artemiy_find_job_tool(request: Dict[str, Any] = {}, context: Dict[str, Any] = {}) -> Dict[str, Any]:
-    return find_job(request, context)
+    for human in humans:
+        register_human(mcp, human)
 
-@mcp.tool()
-def artemiy_converse_tool(request: Dict[str, Any], context: Dict[str, Any] = {}) -> Dict[str, Any]:
-    return converse(request, context)
+    # Latency, token and fallback metrics in the Prometheus text format
+    render_metrics = shared_metrics.render if shared_metrics else registry.render
 
-@mcp.resource("artemiy-profile://basic")
-def get_profile_basic() -> Dict[str, Any]:
-    return get_basic_info()
+    @mcp.resource("metrics://prometheus", name="metrics", mime_type="text/plain")
+    def get_metrics() -> str:
+        return render_metrics()
 
-@mcp.resource("artemiy-profile://interests")
-def get_profile_interests() -> List[Dict[str, Any]]:
-    return get_interests()
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics_endpoint(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
-@mcp.resource("artemiy-profile://skills")
-def get_profile_skills() -> List[Dict[str, Any]]:
-    return get_skills()
+    return mcp
 
-@mcp.resource("artemiy-profile://goals")
-def get_profile_goals() -> Dict[str, List[str]]:
-    return get_goals()
+def create_worker_app():
+    """
+    Build the HTTP app in one of the `--workers` processes.
+    Each worker loads the personas from the config files listed in HUMAN_CONFIG_PATHS
+    and shares their data files with the other workers. MCP sessions are stateless,
+    since consecutive requests from a client may reach different workers. Their metrics
+    are summed through snapshots in HUMAN_METRICS_DIR.
+    """
+    config_paths = os.environ["HUMAN_CONFIG_PATHS"].split(os.pathsep)
+    workers = int(os.environ.get("HUMAN_WORKERS", "1"))
+    watch_interval = float(os.environ.get("HUMAN_WATCH_INTERVAL") or 0) or None
+    humans = load_humans(config_paths, workers=workers)
+    shared_metrics = None
+    if os.environ.get("HUMAN_METRICS_DIR"):
+        shared_metrics = SharedMetrics(registry, os.environ["HUMAN_METRICS_DIR"])
+        shared_metrics.start()
+    server = create_server(humans, watch_interval=watch_interval, shared_metrics=shared_metrics)
+    return server.http_app(stateless_http=True)
 
 # Main entry point
 if __name__ == "__main__":
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Run Human MCP Server")
-    parser.add_argument("--config", type=str, help="Path to YAML configuration file")
+    parser.add_argument(
+        "--config",
+        type=str,
+        action="append",
+        help="Path to YAML configuration file (repeat to host several personas)",
+    )
     parser.add_argument(
         "--transport",
         type=str,
@@ -424,38 +232,94 @@ if __name__ == "__main__":
     parser.add_argument(
         "--port", type=int, default=8000, help="Port for HTTP/SSE transport"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Reload persona config files when they change, without restarting",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between checks for changed config files",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Server processes behind the HTTP listener (http transport only)",
+    )
 
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.transport != "http":
+        parser.error("--workers needs --transport http")
+
+    # With the stdio transport stdout carries the protocol, so startup messages go to stderr
+    protocol_stdout = sys.stdout
+    if args.transport == "stdio":
+        sys.stdout = sys.stderr
 
-    # Get the absolute path to the config file if provided
-    config_path = None
+    # Get the absolute paths to the config files if provided
     if args.config:
-        config_path = os.path.abspath(args.config)
-        print(f"Using config file: {config_path}")
-        if not os.path.exists(config_path):
-            print(f"Warning: Config file not found at {config_path}")
+        config_paths = [os.path.abspath(config_path) for config_path in args.config]
+        for config_path in config_paths:
+            print(f"Using config file: {config_path}")
+            if not os.path.exists(config_path):
+                print(f"Warning: Config file not found at {config_path}")
     else:
-        config_path = os.path.abspath(DEFAULT_CONFIG_PATH)
-        print(f"No config file specified. Using default: {config_path}")
-        if not os.path.exists(config_path):
-            print(f"Warning: Default config file not found at {config_path}")
-
-    # Load the configuration
-    config = HumanConfig(config_path)
-
-    # Log loaded configuration
-    persona_name = config.get_persona_name()
-    print(f"Loaded configuration for {persona_name}")
-
-    # Update server configuration
-    mcp._name = f"{persona_name}-MCP-Server"
-    mcp._instructions = f"""
-    This server represents {persona_name}, providing tools to understand their interests, 
-    skills, and goals. It supports conversations and facilitates matching with other humans.
-    """
+        config_paths = [os.path.abspath(DEFAULT_CONFIG_PATH)]
+        print(f"No config file specified. Using default: {config_paths[0]}")
+        if not os.path.exists(config_paths[0]):
+            print(f"Warning: Default config file not found at {config_paths[0]}")
+
+    if args.workers > 1:
+        import shutil
+        import tempfile
+        import uvicorn
+
+        # Check the configs once here; each worker then loads its own personas
+        try:
+            for config_path in config_paths:
+                HumanConfig(config_path)
+        except ValueError as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        os.environ["HUMAN_CONFIG_PATHS"] = os.pathsep.join(config_paths)
+        os.environ["HUMAN_WORKERS"] = str(args.workers)
+        os.environ["HUMAN_WATCH_INTERVAL"] = str(args.watch_interval if args.watch else 0)
+        # The workers' metric snapshots, summed by whichever worker serves /metrics
+        metrics_dir = tempfile.mkdtemp(prefix="human-metrics-")
+        os.environ["HUMAN_METRICS_DIR"] = metrics_dir
+        try:
+            uvicorn.run(
+                "server:create_worker_app",
+                factory=True,
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                app_dir=os.path.dirname(os.path.abspath(__file__)),
+            )
+        finally:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+        sys.exit(0)
+
+    # Load the personas and register their tools
+    try:
+        humans = load_humans(config_paths)
+    except ValueError as e:
+        # e.g. a prompt template with an unknown placeholder
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    for human in humans:
+        print(f"Loaded configuration for {human.config.settings.persona.name} ({human.slug})")
+
+    mcp = create_server(humans, watch_interval=args.watch_interval if args.watch else None)
 
     # Run the server with the specified transport
     if args.transport == "stdio":
+        sys.stdout = protocol_stdout
         mcp.run()
     elif args.transport == "http":
         mcp.run(transport="streamable-http", host=args.host, port=args.port)
@@ -0,0 +1,259 @@
+import dataclasses
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from scheduling import WEEKDAYS, parse_window
+
+STRUCTURED_OUTPUT_MODES = ("json_schema", "json_object", "off")
+SEARCH_BACKENDS = ("matrix", "hnsw")
+
+
+class SettingsError(ValueError):
+    """Raised when a config value has the wrong type or is out of range."""
+
+
+def _integer(value: Any) -> int:
+    # bool is an int subclass, but `max_history: true` is a mistake
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+        raise TypeError("expected a whole number")
+    return int(value)
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError("expected a number")
+    return float(value)
+
+
+def _positive_number(value: Any) -> float:
+    value = _number(value)
+    if value <= 0:
+        raise ValueError("must be above 0")
+    return value
+
+
+def _flag(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError("expected true or false")
+    return value
+
+
+def _text(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("expected a string")
+    return value
+
+
+def _optional_text(value: Any) -> Optional[str]:
+    return None if value is None else _text(value)
+
+
+def _salary_range(value: Any) -> Tuple[int, int]:
+    # Whole amounts, so offers are ints like the rounded counter-offers between them
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise TypeError("expected [low, high]")
+    low, high = (_integer(amount) for amount in value)
+    if low > high:
+        raise ValueError("low is above high")
+    return low, high
+
+
+def _availability(value: Any) -> Optional[Mapping[str, Tuple[str, ...]]]:
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        raise TypeError("expected weekday: [HH:MM-HH:MM, ...]")
+    windows = {}
+    for day, specs in value.items():
+        if str(day).lower() not in WEEKDAYS:
+            raise ValueError(f"unknown weekday '{day}'")
+        if isinstance(specs, str):
+            specs = [specs]
+        for spec in specs:
+            parse_window(_text(spec))
+        windows[day] = tuple(specs)
+    return MappingProxyType(windows)
+
+
+def _locations(value: Any) -> Optional[Mapping[str, str]]:
+    if value is None:
+        return None
+    if not isinstance(value, dict) or not value:
+        raise TypeError("expected location: timezone")
+    return MappingProxyType({_text(location): _text(zone) for location, zone in value.items()})
+
+
+def _setting(convert: Callable[[Any], Any], minimum: Optional[float] = None, choices: Tuple[str, ...] = ()):
+    """A settings field read from the config with `convert`, optionally bounded or restricted to choices."""
+    return dataclasses.field(metadata={"convert": convert, "minimum": minimum, "choices": choices})
+
+
+def _build(cls, section: str, values: Any, errors: List[str]):
+    """
+    Build a settings section from its config dict, adding a message to `errors`
+    for each invalid value. Keys without a field (prompts, defaults) are ignored.
+    """
+    if not isinstance(values, dict):
+        errors.append(f"{section}: expected a mapping")
+        values = {}
+    kwargs = {}
+    for field in dataclasses.fields(cls):
+        where = f"{section}.{field.name}"
+        if field.name not in values:
+            errors.append(f"{where}: missing")
+            continue
+        try:
+            value = field.metadata["convert"](values[field.name])
+        except (TypeError, ValueError) as e:
+            errors.append(f"{where}: {str(e)} (got {values[field.name]!r})")
+            continue
+        minimum = field.metadata["minimum"]
+        if minimum is not None and value < minimum:
+            errors.append(f"{where}: must be at least {minimum} (got {value!r})")
+            continue
+        choices = field.metadata["choices"]
+        if choices and value not in choices:
+            errors.append(f"{where}: must be one of {', '.join(choices)} (got {value!r})")
+            continue
+        kwargs[field.name] = value
+    if len(kwargs) < len(dataclasses.fields(cls)):
+        return None
+    return cls(**kwargs)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PersonaSettings:
+    id: Optional[str] = _setting(_optional_text)
+    name: str = _setting(_text)
+    bio: str = _setting(_text)
+    location: str = _setting(_text)
+    timezone: str = _setting(_text)
+    style: str = _setting(_text)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ConversationSettings:
+    max_history: int = _setting(_integer, minimum=0)
+    stream: bool = _setting(_flag)
+    max_conversations: int = _setting(_integer, minimum=1)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class MatchingSettings:
+    interest_weight: float = _setting(_number, minimum=0)
+    skill_weight: float = _setting(_number, minimum=0)
+    goal_weight: float = _setting(_number, minimum=0)
+    min_score_threshold: float = _setting(_number)
+    top_k: int = _setting(_integer, minimum=1)
+    embedding_model: str = _setting(_text)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class StartupIdeasSettings:
+    num_ideas: int = _setting(_integer, minimum=1)
+    max_concurrency: int = _setting(_integer, minimum=1)
+    similarity_threshold: float = _setting(_number)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class NegotiationSettings:
+    hiring_range: Tuple[int, int] = _setting(_salary_range)
+    salary_range: Tuple[int, int] = _setting(_salary_range)
+    max_rounds: int = _setting(_integer, minimum=1)
+    concession: float = _setting(_positive_number)
+    round_to: int = _setting(_integer, minimum=1)
+    max_sessions: int = _setting(_integer, minimum=1)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SchedulingSettings:
+    timezone: Optional[str] = _setting(_optional_text)
+    # None means scheduling.DEFAULT_AVAILABILITY and DEFAULT_LOCATIONS
+    availability: Optional[Mapping[str, Tuple[str, ...]]] = _setting(_availability)
+    locations: Optional[Mapping[str, str]] = _setting(_locations)
+    horizon_days: int = _setting(_integer, minimum=1)
+    slot_step_minutes: int = _setting(_integer, minimum=1)
+    max_slots: int = _setting(_integer, minimum=1)
+    generate_notes: bool = _setting(_flag)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CacheSettings:
+    persist: bool = _setting(_flag)
+    ttl_seconds: float = _setting(_number, minimum=0)
+    max_entries: int = _setting(_integer, minimum=1)
+    max_disk_bytes: int = _setting(_integer, minimum=0)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SearchSettings:
+    backend: str = _setting(_text, choices=SEARCH_BACKENDS)
+    persist: bool = _setting(_flag)
+    top_k: int = _setting(_integer, minimum=1)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class LLMSettings:
+    provider: str = _setting(_text)
+    model: str = _setting(_text)
+    temperature: float = _setting(_number, minimum=0)
+    max_tokens: int = _setting(_integer, minimum=1)
+    context_budget: int = _setting(_integer, minimum=1)
+    structured_output: str = _setting(_text, choices=STRUCTURED_OUTPUT_MODES)
+    timeout_seconds: float = _setting(_positive_number)
+    max_retries: int = _setting(_integer, minimum=0)
+    backoff_base_seconds: float = _setting(_positive_number)
+    backoff_max_seconds: float = _setting(_positive_number)
+    circuit_failure_threshold: int = _setting(_integer, minimum=1)
+    circuit_reset_seconds: float = _setting(_positive_number)
+    requests_per_minute: float = _setting(_number, minimum=0)
+    tokens_per_minute: float = _setting(_number, minimum=0)
+    max_in_flight: int = _setting(_integer, minimum=0)
+
+
+_SECTIONS = {
+    "persona": PersonaSettings,
+    "conversation": ConversationSettings,
+    "matching": MatchingSettings,
+    "startup_ideas": StartupIdeasSettings,
+    "negotiation": NegotiationSettings,
+    "scheduling": SchedulingSettings,
+    "cache": CacheSettings,
+    "search": SearchSettings,
+    "llm": LLMSettings,
+}
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Typed, read-only view of a loaded config, checked once when it loads.
+    Handlers read values as attributes (e.g. `settings.llm.model`) instead of
+    looking them up in nested dicts, and as nothing can modify it, one instance
+    is safely shared by every request until a reload replaces it.
+    """
+
+    persona: PersonaSettings
+    conversation: ConversationSettings
+    matching: MatchingSettings
+    startup_ideas: StartupIdeasSettings
+    negotiation: NegotiationSettings
+    scheduling: SchedulingSettings
+    cache: CacheSettings
+    search: SearchSettings
+    llm: LLMSettings
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "Settings":
+        """
+        Build the settings from a merged config dict (defaults, YAML and environment).
+
+        Raises:
+            SettingsError: Listing every invalid value
+        """
+        errors: List[str] = []
+        sections = {}
+        for section, section_cls in _SECTIONS.items():
+            sections[section] = _build(section_cls, section, config.get(section, {}), errors)
+        if errors:
+            raise SettingsError("Invalid configuration:\n  " + "\n  ".join(errors))
+        return cls(**sections)
@@ -0,0 +1,171 @@
+import re
+import json
+from typing import Any, Callable, Dict, Optional
+
+_decoder = json.JSONDecoder()
+
+# Positions where a JSON object or array may start
+_VALUE_START = re.compile(r"[\[{]")
+
+# Returned by _accept when a value is rejected, since null is a valid JSON value
+_REJECTED = object()
+
+
+def _scored_list(score_key: str) -> Dict[str, Any]:
+    return {
+        "type": "array",
+        # An empty list is not a usable generation, so it is not cached
+        "minItems": 1,
+        "items": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                score_key: {"type": "number"},
+                "details": {"type": "string"},
+            },
+            "required": ["name", score_key],
+        },
+    }
+
+
+_GOAL_LIST = {"type": "array", "items": {"type": "string"}}
+
+# JSON schemas of the structured replies, sent to the model and checked locally
+OUTPUT_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "interests": _scored_list("score"),
+    "skills": _scored_list("level"),
+    "goals": {
+        "type": "object",
+        "properties": {"short_term": _GOAL_LIST, "medium_term": _GOAL_LIST, "long_term": _GOAL_LIST},
+        "required": ["short_term", "medium_term", "long_term"],
+    },
+}
+OUTPUT_SCHEMAS["profile"] = {
+    "type": "object",
+    "properties": {section: OUTPUT_SCHEMAS[section] for section in ("interests", "skills", "goals")},
+}
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+}
+
+
+def matches(value: Any, schema: Dict[str, Any]) -> bool:
+    """
+    Check a value against a JSON schema.
+    Supports the subset used by OUTPUT_SCHEMAS: type, properties, required, items and minItems.
+    """
+    expected = schema.get("type")
+    if expected is not None:
+        if not isinstance(value, _TYPES[expected]):
+            return False
+        # bool is an int subclass, but not a JSON number
+        if isinstance(value, bool) and expected != "boolean":
+            return False
+
+    if isinstance(value, dict):
+        if any(key not in value for key in schema.get("required", [])):
+            return False
+        return all(
+            matches(value[key], subschema)
+            for key, subschema in schema.get("properties", {}).items()
+            if key in value
+        )
+    if isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            return False
+        return all(matches(item, schema["items"]) for item in value) if "items" in schema else True
+    return True
+
+
+def schema_validator(name: str) -> Callable[[Any], bool]:
+    """A validator for one of the OUTPUT_SCHEMAS."""
+    schema = OUTPUT_SCHEMAS[name]
+    return lambda value: matches(value, schema)
+
+
+def response_format(name: str, mode: str) -> Optional[Dict[str, Any]]:
+    """
+    The `response_format` asking the model for a reply matching one of the OUTPUT_SCHEMAS.
+
+    Args:
+        name: Schema name
+        mode: "json_schema" for schema-constrained output, "json_object" for JSON mode, "off" for neither
+
+    Returns:
+        The response_format argument, or None when structured output is off
+    """
+    if mode == "json_schema":
+        schema = OUTPUT_SCHEMAS[name]
+        if schema["type"] != "object":
+            # Structured outputs need an object at the top level; extract_json unwraps it
+            schema = {"type": "object", "properties": {name: schema}, "required": [name]}
+        return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": False}}
+    if mode == "json_object":
+        return {"type": "json_object"}
+    return None
+
+
+def _accept(value: Any, validator: Optional[Callable[[Any], bool]], key: Optional[str]) -> Any:
+    """The value itself or the payload it wraps if it passes the validator, else _REJECTED."""
+    if validator is None or validator(value):
+        return value
+    if isinstance(value, dict):
+        # JSON mode forces an object, so lists come back wrapped, e.g. {"interests": [...]}
+        if key is not None and key in value and validator(value[key]):
+            return value[key]
+        if len(value) == 1:
+            (inner,) = value.values()
+            if validator(inner):
+                return inner
+    return _REJECTED
+
+
+def extract_json(
+    text: str, validator: Optional[Callable[[Any], bool]] = None, key: Optional[str] = None
+) -> Any:
+    """
+    Get the first valid JSON value out of a model reply.
+    Clean JSON is parsed directly; otherwise the reply is scanned for an object or
+    array, so code fences and sentences around the JSON are skipped.
+
+    Args:
+        text: The model reply
+        validator: Optional check a value must pass to be returned
+        key: Name of the payload when it may come wrapped in an object
+
+    Returns:
+        The parsed value
+
+    Raises:
+        ValueError: If the reply contains no JSON value passing the validator
+    """
+    try:
+        value = json.loads(text)
+    except ValueError:
+        pass
+    else:
+        accepted = _accept(value, validator, key)
+        if accepted is not _REJECTED:
+            return accepted
+
+    position = 0
+    while True:
+        match = _VALUE_START.search(text, position)
+        if match is None:
+            raise ValueError("No valid JSON value found in the response")
+        try:
+            value, end = _decoder.raw_decode(text, match.start())
+        except ValueError:
+            position = match.start() + 1
+            continue
+        accepted = _accept(value, validator, key)
+        if accepted is not _REJECTED:
+            return accepted
+        # Skip the whole value; a nested one would not be what the prompt asked for
+        position = end
@@ -0,0 +1,89 @@
+import os
+import time
+
+import cache as cache_module
+from cache import GenerationCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_key_is_stable_and_order_independent():
+    assert GenerationCache.make_key(section="skills", model="gpt-4") == GenerationCache.make_key(
+        model="gpt-4", section="skills"
+    )
+    assert GenerationCache.make_key(section="skills") != GenerationCache.make_key(section="interests")
+
+
+def test_entries_survive_a_restart(tmp_path):
+    GenerationCache(str(tmp_path)).set("key", {"skills": ["design"]})
+    assert GenerationCache(str(tmp_path)).get("key") == {"skills": ["design"]}
+
+
+def test_memory_only_cache_writes_nothing(tmp_path):
+    cache = GenerationCache()
+    cache.set("key", 1)
+    assert cache.get("key") == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_expired_entries_are_dropped_from_both_layers(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    cache = GenerationCache(str(tmp_path), ttl_seconds=60)
+    cache.set("key", "value")
+
+    clock.now += 59
+    assert cache.get("key") == "value"
+    clock.now += 2
+    assert cache.get("key") is None
+    assert not (tmp_path / "key.json").exists()
+
+
+def test_memory_keeps_the_most_recently_used_entries():
+    cache = GenerationCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_memory_eviction_falls_back_to_disk(tmp_path):
+    cache = GenerationCache(str(tmp_path), max_entries=1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+
+def test_disk_is_trimmed_to_its_size_limit_oldest_first(tmp_path):
+    cache = GenerationCache(str(tmp_path), max_disk_bytes=200)
+    # About 85 bytes per entry, so two fit
+    now = time.time()
+    for age, key in [(30, "a"), (20, "b"), (10, "c")]:
+        cache.set(key, "x" * 40)
+        os.utime(tmp_path / f"{key}.json", (now - age, now - age))
+    cache.set("d", "x" * 40)
+    assert sorted(os.listdir(tmp_path)) == ["c.json", "d.json"]
+
+
+def test_unreadable_entries_are_discarded(tmp_path):
+    (tmp_path / "key.json").write_text("{not json")
+    assert GenerationCache(str(tmp_path)).get("key") is None
+    assert not (tmp_path / "key.json").exists()
+
+
+def test_clear_removes_entries_from_both_layers(tmp_path):
+    cache = GenerationCache(str(tmp_path))
+    cache.set("a", 1)
+    GenerationCache(str(tmp_path)).set("b", 2)
+    cache.clear()
+    assert cache.get("a") is None and cache.get("b") is None
+    assert os.listdir(tmp_path) == []
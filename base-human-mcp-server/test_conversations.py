@@ -0,0 +1,89 @@
+import asyncio
+import itertools
+
+import conversations as conversations_module
+from conversations import ConversationStore
+
+
+def record(store, conversation_id, *messages, **kwargs):
+    turns = [("Visitor", message) for message in messages]
+    return asyncio.run(store.record(conversation_id, turns, **kwargs))
+
+
+def test_old_turns_slide_out_of_the_window_to_be_summarized():
+    store = ConversationStore(max_history=2)
+    conversation = record(store, "c1", "one", "two", "three")
+
+    assert [turn["message"] for turn in conversation["turns"]] == ["two", "three"]
+    assert [turn["message"] for turn in conversation["unsummarized"]] == ["one"]
+    assert conversation["message_count"] == 3
+
+
+def test_a_per_call_window_overrides_the_default():
+    store = ConversationStore(max_history=10)
+    conversation = record(store, "c1", "one", "two", "three", max_history=1)
+    assert [turn["message"] for turn in conversation["turns"]] == ["three"]
+
+
+def test_caller_history_seeds_only_a_new_conversation():
+    store = ConversationStore()
+    history = [{"sender": "Ann", "message": "earlier"}]
+    record(store, "c1", "now", history=history)
+    conversation = record(store, "c1", "later", history=history)
+    assert [turn["message"] for turn in conversation["turns"]] == ["earlier", "now", "later"]
+
+
+def test_history_lines_put_the_summary_first():
+    store = ConversationStore(max_history=1)
+    record(store, "c1", "one", "two")
+    asyncio.run(store.set_summary("c1", "They said one.", [{"sender": "Visitor", "message": "one"}]))
+    assert store.history_lines("c1") == ["Summary of earlier conversation: They said one.", "Visitor: two"]
+
+
+def test_history_lines_fall_back_to_caller_history_for_an_unknown_conversation():
+    store = ConversationStore(max_history=1)
+    history = [{"sender": "Ann", "message": "first"}, {"sender": "Ben", "message": "second"}]
+    assert store.history_lines("new", history) == ["Ben: second"]
+    assert store.get("new")["message_count"] == 0
+
+
+def test_set_summary_refuses_turns_that_are_no_longer_waiting():
+    store = ConversationStore(max_history=1)
+    record(store, "c1", "one", "two")
+    folded = [{"sender": "Visitor", "message": "one"}]
+    assert asyncio.run(store.set_summary("c1", "first summary", folded))
+    # Already folded in, e.g. by another process
+    assert not asyncio.run(store.set_summary("c1", "second summary", folded))
+    assert store.get("c1")["summary"] == "first summary"
+
+
+def test_the_least_recently_updated_conversations_are_dropped(monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(conversations_module.time, "time", lambda: next(clock))
+    store = ConversationStore(max_conversations=2)
+    record(store, "a", "hi")
+    record(store, "b", "hi")
+    record(store, "a", "again")
+    record(store, "c", "hi")
+    assert set(store.conversations) == {"a", "c"}
+
+
+def test_conversations_persist_and_other_stores_see_saves(tmp_path):
+    path = str(tmp_path / "conversations.json")
+    first = ConversationStore(path)
+    second = ConversationStore(path)
+    record(first, "c1", "hello")
+    # The second store reloads the file the first one saved
+    conversation = record(second, "c1", "hi back")
+    assert conversation["message_count"] == 2
+    assert ConversationStore(path).get("c1")["message_count"] == 2
+
+
+def test_an_unreadable_file_starts_empty(tmp_path, capsys):
+    path = tmp_path / "conversations.json"
+    path.write_text("{broken")
+    store = ConversationStore(str(path))
+    assert store.conversations == {}
+    assert "Could not load conversations" in capsys.readouterr().out
+    record(store, "c1", "hello")
+    assert ConversationStore(str(path)).get("c1")["message_count"] == 1
@@ -0,0 +1,58 @@
+import os
+
+import data_files as data_files_module
+from data_files import DataFiles
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_a_file_is_parsed_once_until_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "interests.json"
+    write(path, '{"interests": []}', 1_000_000_000)
+    files = DataFiles()
+    reads = []
+    load = data_files_module.json.load
+    monkeypatch.setattr(data_files_module.json, "load", lambda f: reads.append(f.name) or load(f))
+
+    assert files.load(str(path)) == {"interests": []}
+    assert files.load(str(path)) == {"interests": []}
+    assert len(reads) == 1
+
+    write(path, '{"interests": [1]}', 2_000_000_000)
+    assert files.load(str(path)) == {"interests": [1]}
+    assert len(reads) == 2
+
+
+def test_a_missing_file_is_none(tmp_path):
+    assert DataFiles().load(str(tmp_path / "missing.json")) is None
+
+
+def test_a_deleted_file_is_forgotten(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text("[]")
+    files = DataFiles()
+    assert files.load(str(path)) == []
+    path.unlink()
+    assert files.load(str(path)) is None
+
+
+def test_an_unreadable_file_is_reported_once(tmp_path, capsys):
+    path = tmp_path / "goals.json"
+    write(path, "{broken", 1_000_000_000)
+    files = DataFiles()
+    assert files.load(str(path)) is None
+    assert files.load(str(path)) is None
+    assert capsys.readouterr().out.count("Error reading") == 1
+
+    write(path, '{"short_term": []}', 2_000_000_000)
+    assert files.load(str(path)) == {"short_term": []}
+
+
+def test_contents_failing_the_validator_are_ignored(tmp_path, capsys):
+    path = tmp_path / "interests.json"
+    path.write_text('["not", "a", "dict"]')
+    assert DataFiles().load(str(path), validator=lambda value: isinstance(value, dict)) is None
+    assert "do not have the expected format" in capsys.readouterr().out
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import asyncio
+import subprocess
+
+import pytest
+
+import locking
+from locking import FileLock, file_signature
+
+HOLD_LOCK = """
+import fcntl, sys, time
+with open(sys.argv[1] + ".lock", "a") as f:
+    fcntl.flock(f, fcntl.LOCK_EX)
+    print("locked", flush=True)
+    time.sleep(float(sys.argv[2]))
+"""
+
+needs_flock = pytest.mark.skipif(locking.fcntl is None, reason="flock is not available")
+
+
+@needs_flock
+def test_waits_for_another_process_without_blocking_the_loop(tmp_path):
+    path = str(tmp_path / "store.json")
+    holder = subprocess.Popen([sys.executable, "-c", HOLD_LOCK, path, "0.3"], stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def run():
+            ticker = asyncio.ensure_future(tick())
+            started = time.monotonic()
+            async with FileLock(path):
+                waited = time.monotonic() - started
+            ticker.cancel()
+            return waited
+
+        waited = asyncio.run(asyncio.wait_for(run(), 5))
+        assert waited >= 0.1
+        assert ticks >= 5
+    finally:
+        holder.kill()
+        holder.wait()
+
+
+@needs_flock
+def test_callers_in_one_process_take_turns(tmp_path):
+    lock = FileLock(str(tmp_path / "store.json"))
+    inside = 0
+    peak = 0
+
+    async def work():
+        nonlocal inside, peak
+        async with lock:
+            inside += 1
+            peak = max(peak, inside)
+            await asyncio.sleep(0.01)
+            inside -= 1
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(5)))
+
+    asyncio.run(run())
+    assert peak == 1
+    assert os.path.exists(tmp_path / "store.json.lock")
+
+
+@needs_flock
+def test_the_lock_is_released_when_the_block_raises(tmp_path):
+    lock = FileLock(str(tmp_path / "store.json"))
+
+    async def run():
+        with pytest.raises(KeyError):
+            async with lock:
+                raise KeyError("boom")
+        async with lock:
+            return True
+
+    assert asyncio.run(asyncio.wait_for(run(), 1))
+
+
+def test_a_lock_without_a_path_does_nothing(tmp_path):
+    async def run():
+        async with FileLock(None):
+            return True
+
+    assert asyncio.run(run())
+    assert os.listdir(tmp_path) == []
+
+
+def test_file_signature_changes_when_the_file_is_replaced(tmp_path):
+    path = tmp_path / "store.json"
+    assert file_signature(str(path)) is None
+    assert file_signature(None) is None
+
+    path.write_text("{}")
+    before = file_signature(str(path))
+    assert before == file_signature(str(path))
+
+    replacement = tmp_path / "store.json.tmp"
+    replacement.write_text("{}")
+    os.replace(replacement, path)
+    assert file_signature(str(path)) != before
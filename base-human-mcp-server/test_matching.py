@@ -0,0 +1,114 @@
+import asyncio
+
+import numpy as np
+
+from matching import facet_items, idea_inputs, rank_matches
+
+TOPICS = ["climbing", "chess", "swift", "design", "startups", "python"]
+
+
+class TopicEmbedder:
+    """Embeds a text as the unit vector of the first topic it mentions."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    async def embed(self, texts):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("embeddings unavailable")
+        vectors = np.zeros((len(texts), len(TOPICS)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for column, topic in enumerate(TOPICS):
+                if topic in text.lower():
+                    vectors[row, column] = 1.0
+                    break
+        return vectors
+
+
+def person(id, interests=(), skills=(), goals=None):
+    return {
+        "id": id,
+        "name": id.title(),
+        "interests": [{"name": name, "score": 0.8} for name in interests],
+        "skills": [{"name": name, "level": level} for name, level in skills],
+        "goals": goals or {},
+    }
+
+
+WEIGHTS = {"interest": 0.5, "skill": 0.3, "goal": 0.2}
+
+
+def test_facet_items_weight_by_score_level_or_equally():
+    profile = {
+        "interests": [{"name": "Chess", "score": 0.4, "details": "blitz"}, {"details": "no name"}],
+        "skills": [{"name": "Swift", "level": 0.9}],
+        "goals": {"short_term": ["Ship an app"], "long_term": "not a list"},
+    }
+    assert facet_items(profile, "interests") == [("Chess: blitz", 0.4)]
+    assert facet_items(profile, "skills") == [("Swift", 0.9)]
+    assert facet_items(profile, "goals") == [("Ship an app", 1.0)]
+    assert facet_items({"goals": ["not", "a", "dict"]}, "goals") == []
+
+
+def test_rank_matches_orders_candidates_by_weighted_similarity():
+    me = person("me", ["Climbing"], [("Swift", 0.9)], {"short_term": ["Join startups"]})
+    candidates = [
+        person("stranger", ["Chess"], [("Python", 0.5)]),
+        person("twin", ["Climbing"], [("Swift", 0.5)], {"long_term": ["Found startups"]}),
+        person("climber", ["Climbing"], [("Design", 0.5)]),
+    ]
+    embedder = TopicEmbedder()
+
+    matches = asyncio.run(rank_matches(embedder, me, candidates, WEIGHTS, top_k=5))
+
+    assert [match["id"] for match in matches] == ["twin", "climber", "stranger"]
+    assert matches[0]["score"] == 1.0
+    assert matches[1]["scores"] == {"interest": 1.0, "skill": 0.0, "goal": 0.0}
+    assert matches[2]["score"] == 0.0
+    # Every text of every profile is embedded in one request
+    assert embedder.calls == 1
+
+
+def test_rank_matches_applies_top_k_and_threshold():
+    me = person("me", ["Climbing"], [("Swift", 0.9)])
+    candidates = [
+        person("stranger", ["Chess"]),
+        person("climber", ["Climbing"]),
+        person("twin", ["Climbing"], [("Swift", 1)]),
+    ]
+
+    top = asyncio.run(rank_matches(TopicEmbedder(), me, candidates, WEIGHTS, top_k=1))
+    assert [match["id"] for match in top] == ["twin"]
+
+    close = asyncio.run(rank_matches(TopicEmbedder(), me, candidates, WEIGHTS, threshold=0.1))
+    assert [match["id"] for match in close] == ["twin", "climber"]
+
+
+def test_rank_matches_with_no_candidates_does_not_embed():
+    embedder = TopicEmbedder()
+    assert asyncio.run(rank_matches(embedder, person("me"), [], WEIGHTS)) == []
+    assert embedder.calls == 0
+
+
+def test_idea_inputs_find_shared_interests_and_complementary_skills():
+    me = person("me", ["Climbing", "Chess"], [("Swift", 0.9), ("Python", 0.4)])
+    partner = person("partner", ["Climbing outdoors"], [("Swift", 0.8), ("Design", 0.7)])
+
+    [ideas] = asyncio.run(idea_inputs(TopicEmbedder(), me, [partner]))
+
+    assert ideas["shared_interests"] == ["Climbing"]
+    assert ideas["my_skills"] == ["Swift", "Python"]
+    assert ideas["their_skills"] == ["Design"]
+
+
+def test_idea_inputs_fall_back_to_exact_names_when_embedding_fails():
+    me = person("me", ["Climbing"], [("Swift", 0.9)])
+    partner = person("partner", ["climbing", "Climbing outdoors"], [("swift", 0.8)])
+
+    [ideas] = asyncio.run(idea_inputs(TopicEmbedder(fail=True), me, [partner]))
+
+    assert ideas["shared_interests"] == ["Climbing"]
+    # The partner has nothing the profile lacks, so their strongest skills are listed
+    assert ideas["their_skills"] == ["swift"]
@@ -0,0 +1,51 @@
+from metrics import MetricsRegistry, SharedMetrics
+
+
+def make_registry():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ("tool",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("tool",), buckets=(0.1, 1.0))
+    return registry, calls, latency
+
+
+def test_render_merged_sums_counters_and_histograms():
+    first, first_calls, first_latency = make_registry()
+    second, second_calls, second_latency = make_registry()
+    first_calls.inc(tool="converse")
+    second_calls.inc(2, tool="converse")
+    second_calls.inc(tool="negotiate")
+    first_latency.observe(0.05, tool="converse")
+    second_latency.observe(0.5, tool="converse")
+
+    lines = first.render_merged([first.snapshot(), second.snapshot()]).splitlines()
+
+    assert 'calls_total{tool="converse"} 3' in lines
+    assert 'calls_total{tool="negotiate"} 1' in lines
+    assert 'latency_seconds_bucket{tool="converse",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{tool="converse",le="1"} 2' in lines
+    assert 'latency_seconds_count{tool="converse"} 2' in lines
+    assert 'latency_seconds_sum{tool="converse"} 0.55' in lines
+
+
+def test_render_merged_leaves_the_live_registry_unchanged():
+    registry, calls, _ = make_registry()
+    calls.inc(tool="converse")
+    registry.render_merged([registry.snapshot(), registry.snapshot()])
+    assert 'calls_total{tool="converse"} 1' in registry.render().splitlines()
+
+
+def test_shared_metrics_sum_every_snapshot_in_the_directory(tmp_path):
+    registry, calls, _ = make_registry()
+    other, other_calls, _ = make_registry()
+    calls.inc(tool="converse")
+    other_calls.inc(4, tool="converse")
+    # Another worker's snapshot, as written by its own SharedMetrics
+    worker = SharedMetrics(other, str(tmp_path))
+    worker.path = str(tmp_path / "other.json")
+    worker.write()
+
+    shared = SharedMetrics(registry, str(tmp_path))
+    assert 'calls_total{tool="converse"} 5' in shared.render().splitlines()
+    # Values recorded since are picked up on the next scrape
+    calls.inc(tool="converse")
+    assert 'calls_total{tool="converse"} 6' in shared.render().splitlines()
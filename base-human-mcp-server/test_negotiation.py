@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from negotiation import HIRE, JOB, NegotiationStore, concession_bid, parse_amount
+
+
+@pytest.mark.parametrize(
+    "value, amount",
+    [(150000, 150000), (150000.0, 150000), (150000.5, 150000.5), ("150000", 150000), ("$150,000", 150000), (None, None)],
+)
+def test_parse_amount_reads_numbers_and_figures(value, amount):
+    parsed = parse_amount(value)
+    assert parsed == amount
+    assert type(parsed) is type(amount)
+
+
+@pytest.mark.parametrize("value", ["lots", "", True, 0, -5, float("nan"), "1e999", [150000], {"amount": 1}])
+def test_parse_amount_rejects_anything_else(value):
+    with pytest.raises(ValueError, match="Invalid salary amount"):
+        parse_amount(value)
+
+
+def test_concession_bid_runs_from_opening_to_limit():
+    assert concession_bid(100000, 150000, 0, 6, 0.5) == 100000
+    assert concession_bid(100000, 150000, 5, 6, 0.5) == 150000
+    # Rounds past the last one stay at the limit
+    assert concession_bid(100000, 150000, 9, 6, 0.5) == 150000
+
+
+def test_concession_bid_curve_shape():
+    holding_out = concession_bid(100000, 150000, 2, 5, 0.5)
+    linear = concession_bid(100000, 150000, 2, 5, 1.0)
+    conceding = concession_bid(100000, 150000, 2, 5, 2.0)
+    assert holding_out < linear == 125000 < conceding
+
+
+def test_concession_bid_moves_down_for_the_candidate():
+    assert concession_bid(200000, 140000, 1, 3, 1.0) == 170000
+
+
+def play(store, session_id, offers, max_rounds=4):
+    async def run():
+        return [
+            await store.respond(session_id, offer, max_rounds=max_rounds, concession=1.0, round_to=1000)
+            for offer in offers
+        ]
+
+    return asyncio.run(run())
+
+
+def test_respond_makes_a_final_offer_then_walks_away():
+    store = NegotiationStore()
+    asyncio.run(store.start("s", HIRE, 100000, 150000))
+
+    rounds = play(store, "s", [200000] * 6)
+
+    assert [r["action"] for r in rounds[:5]] == ["counter", "counter", "counter", "final_offer", "walk_away"]
+    assert [r["offer"] for r in rounds[:5]] == [100000, 117000, 133000, 150000, 150000]
+    assert rounds[3]["status"] == "open"
+    assert rounds[4]["status"] == "ended"
+    # A settled session keeps its outcome
+    assert rounds[5]["action"] == "walk_away"
+    assert rounds[5]["round"] == 5
+    assert len(store.get("s")["rounds"]) == 5
+
+
+def test_respond_accepts_an_offer_at_least_as_good_as_our_bid():
+    store = NegotiationStore()
+    asyncio.run(store.start("s", JOB, 140000, 200000))
+
+    first, second = play(store, "s", [150000, 190000])
+
+    assert first["action"] == "counter"
+    assert first["offer"] == 200000
+    assert second["action"] == "accept"
+    assert second["offer"] == 190000
+    assert second["status"] == "agreed"
+
+
+def test_respond_accepts_on_the_final_round():
+    store = NegotiationStore()
+    asyncio.run(store.start("s", HIRE, 100000, 150000))
+
+    rounds = play(store, "s", [160000, 160000, 160000, 150000])
+
+    assert rounds[3]["action"] == "accept"
+    assert rounds[3]["status"] == "agreed"
+
+
+def test_respond_continues_the_schedule_after_past_rounds():
+    store = NegotiationStore()
+    # Rounds held elsewhere put the schedule past the final offer already
+    asyncio.run(store.start("s", HIRE, 100000, 150000, past_rounds=4))
+
+    (decision,) = play(store, "s", [None])
+
+    assert decision["action"] == "walk_away"
+    assert decision["offer"] == 150000
+
+
+def test_offers_are_rounded_and_kept_in_range():
+    store = NegotiationStore()
+    asyncio.run(store.start("s", HIRE, 100500, 149500))
+
+    rounds = play(store, "s", [None, None, None], max_rounds=5)
+
+    for decision in rounds:
+        assert 100500 <= decision["offer"] <= 149500
+    assert rounds[1]["offer"] % 1000 == 0
+
+
+@pytest.mark.parametrize("kept", [1, 2])
+def test_start_drops_the_least_recently_updated_sessions(kept):
+    store = NegotiationStore(max_sessions=kept)
+    for session_id in ["a", "b", "c"]:
+        asyncio.run(store.start(session_id, HIRE, 100000, 150000))
+    assert sorted(store.sessions) == ["a", "b", "c"][-kept:]
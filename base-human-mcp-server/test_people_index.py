@@ -0,0 +1,105 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from people_index import PeopleIndex, item_text
+
+DIMENSIONS = 4
+
+
+def unit(*weights):
+    vector = np.array(weights + (0.0,) * (DIMENSIONS - len(weights)), dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def items(*names):
+    return [{"name": name} for name in names]
+
+
+@pytest.fixture
+def index():
+    index = PeopleIndex(None, model="test-model")
+    index.upsert("ann", "Ann", "interests", items("Climbing", "Chess"), np.stack([unit(1), unit(0, 1)]))
+    index.upsert("ben", "Ben", "interests", items("Climbing gyms"), np.stack([unit(1, 0.2)]))
+    index.upsert("ben", "Ben", "skills", items("Swift"), np.stack([unit(0, 0, 1)]))
+    return index
+
+
+def test_item_text_adds_details_or_description():
+    assert item_text({"name": "Swift"}) == "Swift"
+    assert item_text({"name": "Swift", "details": "iOS apps"}) == "Swift: iOS apps"
+    assert item_text({"name": "Mentoring", "description": "weekly calls"}) == "Mentoring: weekly calls"
+
+
+def test_search_ranks_people_by_their_best_item(index):
+    results = index.search(np.stack([unit(1)]))
+
+    assert [person["id"] for person in results] == ["ann", "ben"]
+    assert results[0]["name"] == "Ann"
+    assert results[0]["score"] == 1.0
+    assert results[0]["items"] == [{"section": "interests", "name": "Climbing", "similarity": 1.0}]
+
+
+def test_search_favours_people_matching_every_query(index):
+    # Ann has both climbing and chess, Ben only something close to climbing
+    results = index.search(np.stack([unit(1), unit(0, 1)]))
+    assert results[0]["id"] == "ann"
+    assert len(results[0]["items"]) == 2
+
+
+def test_search_filters_by_section_and_excluded_people(index):
+    assert [person["id"] for person in index.search(np.stack([unit(1)]), sections=["skills"])] == ["ben"]
+    assert [person["id"] for person in index.search(np.stack([unit(1)]), exclude={"ann"})] == ["ben"]
+    assert index.search(np.stack([unit(1)]), top_k=1)[0]["id"] == "ann"
+
+
+def test_upsert_replaces_a_section_and_reuses_rows(index):
+    index.upsert("ann", "Ann", "interests", items("Painting"), np.stack([unit(0, 0, 0, 1)]))
+    assert index.section_texts("ann", "interests") == ["Painting"]
+    assert len(index) == 3
+    assert [person["id"] for person in index.search(np.stack([unit(1)]))] == ["ben", "ann"]
+
+
+def test_remove_drops_a_person(index):
+    index.remove("ben")
+    assert "ben" not in index
+    assert index.people == ["ann"]
+    assert [person["id"] for person in index.search(np.stack([unit(1)]))] == ["ann"]
+
+
+def test_an_empty_section_is_still_recorded():
+    index = PeopleIndex(None, model="test-model")
+    index.upsert("ann", "Ann", "services", [], np.zeros((0, DIMENSIONS), dtype=np.float32))
+    assert index.has_section("ann", "services")
+    assert not index.has_section("ann", "skills")
+
+
+def test_vectors_of_another_size_are_rejected(index):
+    with pytest.raises(ValueError, match="dimensions"):
+        index.upsert("cat", "Cat", "skills", items("Go"), np.ones((1, DIMENSIONS + 1), dtype=np.float32))
+
+
+def test_a_saved_index_loads_memory_mapped(tmp_path):
+    saved = PeopleIndex(str(tmp_path), model="test-model")
+    saved.upsert("ann", "Ann", "interests", items("Climbing"), np.stack([unit(1)]))
+    saved.upsert("ben", "Ben", "skills", items("Swift"), np.stack([unit(0, 0, 1)]))
+    asyncio.run(saved.save())
+
+    loaded = PeopleIndex(str(tmp_path), model="test-model")
+    assert isinstance(loaded._matrix, np.memmap)
+    assert loaded.people == ["ann", "ben"]
+    assert loaded.section_texts("ben", "skills") == ["Swift"]
+    assert loaded.search(np.stack([unit(0, 0, 1)]))[0]["name"] == "Ben"
+    # The first write copies the read-only mapping
+    loaded.upsert("cat", "Cat", "skills", items("Go"), np.stack([unit(0, 0, 0, 1)]))
+    assert loaded.search(np.stack([unit(0, 0, 0, 1)]))[0]["id"] == "cat"
+
+
+def test_an_index_for_another_model_is_ignored(tmp_path, capsys):
+    saved = PeopleIndex(str(tmp_path), model="old-model")
+    saved.upsert("ann", "Ann", "skills", items("Swift"), np.stack([unit(1)]))
+    asyncio.run(saved.save())
+
+    assert len(PeopleIndex(str(tmp_path), model="test-model")) == 0
+    assert "another embedding model" in capsys.readouterr().out
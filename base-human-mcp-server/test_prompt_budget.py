@@ -0,0 +1,59 @@
+import pytest
+
+import prompt_budget
+from prompt_budget import PromptBudget, compact_json, count_tokens
+
+
+@pytest.fixture(autouse=True)
+def character_estimate(monkeypatch):
+    # Count with the four-characters-per-token estimate whether or not tiktoken is installed
+    monkeypatch.setattr(prompt_budget, "_encoding", lambda model: None)
+
+
+def render(items):
+    return f"History:\n{items}"
+
+
+def test_count_tokens_estimate_rounds_up():
+    assert count_tokens("") == 0
+    assert count_tokens("abcd") == 1
+    assert count_tokens("abcde") == 2
+
+
+def test_compact_json_has_no_whitespace():
+    assert compact_json({"a": [1, 2], "b": None}) == '{"a":[1,2],"b":null}'
+
+
+def test_everything_is_kept_when_it_fits():
+    budget = PromptBudget(context_budget=100)
+    prompt, dropped = budget.fit(render, ["one", "two"])
+    assert prompt == "History:\none\ntwo"
+    assert dropped == 0
+
+
+def test_the_oldest_items_are_dropped_first():
+    # The empty prompt costs 3 tokens and each 8-character item 2 plus a separator
+    budget = PromptBudget(context_budget=9)
+    prompt, dropped = budget.fit(render, ["aaaaaaaa", "bbbbbbbb", "cccccccc"])
+    assert prompt == "History:\nbbbbbbbb\ncccccccc"
+    assert dropped == 3
+
+
+def test_an_item_is_not_kept_once_a_newer_one_was_dropped():
+    # The large middle item does not fit, so the small oldest one goes too and no gap is left
+    budget = PromptBudget(context_budget=10)
+    prompt, dropped = budget.fit(render, ["a", "x" * 40, "cccccccc"])
+    assert prompt == "History:\ncccccccc"
+    assert dropped == 11 + 2
+
+
+def test_reserved_tokens_come_out_of_the_budget():
+    items = ["aaaaaaaa", "bbbbbbbb"]
+    assert PromptBudget(context_budget=9).fit(render, items)[1] == 0
+    assert PromptBudget(context_budget=9, reserved_tokens=3).fit(render, items)[1] == 3
+
+
+def test_a_custom_join_is_used():
+    budget = PromptBudget(context_budget=100)
+    prompt, _ = budget.fit(render, ["one", "two"], join=" | ".join)
+    assert prompt == "History:\none | two"
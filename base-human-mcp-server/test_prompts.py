@@ -0,0 +1,60 @@
+import re
+
+import pytest
+
+from prompts import PromptTemplate, TemplateError, compile_template, compile_templates
+
+
+def test_render_matches_str_format():
+    source = "You are {name}. {count!r} items, {ratio:.2f} done, {{literal}}"
+    template = PromptTemplate(source, "test")
+    values = {"name": "Hope", "count": 3, "ratio": 0.5}
+    assert template.render(**values) == source.format(**values)
+    assert template.variables == {"name", "count", "ratio"}
+
+
+def test_render_raises_for_a_missing_value():
+    with pytest.raises(KeyError):
+        PromptTemplate("Hi {name}", "test").render()
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("Hello {nmae}", "unknown placeholder {nmae}"),
+        ("Hello {name", "conversation.prompt_template"),
+        ("Hello name}", "conversation.prompt_template"),
+        ("Hello {persona.name}", "is not supported"),
+        ("Hello {history[0]}", "is not supported"),
+        ("Hello {0}", "is not supported"),
+        ("Hello {}", "is not supported"),
+        ("Hello {name:{style}}", "nested placeholders"),
+    ],
+)
+def test_bad_placeholders_are_rejected_at_compile_time(source, message):
+    with pytest.raises(TemplateError, match=re.escape(message)):
+        compile_template(source, "conversation", "prompt_template")
+
+
+def test_unknown_placeholder_error_lists_the_available_names():
+    with pytest.raises(TemplateError) as error:
+        compile_template("{name} {mood}", "conversation", "summary_prompt")
+    assert "{messages}, {name}, {summary}" in str(error.value)
+
+
+def test_template_error_is_a_value_error():
+    assert issubclass(TemplateError, ValueError)
+
+
+def test_compile_templates_finds_every_prompt_key():
+    config = {
+        "conversation": {"prompt_template": "{name}: {message}", "summary_prompt": "{summary}", "max_history": 5},
+        "paths": {"conversation_file": "data/conversations.json"},
+    }
+    templates = compile_templates(config)
+    assert set(templates) == {("conversation", "prompt_template"), ("conversation", "summary_prompt")}
+
+
+def test_compile_templates_reports_the_bad_template():
+    with pytest.raises(TemplateError, match=r"social\.invitation_prompt"):
+        compile_templates({"social": {"invitation_prompt": "Join {user} at {time}"}})
@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+import resilience
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    waits = []
+
+    async def sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(resilience.asyncio, "sleep", sleep)
+    return waits
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_breaker_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    open_breaker(breaker)
+
+    clock.now += 29
+    assert breaker.state == "open"
+    clock.now += 1
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    open_breaker(breaker)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_the_breaker_for_another_wait(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_seconds=30)
+    open_breaker(breaker)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_released_probe_can_be_retried(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    open_breaker(breaker)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+
+
+def failing(errors, result="ok"):
+    calls = []
+
+    async def attempt():
+        calls.append(len(calls))
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return attempt, calls
+
+
+def test_retry_policy_retries_transient_errors(clock, no_sleep):
+    policy = RetryPolicy(CircuitBreaker(), max_retries=3, backoff_base_seconds=0.5, backoff_max_seconds=8)
+    attempt, calls = failing([asyncio.TimeoutError(), asyncio.TimeoutError()])
+
+    assert asyncio.run(policy.run(attempt)) == "ok"
+    assert len(calls) == 3
+    assert len(no_sleep) == 2
+    assert 0 <= no_sleep[0] <= 0.5 and 0 <= no_sleep[1] <= 1.0
+
+
+def test_retry_policy_gives_up_and_counts_one_failure(clock, no_sleep):
+    breaker = CircuitBreaker(failure_threshold=2)
+    policy = RetryPolicy(breaker, max_retries=2)
+    attempt, calls = failing([asyncio.TimeoutError()] * 5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(policy.run(attempt))
+    assert len(calls) == 3
+    assert breaker.state == "closed"
+
+
+def test_retry_policy_does_not_retry_other_errors(clock, no_sleep):
+    breaker = CircuitBreaker(failure_threshold=1)
+    policy = RetryPolicy(breaker, max_retries=3)
+    attempt, calls = failing([KeyError("bad request")])
+
+    with pytest.raises(KeyError):
+        asyncio.run(policy.run(attempt))
+    assert len(calls) == 1
+    # The upstream answered, so the breaker stays closed
+    assert breaker.state == "closed"
+
+
+def test_retry_policy_fails_fast_while_the_breaker_is_open(clock, no_sleep):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    open_breaker(breaker)
+    policy = RetryPolicy(breaker)
+    attempt, calls = failing([])
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(policy.run(attempt))
+    assert calls == []
+
+
+def test_retry_policy_probe_closes_the_breaker(clock, no_sleep):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    open_breaker(breaker)
+    clock.now += 30
+    policy = RetryPolicy(breaker, max_retries=1)
+    attempt, calls = failing([asyncio.TimeoutError()])
+
+    # The probe may use its retries even though the breaker is not closed
+    assert asyncio.run(policy.run(attempt)) == "ok"
+    assert len(calls) == 2
+    assert breaker.state == "closed"
+
+
+def test_backoff_honours_retry_after_up_to_the_maximum():
+    class Response:
+        def __init__(self, retry_after):
+            self.headers = {"retry-after": retry_after}
+
+    class RateLimited(Exception):
+        def __init__(self, retry_after):
+            self.response = Response(retry_after)
+
+    policy = RetryPolicy(CircuitBreaker(), backoff_max_seconds=8)
+    assert policy.backoff(0, RateLimited("3")) == 3
+    assert policy.backoff(0, RateLimited("120")) == 8
+    assert 0 <= policy.backoff(0, RateLimited("soon")) <= policy.backoff_base_seconds
@@ -0,0 +1,138 @@
+import time
+import asyncio
+
+import pytest
+
+import scheduler as scheduler_module
+from config import HumanConfig
+from scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, LLMScheduler
+
+
+def test_max_in_flight_caps_concurrent_requests():
+    scheduler = LLMScheduler(max_in_flight=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with scheduler.slot():
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert scheduler.in_flight == 0
+
+
+def test_waiters_are_admitted_by_priority_then_arrival():
+    scheduler = LLMScheduler(max_in_flight=1)
+    admitted = []
+
+    async def request(name, priority):
+        async with scheduler.slot(priority):
+            admitted.append(name)
+
+    async def run():
+        async with scheduler.slot():
+            tasks = [
+                asyncio.ensure_future(request(name, priority))
+                for name, priority in [
+                    ("summary", PRIORITY_BACKGROUND),
+                    ("profile", PRIORITY_NORMAL),
+                    ("reply 1", PRIORITY_INTERACTIVE),
+                    ("reply 2", PRIORITY_INTERACTIVE),
+                ]
+            ]
+            await asyncio.sleep(0)
+            assert scheduler.queued() == 4
+            assert scheduler.queued(PRIORITY_INTERACTIVE) == 2
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert admitted == ["reply 1", "reply 2", "profile", "summary"]
+
+
+def test_token_budget_delays_requests_until_it_refills():
+    # 100 tokens a second
+    scheduler = LLMScheduler(tokens_per_minute=6000, max_in_flight=0)
+
+    async def run():
+        async with scheduler.slot(tokens=6000):
+            pass
+        started = time.monotonic()
+        async with scheduler.slot(tokens=20):
+            return time.monotonic() - started
+
+    assert 0.15 <= asyncio.run(run()) < 1
+
+
+def test_unused_tokens_are_refunded():
+    scheduler = LLMScheduler(tokens_per_minute=6000, max_in_flight=0)
+
+    async def run():
+        async with scheduler.slot(tokens=6000) as reservation:
+            reservation.used_tokens = 0
+        started = time.monotonic()
+        async with scheduler.slot(tokens=6000):
+            return time.monotonic() - started
+
+    assert asyncio.run(run()) < 0.1
+
+
+def test_a_request_larger_than_the_budget_is_still_admitted():
+    scheduler = LLMScheduler(tokens_per_minute=1000, max_in_flight=0)
+
+    async def run():
+        async with scheduler.slot(tokens=5000) as reservation:
+            return reservation.tokens
+
+    assert asyncio.run(asyncio.wait_for(run(), 1)) == 1000
+
+
+def test_a_cancelled_waiter_does_not_keep_a_slot():
+    scheduler = LLMScheduler(max_in_flight=1)
+
+    async def run():
+        async def wait_for_slot():
+            async with scheduler.slot():
+                pass
+
+        async with scheduler.slot():
+            waiter = asyncio.ensure_future(wait_for_slot())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        async with scheduler.slot():
+            assert scheduler.in_flight == 1
+
+    asyncio.run(asyncio.wait_for(run(), 1))
+    assert scheduler.in_flight == 0
+    assert scheduler.queued() == 0
+
+
+def test_request_budgets_below_one_a_minute_still_admit(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: now[0])
+    # e.g. requests_per_minute: 1 split between two workers
+    scheduler = LLMScheduler(requests_per_minute=0.5, max_in_flight=0)
+
+    async def run():
+        async with scheduler.slot():
+            pass
+        # One request refills every two minutes
+        now[0] += 120
+        async with scheduler.slot():
+            pass
+
+    asyncio.run(asyncio.wait_for(run(), 1))
+
+
+def test_from_config_splits_the_budgets_between_processes():
+    scheduler = LLMScheduler.from_config(HumanConfig(), processes=3)
+    assert scheduler.requests_per_minute == pytest.approx(500 / 3)
+    assert scheduler.tokens_per_minute == pytest.approx(80000 / 3)
+    # Rounded up, so every process can send at least one request
+    assert scheduler.max_in_flight == 3
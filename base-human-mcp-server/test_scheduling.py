@@ -0,0 +1,108 @@
+from datetime import date, datetime
+
+import pytest
+
+from scheduling import Availability, common_free, find_slots, parse_date, subtract
+
+HOUR = 3600
+
+
+def test_subtract_removes_back_to_back_busy_intervals():
+    free = [(0, 10 * HOUR)]
+    busy = [(2 * HOUR, 3 * HOUR), (3 * HOUR, 4 * HOUR)]
+    assert subtract(free, busy) == [(0, 2 * HOUR), (4 * HOUR, 10 * HOUR)]
+
+
+def test_subtract_keeps_windows_only_touching_busy_time():
+    free = [(0, HOUR), (2 * HOUR, 3 * HOUR)]
+    busy = [(HOUR, 2 * HOUR)]
+    assert subtract(free, busy) == free
+
+
+def test_subtract_handles_overlapping_busy_intervals():
+    free = [(0, 10 * HOUR)]
+    busy = [(HOUR, 5 * HOUR), (2 * HOUR, 3 * HOUR), (4 * HOUR, 6 * HOUR)]
+    assert subtract(free, busy) == [(0, HOUR), (6 * HOUR, 10 * HOUR)]
+
+
+def test_common_free_does_not_split_back_to_back_windows():
+    calendars = [
+        [(0, 2 * HOUR), (2 * HOUR, 4 * HOUR)],
+        [(HOUR, 3 * HOUR)],
+    ]
+    assert common_free(calendars) == [(HOUR, 3 * HOUR)]
+
+
+def test_common_free_ignores_windows_that_only_touch():
+    calendars = [[(0, HOUR)], [(HOUR, 2 * HOUR)]]
+    assert common_free(calendars) == []
+
+
+def test_common_free_is_empty_when_anyone_has_no_free_time():
+    assert common_free([[(0, HOUR)], []]) == []
+    assert common_free([]) == []
+
+
+def test_find_slots_aligns_to_the_step_and_stops_at_count():
+    free = [(10 * 60, 2 * HOUR), (3 * HOUR, 5 * HOUR)]
+    slots = find_slots(free, duration=HOUR, step=30 * 60, count=3)
+    assert slots == [(30 * 60, 90 * 60), (HOUR, 2 * HOUR), (3 * HOUR, 4 * HOUR)]
+
+
+def test_find_slots_skips_windows_shorter_than_the_duration():
+    assert find_slots([(0, 30 * 60)], duration=HOUR, step=15 * 60, count=5) == []
+
+
+def test_availability_keeps_local_hours_across_daylight_saving_start():
+    # Clocks in New York go forward on Sunday 2026-03-08
+    availability = Availability("America/New_York", {"saturday": ["09:00-17:00"], "sunday": ["09:00-17:00"]})
+    start = datetime(2026, 3, 7, tzinfo=availability.zone).timestamp()
+    end = datetime(2026, 3, 9, tzinfo=availability.zone).timestamp()
+
+    intervals = availability.intervals(start, end)
+
+    assert len(intervals) == 2
+    for begin, finish in intervals:
+        assert datetime.fromtimestamp(begin, availability.zone).hour == 9
+        assert datetime.fromtimestamp(finish, availability.zone).hour == 17
+        assert finish - begin == 8 * HOUR
+    # Sunday's window starts 23 hours after Saturday's, not 24
+    assert intervals[1][0] - intervals[0][0] == 23 * HOUR
+
+
+def test_availability_keeps_local_hours_across_daylight_saving_end():
+    # Clocks in Paris go back on Sunday 2026-10-25
+    availability = Availability("Europe/Paris", {"saturday": ["09:00-10:00"], "sunday": ["09:00-10:00"]})
+    start = datetime(2026, 10, 24, tzinfo=availability.zone).timestamp()
+    end = datetime(2026, 10, 26, tzinfo=availability.zone).timestamp()
+
+    intervals = availability.intervals(start, end)
+
+    assert [datetime.fromtimestamp(begin, availability.zone).hour for begin, _ in intervals] == [9, 9]
+    assert intervals[1][0] - intervals[0][0] == 25 * HOUR
+
+
+def test_availability_accepts_a_single_window_per_day():
+    availability = Availability("UTC", {"monday": "09:00-17:00"})
+    assert len(availability.windows[0]) == 1
+
+
+@pytest.mark.parametrize(
+    "windows",
+    [["09:00-17:00"], {"monday": [9]}, {"funday": ["09:00-17:00"]}, {"monday": ["17:00-09:00"]}],
+)
+def test_availability_rejects_malformed_windows(windows):
+    with pytest.raises(ValueError):
+        Availability("UTC", windows)
+
+
+def test_parse_date_reads_optional_iso_dates():
+    assert parse_date("2026-10-20", "from_date") == date(2026, 10, 20)
+    assert parse_date(None, "from_date") is None
+    assert parse_date("", "from_date") is None
+
+
+@pytest.mark.parametrize("value", [20261020, "2026-13-01", "tomorrow", ["2026-10-20"]])
+def test_parse_date_names_the_field_for_bad_values(value):
+    with pytest.raises(ValueError, match="Invalid from_date"):
+        parse_date(value, "from_date")
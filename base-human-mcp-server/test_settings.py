@@ -0,0 +1,87 @@
+import copy
+import dataclasses
+
+import pytest
+
+from config import HumanConfig
+from settings import Settings, SettingsError
+
+DEFAULTS = HumanConfig().config
+
+
+def config_with(**sections):
+    config = copy.deepcopy(DEFAULTS)
+    for section, values in sections.items():
+        config[section].update(values)
+    return config
+
+
+def test_defaults_build():
+    settings = Settings.from_dict(config_with())
+    assert settings.conversation.max_history == 5
+    assert settings.llm.structured_output == "off"
+    assert settings.scheduling.availability is None
+
+
+def test_settings_are_frozen():
+    settings = Settings.from_dict(config_with())
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.llm.model = "other"
+
+
+def test_whole_floats_become_ints():
+    settings = Settings.from_dict(config_with(llm={"max_tokens": 500.0}))
+    assert settings.llm.max_tokens == 500
+    assert isinstance(settings.llm.max_tokens, int)
+
+
+def test_salary_ranges_stay_whole_numbers():
+    settings = Settings.from_dict(config_with(negotiation={"hiring_range": [90000.0, 120000]}))
+    assert settings.negotiation.hiring_range == (90000, 120000)
+    assert all(isinstance(amount, int) for amount in settings.negotiation.hiring_range)
+
+
+def test_availability_is_normalized_and_read_only():
+    settings = Settings.from_dict(config_with(scheduling={"availability": {"monday": "09:00-12:00"}}))
+    assert settings.scheduling.availability["monday"] == ("09:00-12:00",)
+    with pytest.raises(TypeError):
+        settings.scheduling.availability["tuesday"] = ("09:00-12:00",)
+
+
+@pytest.mark.parametrize(
+    "section, values, message",
+    [
+        ("llm", {"max_tokens": "lots"}, "llm.max_tokens: expected a whole number"),
+        ("llm", {"max_tokens": 0}, "llm.max_tokens: must be at least 1"),
+        ("llm", {"timeout_seconds": 0}, "llm.timeout_seconds: must be above 0"),
+        ("llm", {"circuit_reset_seconds": -1}, "llm.circuit_reset_seconds: must be above 0"),
+        ("llm", {"structured_output": "xml"}, "llm.structured_output: must be one of"),
+        ("conversation", {"stream": "yes"}, "conversation.stream: expected true or false"),
+        ("conversation", {"max_history": True}, "conversation.max_history: expected a whole number"),
+        ("negotiation", {"hiring_range": [150000, 100000]}, "negotiation.hiring_range: low is above high"),
+        ("negotiation", {"salary_range": [100000.5, 150000]}, "negotiation.salary_range: expected a whole number"),
+        ("negotiation", {"concession": 0}, "negotiation.concession: must be above 0"),
+        ("scheduling", {"availability": {"funday": ["09:00-17:00"]}}, "unknown weekday 'funday'"),
+        ("search", {"backend": "faiss"}, "search.backend: must be one of matrix, hnsw"),
+    ],
+)
+def test_invalid_values_are_rejected(section, values, message):
+    with pytest.raises(SettingsError, match=message):
+        Settings.from_dict(config_with(**{section: values}))
+
+
+def test_every_error_is_reported_together():
+    config = config_with(llm={"max_tokens": "lots", "temperature": -1}, cache={"persist": "no"})
+    del config["persona"]["name"]
+    with pytest.raises(SettingsError) as error:
+        Settings.from_dict(config)
+    message = str(error.value)
+    for where in ["llm.max_tokens", "llm.temperature", "cache.persist", "persona.name: missing"]:
+        assert where in message
+
+
+def test_a_section_that_is_not_a_mapping_is_reported():
+    config = config_with()
+    config["matching"] = ["interest_weight"]
+    with pytest.raises(SettingsError, match="matching: expected a mapping"):
+        Settings.from_dict(config)
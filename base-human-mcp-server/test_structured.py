@@ -0,0 +1,48 @@
+import pytest
+
+from structured import extract_json, response_format, schema_validator
+
+INTERESTS = '[{"name": "Climbing", "score": 0.8, "details": "bouldering"}]'
+
+
+def test_extract_json_parses_clean_json():
+    assert extract_json('{"a": 1}') == {"a": 1}
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        f"```json\n{INTERESTS}\n```",
+        f"```\n{INTERESTS}\n```",
+        f"Here are the interests:\n```json\n{INTERESTS}\n```\nLet me know if you want more.",
+    ],
+)
+def test_extract_json_skips_code_fences_and_prose(reply):
+    assert extract_json(reply, schema_validator("interests"))[0]["name"] == "Climbing"
+
+
+def test_extract_json_skips_values_failing_the_validator():
+    reply = f'Example: {{"name": "not it"}}\n```json\n{INTERESTS}\n```'
+    assert extract_json(reply, schema_validator("interests"))[0]["name"] == "Climbing"
+
+
+def test_extract_json_unwraps_a_keyed_payload():
+    reply = f'{{"interests": {INTERESTS}}}'
+    assert extract_json(reply, schema_validator("interests"), key="interests")[0]["score"] == 0.8
+
+
+def test_extract_json_keeps_braces_inside_strings():
+    assert extract_json('```json\n{"text": "a } and a ]"}\n```') == {"text": "a } and a ]"}
+
+
+@pytest.mark.parametrize("reply", ["No JSON here", "```json\n[]\n```", '{"interests": []}'])
+def test_extract_json_rejects_replies_without_a_usable_value(reply):
+    with pytest.raises(ValueError):
+        extract_json(reply, schema_validator("interests"), key="interests")
+
+
+def test_response_format_wraps_lists_for_json_schema():
+    wrapped = response_format("interests", "json_schema")["json_schema"]["schema"]
+    assert wrapped["required"] == ["interests"]
+    assert response_format("interests", "json_object") == {"type": "json_object"}
+    assert response_format("interests", "off") is None
@@ -0,0 +1,71 @@
+import os
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from human import Human
+
+
+class ConfigWatcher:
+    """
+    Watches persona config files and hot-swaps reloaded snapshots into their Humans.
+    Files are polled by modification time and size, so no extra dependency is needed.
+    """
+
+    def __init__(self, humans: List[Human], interval: float = 2.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            humans: The hosted personas whose config files are watched
+            interval: Seconds between polls
+        """
+        self.humans = humans
+        self.interval = interval
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {
+            human.config.config_file: self._signature(human.config.config_file)
+            for human in humans
+            if human.config.config_file
+        }
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def check(self) -> None:
+        """Reload every config file that changed since the last check."""
+        for human in self.humans:
+            path = human.config.config_file
+            if not path:
+                continue
+
+            signature = self._signature(path)
+            if signature is None or signature == self._signatures.get(path):
+                continue
+            self._signatures[path] = signature
+
+            # Parse off the event loop so requests keep flowing during the reload
+            try:
+                new_config = await asyncio.to_thread(human.config.reload)
+            except ValueError as e:
+                # e.g. a prompt template with an unknown placeholder, or a mistyped setting
+                print(f"Warning: Keeping previous config for {human.slug}: {str(e)}")
+                continue
+            if new_config.load_error:
+                print(f"Warning: Keeping previous config for {human.slug}: {new_config.load_error}")
+                continue
+
+            changed = human.update_config(new_config)
+            if changed:
+                print(f"Reloaded {path} for {human.slug} (changed: {', '.join(changed)})")
+
+    async def run(self) -> None:
+        """Poll until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Error reloading configuration: {str(e)}")